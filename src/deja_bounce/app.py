@@ -4,17 +4,20 @@ Minimal main application for Deja Bounce.
 
 from __future__ import annotations
 
-from mini_arcade_core import GameConfig, SceneRegistry, run_game
+from mini_arcade_core import GameConfig, run_game
 from mini_arcade_native_backend import NativeBackend
 
-from deja_bounce.constants import ASSETS_ROOT, FPS, WINDOW_SIZE
+from deja_bounce.assets import get_asset_manager
+from deja_bounce.constants import DEFAULT_FONT, FPS, WINDOW_SIZE
+from deja_bounce.scenes.registry import LazySceneRegistry
 
 
 def run():
     """Main entry point for DejaBounce."""
-    registry = SceneRegistry(_factories={}).discover("deja_bounce.scenes")
+    registry = LazySceneRegistry().discover("deja_bounce.scenes")
 
-    font_path = ASSETS_ROOT / "fonts" / "deja_vu_dive" / "Deja-vu_dive.ttf"
+    # NativeBackend opens the font itself, from a path
+    font_path = get_asset_manager().path(DEFAULT_FONT)
 
     backend = NativeBackend(font_path=str(font_path), font_size=24)
     width, height = WINDOW_SIZE
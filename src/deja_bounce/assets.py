@@ -0,0 +1,355 @@
+"""
+Shared asset index and cache for Deja Bounce.
+
+The assets/ tree is indexed once, files are read on a worker thread ahead
+of use, and their bytes are kept in a size-bounded LRU cache so later
+lookups (another font size, a new scene) do not touch the disk on the
+game thread.
+
+Only backends that build fonts and textures from bytes benefit from the
+cache (RasterBackend preloads its font this way). NativeBackend opens its
+font from a path, so the windowed game uses the manager to resolve asset
+paths only.
+
+Keys are paths relative to the assets root, with forward slashes, e.g.
+"fonts/deja_vu_dive/Deja-vu_dive.ttf".
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from deja_bounce.constants import ASSETS_ROOT
+from deja_bounce.utils import logger
+
+ASSET_KINDS: Dict[str, str] = {
+    ".ttf": "font",
+    ".otf": "font",
+    ".png": "texture",
+    ".bmp": "texture",
+    ".jpg": "texture",
+    ".jpeg": "texture",
+    ".wav": "sound",
+    ".ogg": "sound",
+    ".mp3": "sound",
+}
+
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class LoadTiming(NamedTuple):
+    """
+    How one asset was loaded.
+
+    :ivar key (str): Asset key.
+    :ivar size (int): Bytes read.
+    :ivar ms (float): Time spent reading, in milliseconds.
+    :ivar background (bool): True if the worker thread did the read.
+    """
+
+    key: str
+    size: int
+    ms: float
+    background: bool
+
+
+class AssetCache:
+    """
+    Thread-safe LRU cache of asset bytes, bounded by total size.
+
+    An entry larger than the whole budget is returned to the caller but
+    not kept.
+
+    :ivar max_bytes (int): Size budget.
+    :ivar size (int): Bytes currently held.
+    :ivar hits (int): Lookups served from the cache.
+    :ivar misses (int): Lookups that were not cached.
+    :ivar evictions (int): Entries dropped to stay within the budget.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        :param max_bytes: Size budget in bytes.
+        :type max_bytes: int
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up `key`, marking it most recently used.
+
+        :param key: Asset key.
+        :type key: str
+
+        :return: The cached bytes, or None.
+        :rtype: Optional[bytes]
+        """
+        with self._lock:
+            data = self._entries.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes):
+        """
+        Store `data` under `key`, evicting least recently used entries.
+
+        :param key: Asset key.
+        :type key: str
+
+        :param data: Asset contents.
+        :type data: bytes
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = data
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class AssetManager:
+    """
+    Index of the assets/ tree with background preloading into an
+    AssetCache.
+
+    :ivar root (Path): Assets directory.
+    :ivar cache (AssetCache): Loaded asset bytes.
+    :ivar timings (List[LoadTiming]): Every disk read, in completion order.
+    """
+
+    def __init__(
+        self, root: Path = ASSETS_ROOT, max_bytes: int = DEFAULT_CACHE_BYTES
+    ):
+        """
+        :param root: Assets directory to index.
+        :type root: Path
+
+        :param max_bytes: Cache size budget in bytes.
+        :type max_bytes: int
+        """
+        self.root = Path(root)
+        self.cache = AssetCache(max_bytes)
+        self.timings: List[LoadTiming] = []
+        self._index: Optional[Dict[str, Path]] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def index(self) -> Dict[str, Path]:
+        """Asset keys mapped to their files, built on first access."""
+        with self._lock:
+            if self._index is None:
+                index = {}
+                for dirpath, _, filenames in os.walk(self.root):
+                    for name in filenames:
+                        path = Path(dirpath) / name
+                        index[path.relative_to(self.root).as_posix()] = path
+                self._index = index
+            return self._index
+
+    def path(self, key: str) -> Path:
+        """
+        Resolve an asset key to its file.
+
+        :param key: Asset key.
+        :type key: str
+
+        :return: Absolute path of the asset.
+        :rtype: Path
+
+        :raises KeyError: If there is no such asset.
+        """
+        try:
+            return self.index[key]
+        except KeyError as e:
+            raise KeyError(f"Unknown asset {key!r} in {self.root}") from e
+
+    def keys(self, kind: Optional[str] = None) -> List[str]:
+        """
+        List indexed asset keys.
+
+        :param kind: Only keys of this kind ("font", "texture", "sound").
+        :type kind: str, optional
+
+        :return: Sorted asset keys.
+        :rtype: List[str]
+        """
+        return sorted(
+            key
+            for key in self.index
+            if kind is None
+            or ASSET_KINDS.get(Path(key).suffix.lower()) == kind
+        )
+
+    def preload(self, keys: Optional[Iterable[str]] = None):
+        """
+        Queue assets to be read on the worker thread. Returns immediately;
+        indexing also happens on the worker when `keys` is None.
+
+        :param keys: Asset keys to load (defaults to every known asset).
+        :type keys: Iterable[str], optional
+        """
+        if keys is None:
+            self._worker().submit(self._preload_all)
+            return
+        for key in keys:
+            self._submit(key)
+
+    def wait(self, timeout: Optional[float] = None):
+        """
+        Block until every queued preload has finished.
+
+        :param timeout: Seconds to wait in total, or forever.
+        :type timeout: float, optional
+
+        :raises TimeoutError: If loads are still queued after `timeout`.
+        """
+        deadline = None if timeout is None else perf_counter() + timeout
+
+        def remaining() -> Optional[float]:
+            if deadline is None:
+                return None
+            return max(0.0, deadline - perf_counter())
+
+        if self._executor is not None:
+            # The indexing job queues more loads, so drain it first
+            self._executor.submit(lambda: None).result(remaining())
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result(remaining())
+
+    def load(self, key: str) -> bytes:
+        """
+        Contents of an asset: from the cache, from a preload in flight, or
+        read now on the calling thread.
+
+        :param key: Asset key.
+        :type key: str
+
+        :return: The asset bytes.
+        :rtype: bytes
+
+        :raises KeyError: If there is no such asset.
+        """
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            future = self._pending.get(key)
+        if future is not None:
+            return future.result()
+        return self._read(key, background=False)
+
+    def report(self) -> Dict[str, float]:
+        """
+        Summary of the disk reads and cache use so far.
+
+        :return: Counts, bytes and milliseconds spent on each thread.
+        :rtype: Dict[str, float]
+        """
+        background = [t for t in self.timings if t.background]
+        blocking = [t for t in self.timings if not t.background]
+        return {
+            "assets": len(self.timings),
+            "bytes": sum(t.size for t in self.timings),
+            "background_ms": round(sum(t.ms for t in background), 3),
+            "blocking_ms": round(sum(t.ms for t in blocking), 3),
+            "blocking_loads": len(blocking),
+            "cache_bytes": self.cache.size,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_evictions": self.cache.evictions,
+        }
+
+    def shutdown(self):
+        """Stop the worker thread after queued loads finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _worker(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="deja-bounce-assets"
+            )
+        return self._executor
+
+    def _submit(self, key: str):
+        if key in self.cache:
+            return
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending[key] = self._worker().submit(self._read, key, True)
+
+    def _preload_all(self):
+        for key in self.keys():
+            self._submit(key)
+
+    def _read(self, key: str, background: bool) -> bytes:
+        path = self.path(key)
+        start = perf_counter()
+        data = path.read_bytes()
+        timing = LoadTiming(
+            key, len(data), (perf_counter() - start) * 1000.0, background
+        )
+        self.cache.put(key, data)
+        with self._lock:
+            self._pending.pop(key, None)
+            self.timings.append(timing)
+        logger.debug(
+            "Loaded asset %s (%d bytes) in %.2f ms%s",
+            key,
+            timing.size,
+            timing.ms,
+            "" if background else " on the calling thread",
+        )
+        return data
+
+
+@functools.cache
+def get_asset_manager() -> AssetManager:
+    """
+    The process-wide AssetManager over ASSETS_ROOT.
+
+    :return: The shared manager.
+    :rtype: AssetManager
+    """
+    return AssetManager()
@@ -0,0 +1,11 @@
+"""
+Backend implementations shipped with Deja Bounce.
+"""
+
+from __future__ import annotations
+
+from deja_bounce.backends.counting import DrawCallCounter
+from deja_bounce.backends.headless import HeadlessBackend
+from deja_bounce.backends.rects import draw_rects
+
+__all__ = ["DrawCallCounter", "HeadlessBackend", "draw_rects"]
@@ -0,0 +1,118 @@
+"""
+Backend wrapper that counts draw calls.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Hashable, Iterable, Optional, Sequence
+
+from mini_arcade_core.backend import Backend, Color, Event
+
+from deja_bounce.backends.rects import Colors, draw_rects
+
+
+class DrawCallCounter(Backend):
+    """
+    Forwards everything to a wrapped backend and counts draw_rect,
+    draw_rects and draw_text calls.
+
+    One instance is meant to be re-targeted every frame with wrap(), so
+    counting costs no allocation.
+
+    :ivar calls (int): Draw calls since the last wrap().
+    """
+
+    def __init__(self):
+        self.target: Optional[Backend] = None
+        self.calls = 0
+
+    def wrap(self, target: Backend) -> "DrawCallCounter":
+        """
+        Start counting a new frame drawn on `target`.
+
+        :param target: Backend the calls are forwarded to.
+        :type target: Backend
+
+        :return: self, to draw through.
+        :rtype: DrawCallCounter
+        """
+        self.target = target
+        self.calls = 0
+        return self
+
+    def init(self, width: int, height: int, title: str):
+        self.target.init(width, height, title)
+
+    def poll_events(self) -> Iterable[Event]:
+        return self.target.poll_events()
+
+    def set_clear_color(self, r: int, g: int, b: int):
+        self.target.set_clear_color(r, g, b)
+
+    def begin_frame(self):
+        self.target.begin_frame()
+
+    def end_frame(self):
+        self.target.end_frame()
+
+    # Justification: Signature mirrors the Backend protocol
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def draw_rect(
+        self,
+        x: int,
+        y: int,
+        w: int,
+        h: int,
+        color: Color = (255, 255, 255),
+    ):
+        self.calls += 1
+        self.target.draw_rect(x, y, w, h, color)
+
+    # font_size is only passed on when given, for backends without it
+    def draw_text(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        color: Color = (255, 255, 255),
+        font_size: int | None = None,
+    ):
+        self.calls += 1
+        if font_size is None:
+            self.target.draw_text(x, y, text, color)
+        else:
+            self.target.draw_text(x, y, text, color, font_size=font_size)
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def draw_rects(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        size: int,
+        colors: Colors,
+    ):
+        """Batched squares, counted as one call."""
+        self.calls += 1
+        draw_rects(self.target, xs, ys, size, colors)
+
+    def measure_text(
+        self, text: str, font_size: int | None = None
+    ) -> tuple[int, int]:
+        if font_size is None:
+            return self.target.measure_text(text)
+        return self.target.measure_text(text, font_size=font_size)
+
+    def capture_frame(self, path: str | None = None) -> bytes | None:
+        return self.target.capture_frame(path)
+
+    def retain_layer(
+        self, owner: object, key: Hashable, draw: Callable[[Backend], None]
+    ) -> bool:
+        """
+        Forward to the target's retain_layer, if it has one. A retained
+        layer is drawn by the target, so its draws are not counted.
+        """
+        if not hasattr(self.target, "retain_layer"):
+            return False
+        return self.target.retain_layer(owner, key, draw)
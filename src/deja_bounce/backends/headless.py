@@ -0,0 +1,81 @@
+"""
+Headless backend for Deja Bounce.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+from mini_arcade_core.backend import Backend, Color, Event
+
+from deja_bounce.backends.rects import Colors
+
+
+class HeadlessBackend(Backend):
+    """
+    Backend that opens no window and draws nothing.
+
+    Lets a Game and its scenes be built and stepped without SDL, e.g. for
+    simulations and tests.
+    """
+
+    def init(self, width: int, height: int, title: str):
+        return
+
+    def poll_events(self) -> Iterable[Event]:
+        return ()
+
+    def set_clear_color(self, r: int, g: int, b: int):
+        return
+
+    def begin_frame(self):
+        return
+
+    def end_frame(self):
+        return
+
+    # Justification: Signatures mirror the Backend protocol, plus the
+    # font_size keyword the core menus pass
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    # pylint: disable=unused-argument
+    def draw_rect(
+        self,
+        x: int,
+        y: int,
+        w: int,
+        h: int,
+        color: Color = (255, 255, 255),
+    ):
+        return
+
+    def draw_text(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        color: Color = (255, 255, 255),
+        font_size: int | None = None,
+    ):
+        return
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def draw_rects(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        size: int,
+        colors: Colors,
+    ):
+        """Batched squares, see deja_bounce.backends.rects."""
+        return
+
+    def measure_text(
+        self, text: str, font_size: int | None = None
+    ) -> tuple[int, int]:
+        return (0, 0)
+
+    # pylint: enable=unused-argument
+
+    def capture_frame(self, path: str | None = None) -> bytes | None:
+        return None
@@ -0,0 +1,582 @@
+"""
+Software-rasterized backend drawing into a NumPy framebuffer.
+
+Rectangles are slice assignments into one preallocated (height, width,
+channels) uint8 array, and text is blended in from glyph masks rendered
+once per string and size with Pillow, so frames can be drawn with no SDL
+or window: pixel observations for agents, golden images of the overlays,
+thumbnails and videos on servers.
+
+Overlays that only change with a key (the walls and the score) can be
+retained with retain_layer(): they are drawn into the background the
+frame is cleared to, and cost nothing on frames where their key is the
+same.
+
+The framebuffer can be smaller than the game: with ``scale=0.25`` every
+coordinate and font size is scaled down and a 700x500 game draws into a
+175x125 buffer.
+
+Requires NumPy (``pip install deja-bounce[sim]``).
+
+Usage:
+    python -m deja_bounce.backends.raster --frames 600 --out last.png
+    python -m deja_bounce.backends.raster --scale 0.25 --sequence frames/
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import io
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, Hashable, Iterable, List, Sequence, Tuple
+
+import numpy as np
+from mini_arcade_core.backend import Backend, Color, Event
+from PIL import Image, ImageDraw, ImageFont
+
+from deja_bounce.assets import get_asset_manager
+from deja_bounce.backends.rects import Colors, is_one_color
+from deja_bounce.constants import DEFAULT_FONT, FPS, WINDOW_SIZE
+
+TEXT_CACHE_SIZE = 512  # rendered strings kept, e.g. every score and label
+RUN_FILL = 16  # squares of one color from which draw_rects counts coverage
+
+Layer = Tuple[object, Hashable, Callable[[Backend], None]]
+
+
+@functools.lru_cache(maxsize=16)
+def _font(path: str | None, size: int) -> ImageFont.FreeTypeFont:
+    """The TTF at `path`, or the game font from the shared asset cache
+    (preloaded by RasterBackend.init) if `path` is None."""
+    if path is None:
+        data = get_asset_manager().load(DEFAULT_FONT)
+        return ImageFont.truetype(io.BytesIO(data), size)
+    return ImageFont.truetype(path, size)
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _text_mask(
+    path: str | None, size: int, text: str
+) -> Tuple[np.ndarray, int, int]:
+    """
+    Coverage mask (0-255) of `text`, and where its top-left sits relative
+    to the draw position (the top of the line, as SDL_ttf places it).
+    """
+    font = _font(path, size)
+    left, top, right, bottom = font.getbbox(text)
+    if right <= left or bottom <= top:
+        return np.zeros((0, 0), np.uint8), 0, 0
+    image = Image.new("L", (right - left, bottom - top))
+    ImageDraw.Draw(image).text((-left, -top), text, fill=255, font=font)
+    return np.asarray(image), left, top
+
+
+# Justification: Framebuffer, clear color, font and scale settings plus the
+# color cache and the retained layers
+# pylint: disable=too-many-instance-attributes
+class RasterBackend(Backend):
+    """
+    Backend that draws into `frame`, a NumPy array reused for every frame.
+
+    :ivar scale (float): Framebuffer pixels per game pixel.
+    :ivar channels (int): 3 for RGB, 4 for RGBA.
+    :ivar frames (int): Frames finished with end_frame().
+    """
+
+    # Justification: Font and buffer settings are independent
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        font_path: str | None = None,
+        font_size: int = 24,
+        scale: float = 1.0,
+        alpha: bool = False,
+    ):
+        """
+        :param font_path: TTF used for text (the game font, from the asset
+            cache, if omitted).
+        :type font_path: str, optional
+
+        :param font_size: Default font size, in game pixels.
+        :type font_size: int
+
+        :param scale: Framebuffer pixels per game pixel, e.g. 0.25 for a
+            quarter-size buffer.
+        :type scale: float
+
+        :param alpha: Keep an alpha channel (RGBA) instead of RGB.
+        :type alpha: bool
+        """
+        self.font_path = font_path
+        self.font_size = font_size
+        self.scale = scale
+        self.channels = 4 if alpha else 3
+        self.frames = 0
+        self.title = ""
+        self._frame = np.zeros((0, 0, self.channels), np.uint8)
+        self._clear = np.zeros(self.channels, np.uint8)
+        self._background = self._frame.copy()
+        self._colors: Dict[Color, Tuple[np.ndarray, int]] = {}
+        self._tables: Dict[Color, np.ndarray] = {}  # see _blend_table()
+        # Layers retained this frame, and the (owner, key) pairs the
+        # background was last drawn with; None forces a redraw
+        self._layers: List[Layer] = []
+        self._baked: List[Tuple[object, Hashable]] | None = None
+        self._pending = False  # begin_frame() ran, the clear has not
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    @property
+    def frame(self) -> np.ndarray:
+        """
+        The (height, width, channels) framebuffer; allocated by init() and
+        only reallocated if the size changes.
+        """
+        if self._pending:
+            self._clear_frame()
+        return self._frame
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Framebuffer (width, height) in pixels."""
+        return self._frame.shape[1], self._frame.shape[0]
+
+    def init(self, width: int, height: int, title: str):
+        self.title = title
+        if self.font_path is None:
+            # Read the game font on the asset worker before the first text
+            get_asset_manager().preload([DEFAULT_FONT])
+        shape = (
+            max(1, round(height * self.scale)),
+            max(1, round(width * self.scale)),
+            self.channels,
+        )
+        if self._frame.shape != shape:
+            self._frame = np.zeros(shape, np.uint8)
+            self._background = np.empty_like(self._frame)
+            self._background[...] = self._clear
+            self._baked = None
+
+    def poll_events(self) -> Iterable[Event]:
+        return ()
+
+    def set_clear_color(self, r: int, g: int, b: int):
+        self._clear[:3] = (r, g, b)
+        if self.channels == 4:
+            self._clear[3] = 255
+        self._background[...] = self._clear
+        self._baked = None
+
+    def begin_frame(self):
+        # The clear waits for the first draw, so that the layers retained
+        # before it are already in the background it copies
+        self._pending = True
+        self._layers.clear()
+
+    def end_frame(self):
+        if self._pending:
+            self._clear_frame()
+        self.frames += 1
+
+    def retain_layer(
+        self, owner: object, key: Hashable, draw: Callable[[Backend], None]
+    ) -> bool:
+        """
+        Keep what `draw` draws in the background the frame is cleared to.
+
+        `draw` is only called again when `key` changes, or when the set of
+        retained layers does; a layer that is not retained in a frame is
+        gone from that frame. Retained layers are under everything drawn
+        in the frame.
+
+        :param owner: Identifies the layer from frame to frame.
+        :type owner: object
+
+        :param key: Everything the layer's pixels depend on.
+        :type key: Hashable
+
+        :param draw: Draws the layer on the backend it is given.
+        :type draw: Callable[[Backend], None]
+
+        :return: False if something was already drawn in this frame (or no
+            frame was begun); the caller then has to draw the layer itself.
+        :rtype: bool
+        """
+        if not self._pending:
+            return False
+        self._layers.append((owner, key, draw))
+        return True
+
+    def _clear_frame(self):
+        """Clear the frame to the background, redrawing the retained
+        layers into it first if they changed."""
+        self._pending = False
+        baked = [(owner, key) for owner, key, _ in self._layers]
+        if baked != self._baked:
+            background = self._background
+            background[...] = self._clear
+            frame = self._frame
+            self._frame = background
+            try:
+                for _, _, draw in self._layers:
+                    draw(self)
+            finally:
+                self._frame = frame
+            self._baked = baked
+        # A plain copy is several times faster than broadcasting one pixel
+        np.copyto(self._frame, self._background)
+
+    def _color(self, color: Color) -> Tuple[np.ndarray, int]:
+        """Pixel value and 0-255 opacity of a color; alpha may be given as
+        a 0-1 fraction, as the trail and pause overlays do."""
+        cached = self._colors.get(color)
+        if cached is not None:
+            return cached
+        opacity = 255
+        if len(color) > 3:
+            a = color[3]
+            opacity = round(a * 255) if isinstance(a, float) else int(a)
+            opacity = max(0, min(255, opacity))
+        value = np.full(self.channels, 255, np.uint8)
+        value[:3] = color[:3]
+        self._colors[color] = (value, opacity)
+        return value, opacity
+
+    def _box(
+        self, x: float, y: float, w: float, h: float
+    ) -> Tuple[int, int, int, int]:
+        """Scaled box clipped to the buffer, as (x0, y0, x1, y1); never
+        thinner than a pixel, so small bodies survive downscaling."""
+        s = self.scale
+        x0 = round(x * s)
+        y0 = round(y * s)
+        x1 = max(x0 + 1, round((x + w) * s))
+        y1 = max(y0 + 1, round((y + h) * s))
+        height, width = self._frame.shape[:2]
+        return max(0, x0), max(0, y0), min(width, x1), min(height, y1)
+
+    @staticmethod
+    def _blend(region: np.ndarray, value: np.ndarray, coverage):
+        """region = region + (value - region) * coverage / 255, in integers."""
+        dst = region.astype(np.uint16)
+        dst *= 255 - coverage
+        dst += value.astype(np.uint16) * coverage
+        dst += 127
+        dst //= 255
+        region[...] = dst
+
+    # Justification: Signatures mirror the Backend protocol, plus the
+    # font_size keyword the core menus pass
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def draw_rect(
+        self,
+        x: int,
+        y: int,
+        w: int,
+        h: int,
+        color: Color = (255, 255, 255),
+    ):
+        if self._pending:
+            self._clear_frame()
+        if w <= 0 or h <= 0:
+            return
+        x0, y0, x1, y1 = self._box(x, y, w, h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        value, opacity = self._color(color)
+        region = self._frame[y0:y1, x0:x1]
+        if opacity == 255:
+            region[...] = value
+        elif opacity:
+            self._blend(region, value, opacity)
+
+    def draw_rects(
+        self,
+        xs: Sequence[int],
+        ys: Sequence[int],
+        size: int,
+        colors: Colors,
+    ):
+        """
+        Draw squares of side `size` with top-left corners (xs[i], ys[i]), in
+        order; the pixels are the same as one draw_rect per square.
+
+        All boxes are scaled and clipped at once. A short run of squares of
+        one color is then filled square by square; a run of RUN_FILL or
+        more is filled by counting how many of its squares cover each
+        pixel, and looking up what that many blends make of the pixel.
+
+        :param xs: Left edges.
+        :type xs: Sequence[int]
+
+        :param ys: Top edges.
+        :type ys: Sequence[int]
+
+        :param size: Side of every square.
+        :type size: int
+
+        :param colors: One color for every square, or one per square.
+        :type colors: Colors
+        """
+        if self._pending:
+            self._clear_frame()
+        n = len(xs)
+        if n == 0 or size <= 0:
+            return
+        boxes = self._boxes(xs, ys, size)
+        if is_one_color(colors):
+            runs = [(0, n, colors)]
+        else:
+            runs = []
+            start = 0
+            for i in range(1, n + 1):
+                if i == n or colors[i] != colors[start]:
+                    runs.append((start, i, colors[start]))
+                    start = i
+        rows = None
+        for start, end, color in runs:
+            if end - start >= RUN_FILL:
+                self._fill_covered(boxes[:, start:end], color)
+            else:
+                if rows is None:
+                    rows = boxes.T.tolist()
+                self._fill_boxes(rows[start:end], color)
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def _fill_boxes(self, rows: List[List[int]], color: Color):
+        """Fill clipped [x0, y0, x1, y1] boxes one by one, like draw_rect,
+        blending through the color's table (one lookup per box)."""
+        value, opacity = self._color(color)
+        if not opacity:
+            return
+        frame = self._frame
+        rows = [row for row in rows if row[0] < row[2] and row[1] < row[3]]
+        if opacity == 255:
+            for left, top, right, bottom in rows:
+                frame[top:bottom, left:right] = value
+            return
+        table = self._blend_table(color)
+        if len(table) == 1:
+            return  # too faint to change any pixel
+        blended = table[1]
+        channels = np.arange(self.channels)
+        for left, top, right, bottom in rows:
+            region = frame[top:bottom, left:right]
+            region[...] = blended[region, channels]
+
+    def _boxes(
+        self, xs: Sequence[int], ys: Sequence[int], size: int
+    ) -> np.ndarray:
+        """_box() for every square at once, as a (4, n) array of x0, y0,
+        x1, y1."""
+        s = self.scale
+        height, width = self._frame.shape[:2]
+        x = np.asarray(xs, np.float64)
+        y = np.asarray(ys, np.float64)
+        boxes = np.empty((4, len(x)), np.float64)
+        np.rint(x * s, out=boxes[0])
+        np.rint(y * s, out=boxes[1])
+        np.maximum(boxes[0] + 1, np.rint((x + size) * s), out=boxes[2])
+        np.maximum(boxes[1] + 1, np.rint((y + size) * s), out=boxes[3])
+        np.maximum(boxes[:2], 0, out=boxes[:2])
+        np.minimum(boxes[2], width, out=boxes[2])
+        np.minimum(boxes[3], height, out=boxes[3])
+        return boxes.astype(np.intp)
+
+    def _fill_covered(self, boxes: np.ndarray, color: Color):
+        """
+        Fill the (4, n) clipped `boxes`, all in `color`, through a
+        per-pixel count of the boxes covering it: opaque pixels are set
+        once, and translucent ones get `count` blends in one lookup.
+        """
+        boxes = boxes[:, (boxes[0] < boxes[2]) & (boxes[1] < boxes[3])]
+        value, opacity = self._color(color)
+        if not boxes.size or not opacity:
+            return
+        low = boxes[:2].min(axis=1)
+        high = boxes[2:].max(axis=1)
+        counts = self._coverage(boxes - np.concatenate((low, low))[:, None])
+        region = self._frame[low[1] : high[1], low[0] : high[0]]
+        covered = counts > 0
+        if opacity == 255:
+            region[covered] = value
+            return
+        table = self._blend_table(color)
+        layers = np.minimum(counts[covered], len(table) - 1)
+        region[covered] = table[
+            layers[:, None], region[covered], np.arange(self.channels)
+        ]
+
+    @staticmethod
+    def _coverage(boxes: np.ndarray) -> np.ndarray:
+        """Number of the (4, n) `boxes` over each pixel of their bounding
+        box, whose top-left must be (0, 0)."""
+        x0, y0, x1, y1 = boxes
+        # +1 at each box's top-left, -1 past its right and bottom edges;
+        # the 2D prefix sum is then the number of boxes over each pixel
+        counts = np.zeros((y1.max() + 1, x1.max() + 1), np.int32)
+        np.add.at(counts, (y0, x0), 1)
+        np.add.at(counts, (y0, x1), -1)
+        np.add.at(counts, (y1, x0), -1)
+        np.add.at(counts, (y1, x1), 1)
+        counts.cumsum(axis=0, out=counts)
+        counts.cumsum(axis=1, out=counts)
+        return counts[:-1, :-1]
+
+    def _blend_table(self, color: Color) -> np.ndarray:
+        """
+        Every channel value after k blends of a translucent color, as
+        table[k, value, channel], up to the k from which more blends
+        change nothing.
+        """
+        table = self._tables.get(color)
+        if table is not None:
+            return table
+        value, opacity = self._color(color)
+        level = np.repeat(
+            np.arange(256, dtype=np.uint8)[:, None], self.channels, axis=1
+        )
+        levels = [level]
+        while True:
+            level = level.copy()
+            self._blend(level, value, opacity)
+            if np.array_equal(level, levels[-1]):
+                break
+            levels.append(level)
+        table = self._tables[color] = np.stack(levels)
+        return table
+
+    # Justification: Signature mirrors the Backend protocol, plus the
+    # font_size keyword the core menus pass
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def draw_text(
+        self,
+        x: int,
+        y: int,
+        text: str,
+        color: Color = (255, 255, 255),
+        font_size: int | None = None,
+    ):
+        size = max(1, round((font_size or self.font_size) * self.scale))
+        mask, left, top = _text_mask(self.font_path, size, text)
+        self._draw_mask(
+            mask,
+            round(x * self.scale) + left,
+            round(y * self.scale) + top,
+            color,
+        )
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def _draw_mask(self, mask: np.ndarray, x0: int, y0: int, color: Color):
+        """Blend `color` into the buffer through a coverage mask whose
+        top-left is at (x0, y0), clipping it to the buffer."""
+        if self._pending:
+            self._clear_frame()
+        height, width = self._frame.shape[:2]
+        if (
+            x0 >= width
+            or y0 >= height
+            or x0 + mask.shape[1] <= 0
+            or y0 + mask.shape[0] <= 0
+        ):
+            return
+        mask = mask[max(0, -y0) : height - y0, max(0, -x0) : width - x0]
+        if not mask.size:
+            return
+        x0 = max(0, x0)
+        y0 = max(0, y0)
+        value, opacity = self._color(color)
+        coverage = mask.astype(np.uint16)[..., None]
+        if opacity != 255:
+            coverage = coverage * opacity // 255
+        region = self._frame[y0 : y0 + mask.shape[0], x0 : x0 + mask.shape[1]]
+        self._blend(region, value, coverage)
+
+    def measure_text(
+        self, text: str, font_size: int | None = None
+    ) -> tuple[int, int]:
+        font = _font(self.font_path, font_size or self.font_size)
+        ascent, descent = font.getmetrics()
+        return round(font.getlength(text)), ascent + descent
+
+    def capture_frame(self, path: str | None = None) -> bytes | None:
+        """
+        The current frame as BMP bytes (like the native backend), or
+        written to `path` in the format its extension names.
+        """
+        image = Image.fromarray(self.frame)
+        if path is not None:
+            image.save(path)
+            return None
+        out = io.BytesIO()
+        image.save(out, format="BMP")
+        return out.getvalue()
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+def main(argv: list[str] | None = None):
+    """Draw a CPU-vs-CPU match into a RasterBackend and report frames/s."""
+    # The scene imports the whole game, so only load it for the CLI
+    # pylint: disable=import-outside-toplevel
+    from deja_bounce.scenes.pong import PongScene
+    from deja_bounce.simulation.headless import make_headless_game
+
+    # pylint: enable=import-outside-toplevel
+
+    class RasterPongScene(PongScene):
+        """PongScene that does not record its matches."""
+
+        record_replays = False
+
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.backends.raster"
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--trail", action="store_true")
+    parser.add_argument("--out", type=Path, help="save the last frame")
+    parser.add_argument(
+        "--sequence", type=Path, help="save every --every'th frame here"
+    )
+    parser.add_argument("--every", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    backend = RasterBackend(scale=args.scale)
+    backend.init(*WINDOW_SIZE, "DejaBounce (raster)")
+    backend.set_clear_color(0, 0, 0)
+    scene = RasterPongScene(make_headless_game(backend=backend))
+    scene.on_enter()
+    scene.model.cpu_vs_cpu = True
+    scene.model.trail_mode = args.trail
+    if args.sequence is not None:
+        args.sequence.mkdir(parents=True, exist_ok=True)
+
+    draw_seconds = 0.0
+    for i in range(args.frames):
+        scene.update(1.0 / FPS)
+        start = perf_counter()
+        backend.begin_frame()
+        scene.draw(backend)
+        backend.end_frame()
+        draw_seconds += perf_counter() - start
+        if args.sequence is not None and i % args.every == 0:
+            backend.capture_frame(str(args.sequence / f"{i:05d}.png"))
+    if args.out is not None:
+        backend.capture_frame(str(args.out))
+
+    width, height = backend.size
+    print(
+        f"{args.frames} frames at {width}x{height}: "
+        f"{args.frames / draw_seconds:,.0f} frames/s drawn "
+        f"({draw_seconds * 1e3 / args.frames:.3f} ms per frame)"
+    )
+
+
+if __name__ == "__main__":
+    main()
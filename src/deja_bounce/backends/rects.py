@@ -0,0 +1,70 @@
+"""
+Batched square drawing for trails and ball sets.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from mini_arcade_core.backend import Backend, Color
+
+Colors = Union[Color, Sequence[Color]]
+
+
+def is_one_color(colors: Colors) -> bool:
+    """
+    Whether `colors` is a single color rather than one color per square.
+
+    :param colors: A color, or a non-empty sequence of colors.
+    :type colors: Colors
+
+    :return: True for a single color.
+    :rtype: bool
+    """
+    return isinstance(colors[0], (int, float))
+
+
+def draw_rects(
+    surface: Backend,
+    xs: Sequence[int],
+    ys: Sequence[int],
+    size: int,
+    colors: Colors,
+):
+    """
+    Draw squares of side `size` with top-left corners (xs[i], ys[i]), in
+    order, with the backend's draw_rects if it has one (RasterBackend
+    fills them in a few array passes) and one draw_rect each otherwise.
+
+    :param surface: Backend to draw on.
+    :type surface: Backend
+
+    :param xs: Left edges.
+    :type xs: Sequence[int]
+
+    :param ys: Top edges.
+    :type ys: Sequence[int]
+
+    :param size: Side of every square.
+    :type size: int
+
+    :param colors: One color for every square, or one per square.
+    :type colors: Colors
+    """
+    if len(xs) == 0:  # NumPy arrays have no truth value
+        return
+    if hasattr(surface, "draw_rects"):
+        surface.draw_rects(xs, ys, size, colors)
+        return
+    # Plain ints for backends that do not take NumPy scalars
+    if hasattr(xs, "tolist"):
+        xs = xs.tolist()
+    if hasattr(ys, "tolist"):
+        ys = ys.tolist()
+    draw_rect = surface.draw_rect
+    if is_one_color(colors):
+        for x, y in zip(xs, ys):
+            draw_rect(x, y, size, size, colors)
+    else:
+        for x, y, color in zip(xs, ys, colors):
+            draw_rect(x, y, size, size, color)
@@ -0,0 +1,236 @@
+"""
+Uniform-grid broadphase for Deja Bounce collisions.
+
+Bodies are bucketed by the grid cells their box covers, so finding what
+might touch a box (or every pair that might touch) only looks at nearby
+bodies instead of testing all of them against each other.
+"""
+
+from __future__ import annotations
+
+from bisect import insort
+from math import floor
+from typing import Dict, Generic, Iterator, List, Tuple, TypeVar
+
+from mini_arcade_core.entity import SpriteEntity
+
+from deja_bounce.physics import Rect, overlaps
+
+T = TypeVar("T")
+Span = Tuple[int, int, int, int]  # first/last cell column, first/last row
+
+# Cell (cx, cy) lives under key cy * _ROW + cx; columns stay well inside
+# +/- _ROW / 2 for anything near the field
+_ROW = 1 << 20
+
+
+def entity_rect(entity: SpriteEntity) -> Rect:
+    """
+    Current box of an entity.
+
+    :param entity: Any entity with a position and size.
+    :type entity: SpriteEntity
+
+    :return: Its (x, y, width, height) box.
+    :rtype: Rect
+    """
+    return (
+        entity.position.x,
+        entity.position.y,
+        entity.size.width,
+        entity.size.height,
+    )
+
+
+class UniformGrid(Generic[T]):
+    """
+    Spatial hash of axis-aligned boxes on square cells.
+
+    Moving bodies are kept up to date with move(), which only touches the
+    buckets when a body crosses into other cells; clear() and insert() are
+    for bodies that come and go. Query results come back in insertion
+    order, so the collision code that uses them stays deterministic.
+
+    :ivar cell_size (float): Side of a grid cell; about the size of the
+        typical body works best.
+    """
+
+    def __init__(self, cell_size: float = 50.0):
+        """
+        :param cell_size: Side of a grid cell.
+        :type cell_size: float
+        """
+        self.cell_size = float(cell_size)
+        self._inv = 1.0 / self.cell_size
+        self._cells: Dict[int, List[int]] = {}
+        self._items: List[T] = []
+        self._rects: List[Rect] = []
+        self._spans: List[Span] = []
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._items)
+
+    def clear(self):
+        """Remove every body."""
+        self._cells.clear()
+        self._items.clear()
+        self._rects.clear()
+        self._spans.clear()
+
+    def _span(self, rect: Rect) -> Span:
+        x, y, w, h = rect
+        inv = self._inv
+        return (
+            floor(x * inv),
+            floor((x + w) * inv),
+            floor(y * inv),
+            floor((y + h) * inv),
+        )
+
+    def _link(self, index: int, span: Span):
+        cells = self._cells
+        x0, x1, y0, y1 = span
+        for cy in range(y0, y1 + 1):
+            row = cy * _ROW
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get(row + cx)
+                if bucket is None:
+                    cells[row + cx] = [index]
+                else:
+                    # Buckets stay in insertion order
+                    insort(bucket, index)
+
+    def _unlink(self, index: int, span: Span):
+        cells = self._cells
+        x0, x1, y0, y1 = span
+        for cy in range(y0, y1 + 1):
+            row = cy * _ROW
+            for cx in range(x0, x1 + 1):
+                bucket = cells[row + cx]
+                bucket.remove(index)
+                if not bucket:
+                    del cells[row + cx]
+
+    def insert(self, item: T, rect: Rect) -> int:
+        """
+        Add a body.
+
+        :param item: The body (any object).
+        :type item: T
+
+        :param rect: Its (x, y, width, height) box.
+        :type rect: Rect
+
+        :return: The body's index, in insertion order.
+        :rtype: int
+        """
+        index = len(self._items)
+        span = self._span(rect)
+        self._items.append(item)
+        self._rects.append(rect)
+        self._spans.append(span)
+        self._link(index, span)
+        return index
+
+    def move(self, index: int, rect: Rect):
+        """
+        Update a body's box.
+
+        :param index: Index returned by insert().
+        :type index: int
+
+        :param rect: Its new (x, y, width, height) box.
+        :type rect: Rect
+        """
+        if rect == self._rects[index]:
+            return
+        self._rects[index] = rect
+        span = self._span(rect)
+        old = self._spans[index]
+        if span != old:
+            self._unlink(index, old)
+            self._link(index, span)
+            self._spans[index] = span
+
+    def rect(self, index: int) -> Rect:
+        """
+        Box a body was last inserted or moved with.
+
+        :param index: Index returned by insert().
+        :type index: int
+
+        :return: The body's box.
+        :rtype: Rect
+        """
+        return self._rects[index]
+
+    # Justification: Runs for every ball every tick, so the cell span is
+    # computed inline rather than through _span()
+    # pylint: disable=too-many-locals
+    def query(self, rect: Rect) -> List[T]:
+        """
+        Bodies sharing a cell with `rect` (candidates, not confirmed hits).
+
+        :param rect: Box to look around.
+        :type rect: Rect
+
+        :return: Candidate bodies in insertion order.
+        :rtype: List[T]
+        """
+        cells = self._cells
+        x, y, w, h = rect
+        inv = self._inv
+        x0 = floor(x * inv)
+        x1 = floor((x + w) * inv)
+        y0 = floor(y * inv)
+        y1 = floor((y + h) * inv)
+        found: List[int] = []
+        for cy in range(y0, y1 + 1):
+            row = cy * _ROW
+            for cx in range(x0, x1 + 1):
+                bucket = cells.get(row + cx)
+                if bucket is not None:
+                    # Merging is rare: most boxes see one occupied cell
+                    found = (
+                        sorted(set(found).union(bucket)) if found else bucket
+                    )
+        if not found:
+            return []
+        items = self._items
+        return [items[i] for i in found]
+
+    # pylint: enable=too-many-locals
+
+    def pairs(self) -> Iterator[Tuple[int, int]]:
+        """
+        Every pair of bodies sharing at least one cell, once each.
+
+        :return: (i, j) index pairs with i < j.
+        :rtype: Iterator[Tuple[int, int]]
+        """
+        seen = set()
+        for bucket in self._cells.values():
+            n = len(bucket)
+            for a in range(n - 1):
+                i = bucket[a]
+                for b in range(a + 1, n):
+                    pair = (i, bucket[b])
+                    if pair not in seen:
+                        seen.add(pair)
+                        yield pair
+
+    def overlapping_pairs(self) -> Iterator[Tuple[T, T]]:
+        """
+        Pairs of bodies whose boxes touch or overlap.
+
+        :return: (first, second) bodies, first inserted before second.
+        :rtype: Iterator[Tuple[T, T]]
+        """
+        rects = self._rects
+        items = self._items
+        for i, j in self.pairs():
+            if overlaps(rects[i], rects[j]):
+                yield items[i], items[j]
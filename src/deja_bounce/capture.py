@@ -0,0 +1,228 @@
+"""
+Non-blocking screenshots and frame sequences.
+
+The game thread only copies the frame out of the backend; decoding and
+PNG compression happen on a background encoder thread fed by a bounded
+queue. When the encoder falls behind, new frames are dropped rather than
+stalling the game loop.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import io
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Optional, Tuple
+
+from mini_arcade_core.backend import Backend
+from PIL import Image
+
+from deja_bounce.constants import ROOT
+from deja_bounce.utils import logger
+
+SCREENSHOTS_DIR = ROOT / "screenshots"
+
+
+def timestamp() -> str:
+    """
+    Timestamp used in capture file names, e.g. 20251205_133935.
+
+    :return: The current local time.
+    :rtype: str
+    """
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class CaptureWriter:
+    """
+    Background PNG encoder for captured frames.
+
+    :ivar written (int): Frames written to disk.
+    :ivar dropped (int): Frames discarded because the queue was full.
+    :ivar failed (int): Frames that could not be decoded or written.
+    """
+
+    def __init__(
+        self,
+        directory: Path = SCREENSHOTS_DIR,
+        max_pending: int = 8,
+        compress_level: int = 6,
+    ):
+        """
+        :param directory: Where screenshots are written.
+        :type directory: Path
+
+        :param max_pending: Frames that may wait for the encoder.
+        :type max_pending: int
+
+        :param compress_level: zlib level for the PNGs (0-9).
+        :type compress_level: int
+        """
+        self.directory = Path(directory)
+        self.compress_level = compress_level
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: queue.Queue[Optional[Tuple[bytes, Path]]] = queue.Queue(
+            max_pending
+        )
+        self._thread: Optional[threading.Thread] = None
+
+    def capture(
+        self, backend: Backend, label: str = "screenshot"
+    ) -> Optional[Path]:
+        """
+        Copy the current frame out of `backend` and queue it as a
+        timestamped PNG, e.g. 20251205_133935_screenshot.png.
+
+        :param backend: Backend to read the frame from.
+        :type backend: Backend
+
+        :param label: Suffix of the file name.
+        :type label: str
+
+        :return: The file the frame will be written to, or None if the
+            backend gave no frame or the queue was full.
+        :rtype: Optional[Path]
+        """
+        path = self.directory / f"{timestamp()}_{label}.png"
+        return path if self.submit(backend.capture_frame(), path) else None
+
+    def submit(self, frame: Optional[bytes], path: Path) -> bool:
+        """
+        Queue an encoded frame (any format Pillow reads, e.g. the BMP bytes
+        capture_frame returns) to be written as PNG to `path`.
+
+        :param frame: Frame bytes, or None if the backend had none.
+        :type frame: Optional[bytes]
+
+        :param path: Destination PNG.
+        :type path: Path
+
+        :return: True if the frame was queued.
+        :rtype: bool
+        """
+        if not frame:
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((frame, path))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def flush(self):
+        """Block until every queued frame has been written."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write the queued frames and stop the encoder thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="deja-bounce-capture", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._encode(*item)
+            finally:
+                self._queue.task_done()
+
+    def _encode(self, frame: bytes, path: Path):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with Image.open(io.BytesIO(frame)) as image:
+                image.save(
+                    path, format="PNG", compress_level=self.compress_level
+                )
+        except (OSError, ValueError) as e:
+            self.failed += 1
+            logger.warning("Could not write capture %s: %s", path, e)
+            return
+        self.written += 1
+
+
+class FrameSequence:
+    """
+    Captures every drawn frame at up to `fps` frames per second into
+    screenshots/<timestamp>_<label>/00000.png, 00001.png, ...
+
+    :ivar directory (Path): Folder the sequence is written to.
+    :ivar frames (int): Frames queued so far.
+    :ivar dropped (int): Frames skipped because the encoder was busy.
+    """
+
+    def __init__(
+        self, writer: CaptureWriter, fps: float = 30.0, label: str = "capture"
+    ):
+        """
+        :param writer: Encoder the frames are handed to.
+        :type writer: CaptureWriter
+
+        :param fps: Target capture rate.
+        :type fps: float
+
+        :param label: Suffix of the sequence folder name.
+        :type label: str
+        """
+        self.writer = writer
+        self.interval = 1.0 / fps
+        self.directory = writer.directory / f"{timestamp()}_{label}"
+        self.frames = 0
+        self.dropped = 0
+        self._due = 0.0
+
+    def __call__(self, backend: Backend):
+        """
+        Offer the frame just drawn; it is captured if one is due.
+
+        :param backend: Backend to read the frame from.
+        :type backend: Backend
+        """
+        now = perf_counter()
+        if now < self._due:
+            return
+        # Stay on the fps grid, skipping the slots missed while running late
+        late = int((now - self._due) / self.interval)
+        self._due += self.interval * (late + 1)
+        frame = backend.capture_frame()
+        if not frame:
+            return
+        path = self.directory / f"{self.frames + self.dropped:05d}.png"
+        if self.writer.submit(frame, path):
+            self.frames += 1
+        else:
+            self.dropped += 1
+
+
+@functools.cache
+def get_capture_writer() -> CaptureWriter:
+    """
+    The process-wide CaptureWriter over SCREENSHOTS_DIR; its queued frames
+    are written out when the interpreter exits.
+
+    :return: The shared writer.
+    :rtype: CaptureWriter
+    """
+    writer = CaptureWriter()
+    atexit.register(writer.close)
+    return writer
@@ -8,10 +8,15 @@ from deja_bounce.utils import find_assets_root
 
 ASSETS_ROOT = find_assets_root()
 ROOT = ASSETS_ROOT.parent
+DEFAULT_FONT = "fonts/deja_vu_dive/Deja-vu_dive.ttf"  # asset key
 
 FPS = 60
 WINDOW_SIZE = (700, 500)
 PADDLE_SIZE = (10, 100)
+PADDLE_MARGIN = 20  # gap between each paddle and its screen edge
+BALL_SIZE = 10
+BALL_VELOCITY = (-250.0, -200.0)  # kickoff velocity
+MULTIBALL_LEVELS = (1, 2, 16, 128, 1024, 4096)  # balls per multiball step
 
 # Colors
 BACKGROUND = (5, 5, 15)
@@ -5,5 +5,14 @@ Minimal controller definitions for Deja Bounce.
 from __future__ import annotations
 
 from deja_bounce.controllers.cpu import CpuConfig, CpuPaddleController
+from deja_bounce.controllers.intercept import (
+    InterceptPredictor,
+    predict_intercept_y,
+)
 
-__all__ = ["CpuPaddleController", "CpuConfig"]
+__all__ = [
+    "CpuPaddleController",
+    "CpuConfig",
+    "InterceptPredictor",
+    "predict_intercept_y",
+]
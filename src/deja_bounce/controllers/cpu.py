@@ -8,6 +8,9 @@ import random
 from dataclasses import dataclass
 from typing import Literal
 
+from mini_arcade_core.spaces.d2 import Bounds2D
+
+from deja_bounce.controllers.intercept import InterceptPredictor
 from deja_bounce.entities import Ball, Paddle
 
 Side = Literal["LEFT", "RIGHT"]
@@ -20,6 +23,10 @@ class CpuConfig:
 
     - max_speed: how fast the CPU paddle can move (units/sec)
     - dead_zone: how close to the ball center before it stops moving
+    - reaction_distance: how close the ball must be before it reacts
+    - error_margin: max random vertical aim error
+    - predict_intercept: aim where the ball will cross the paddle
+      (walls included) instead of at the ball's current Y
     """
 
     max_speed: float = 65.0  # slower = easier
@@ -28,6 +35,7 @@ class CpuConfig:
     )
     reaction_distance: float = 180.0
     error_margin: float = 24.0
+    predict_intercept: bool = False
 
 
 class CpuPaddleController:
@@ -37,12 +45,15 @@ class CpuPaddleController:
     - Moves paddle up/down to follow it, clamped by max_speed.
     """
 
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
     def __init__(
         self,
         paddle: Paddle,
         ball: Ball,
         side: Side = "RIGHT",
         config: CpuConfig | None = None,
+        rng: random.Random | None = None,
+        bounds: Bounds2D | None = None,
     ):
         """
         :param paddle: The paddle to control.
@@ -53,25 +64,45 @@ class CpuPaddleController:
 
         :param config: The CPU configuration settings.
         :type config: CpuConfig, optional
+
+        :param rng: Random source for aim errors (defaults to a fresh one).
+        :type rng: random.Random, optional
+
+        :param bounds: Bounds the ball bounces inside, used for intercept
+            prediction (defaults to the paddle's window height).
+        :type bounds: Bounds2D, optional
         """
         self.paddle = paddle
         self.ball = ball
         self.side = side
         self.config = config or CpuConfig()
+        self.rng = rng if rng is not None else random.Random()
+        self.predictor = InterceptPredictor(
+            bounds or Bounds2D(0.0, 0.0, 0.0, float(paddle.window_height))
+        )
 
         # Make sure paddle speed matches CPU config so movement feels consistent
         self.paddle.speed = self.config.max_speed
         self._aim_offset_y = self._new_offset()
 
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
     def _new_offset(self) -> float:
         # vertical error in [-error_margin, error_margin]
         m = self.config.error_margin
-        return random.uniform(-m, m) if m > 0 else 0.0
+        return self.rng.uniform(-m, m) if m > 0 else 0.0
 
     def _stop(self):
         self.paddle.moving_up = False
         self.paddle.moving_down = False
 
+    def reset(self):
+        """
+        Stop the paddle and roll a new aim error, e.g. at match start.
+        """
+        self._stop()
+        self._aim_offset_y = self._new_offset()
+
     # Justification: dt is unused but kept for interface consistency
     # pylint: disable=unused-argument
     def update(self, dt: float):
@@ -93,10 +124,12 @@ class CpuPaddleController:
 
         # Distance-to-react should be side-correct
         if self.side == "RIGHT":
+            plane_x = self.paddle.position.x - self.ball.size.width
             distance_x = self.paddle.position.x - (
                 self.ball.position.x + self.ball.size.width
             )
         else:  # LEFT
+            plane_x = self.paddle.position.x + self.paddle.size.width
             distance_x = self.ball.position.x - (
                 self.paddle.position.x + self.paddle.size.width
             )
@@ -105,12 +138,19 @@ class CpuPaddleController:
             self._stop()
             return
 
-        # Y aiming (same as you already have)
-        ball_center = (
-            self.ball.position.y
-            + self.ball.size.height / 2
-            + self._aim_offset_y
-        )
+        # Y aiming: where the ball is now, or where it will arrive
+        if self.config.predict_intercept:
+            target_y = self.predictor.predict(
+                self.ball.position.x,
+                self.ball.position.y,
+                vx,
+                self.ball.velocity.vy,
+                self.ball.size.height,
+                plane_x,
+            )
+        else:
+            target_y = self.ball.position.y
+        ball_center = target_y + self.ball.size.height / 2 + self._aim_offset_y
         paddle_center = self.paddle.position.y + self.paddle.size.height / 2
         diff = ball_center - paddle_center
 
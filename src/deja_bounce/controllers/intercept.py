@@ -0,0 +1,165 @@
+"""
+Closed-form ball intercept prediction for CPU paddles.
+"""
+
+from __future__ import annotations
+
+import math
+
+from mini_arcade_core.spaces.d2 import Bounds2D
+
+
+# Justification: Ball state, the plane and the bounds are separate floats,
+# keeping the hot CPU path free of tuple packing
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def predict_intercept_y(
+    x: float,
+    y: float,
+    vx: float,
+    vy: float,
+    plane_x: float,
+    top: float,
+    bottom: float,
+) -> float:
+    """
+    Y the ball will have when its x reaches `plane_x`, folding in every
+    reflection off the top/bottom bounds along the way.
+
+    Positions are the ball's top-left corner; `bottom` is the lowest
+    top-left y the ball can reach (bounds bottom minus ball height).
+
+    :param x: Current ball x.
+    :type x: float
+
+    :param y: Current ball y.
+    :type y: float
+
+    :param vx: Ball x velocity (must be non-zero).
+    :type vx: float
+
+    :param vy: Ball y velocity.
+    :type vy: float
+
+    :param plane_x: Ball x at which the intercept happens.
+    :type plane_x: float
+
+    :param top: Highest reachable ball y.
+    :type top: float
+
+    :param bottom: Lowest reachable ball y.
+    :type bottom: float
+
+    :return: Predicted ball y at the plane.
+    :rtype: float
+    """
+    t = max(0.0, (plane_x - x) / vx)
+    span = bottom - top
+    if span <= 0:
+        return top
+    period = 2.0 * span
+    m = (y - top + vy * t) % period
+    return top + (m if m <= span else period - m)
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+# Justification: The cached path is one attribute per component
+# pylint: disable=too-many-instance-attributes
+class InterceptPredictor:
+    """
+    Caches predict_intercept_y until the ball leaves its current path.
+
+    The cached answer stays valid while the ball keeps the same velocity
+    and still lies on the same line, so a paddle hit, a wall bounce or a
+    reset (which teleports the ball) each trigger exactly one recompute.
+
+    :ivar tolerance (float): How far (px) the ball may drift off the
+        cached line before it counts as a new path.
+    """
+
+    tolerance = 0.5
+
+    def __init__(self, bounds: Bounds2D):
+        """
+        :param bounds: Bounds the ball bounces inside (read on recompute).
+        :type bounds: Bounds2D
+        """
+        self.bounds = bounds
+        self.recomputes = 0
+        self._vx = math.nan
+        self._vy = math.nan
+        self._line = math.nan
+        self._slack = 0.0
+        self._plane = math.nan
+        self._y = 0.0
+
+    # Justification: Same ball and plane values as predict_intercept_y
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def predict(
+        self,
+        x: float,
+        y: float,
+        vx: float,
+        vy: float,
+        height: float,
+        plane_x: float,
+    ) -> float:
+        """
+        Predicted ball y at `plane_x`, recomputed only when stale.
+
+        :param x: Current ball x.
+        :type x: float
+
+        :param y: Current ball y.
+        :type y: float
+
+        :param vx: Ball x velocity (must be non-zero).
+        :type vx: float
+
+        :param vy: Ball y velocity.
+        :type vy: float
+
+        :param height: Ball height.
+        :type height: float
+
+        :param plane_x: Ball x at which the intercept happens.
+        :type plane_x: float
+
+        :return: Predicted ball y at the plane.
+        :rtype: float
+        """
+        line = y * vx - x * vy
+        if (
+            vx == self._vx
+            and vy == self._vy
+            and plane_x == self._plane
+            and abs(line - self._line) <= self._slack
+        ):
+            return self._y
+
+        self._y = predict_intercept_y(
+            x,
+            y,
+            vx,
+            vy,
+            plane_x,
+            self.bounds.top,
+            self.bounds.bottom - height,
+        )
+        self._vx = vx
+        self._vy = vy
+        self._plane = plane_x
+        self._line = line
+        self._slack = self.tolerance * (abs(vx) + abs(vy))
+        self.recomputes += 1
+        return self._y
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def invalidate(self):
+        """Forget the cached prediction."""
+        self._vx = math.nan
+
+
+# pylint: enable=too-many-instance-attributes
@@ -25,11 +25,13 @@ DIFFICULTY_PRESETS: dict[str, CpuConfig] = {
         dead_zone=6.0,
         reaction_distance=220.0,
         error_margin=16.0,
+        predict_intercept=True,
     ),
     "insane": CpuConfig(
         max_speed=380.0,
         dead_zone=3.0,
         reaction_distance=9999.0,
         error_margin=4.0,
+        predict_intercept=True,
     ),
 }
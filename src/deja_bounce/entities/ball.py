@@ -22,3 +22,16 @@ class Ball(RectDrawMixin, KinematicEntity):
         logger.info("Ball created")
         self.base_vx = self.velocity.vx
         self.base_vy = self.velocity.vy
+        self.prev_x = self.position.x
+        self.prev_y = self.position.y
+
+    def update(self, dt: float):
+        """
+        Move the ball, remembering where it started this step.
+
+        :param dt: Delta time since last update.
+        :type dt: float
+        """
+        self.prev_x = self.position.x
+        self.prev_y = self.position.y
+        super().update(dt)
@@ -0,0 +1,651 @@
+"""
+Vectorized Pong rules shared by everything that simulates many balls.
+
+BatchSimulator, VecPongEnv and the multiball BallSet all keep balls as
+structure-of-arrays state; these kernels apply BallWallBounceSystem,
+BallPaddleCollisionSystem, SweptBallCollisionSystem, InterceptPredictor,
+ResetRallySystem and BallOutSystem to a whole set of balls at once. The
+arithmetic follows the scalar systems step for step, so a ball in an
+array follows exactly the trajectory the scene's ball would.
+
+Kernels update the arrays they are given in place and work in a Scratch,
+so a step allocates nothing.
+
+Requires NumPy (``pip install deja-bounce[sim]``).
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from deja_bounce.controllers.intercept import InterceptPredictor
+
+# (x, y, vx, vy): top-left corner and velocity, one slot per ball
+BallArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+# sweep_balls contact codes
+_NONE = 0
+_TOP = 1
+_BOTTOM = 2
+_PADDLE = 3  # + index into the paddles
+
+
+class PaddleBox(NamedTuple):
+    """
+    A paddle as the collision kernel sees it. Any field may be a float
+    (one paddle for every ball) or an array (one paddle per slot).
+
+    :ivar x (float | np.ndarray): Left edge.
+    :ivar y (float | np.ndarray): Top edge.
+    :ivar width (float): Width.
+    :ivar height (float): Height.
+    :ivar vy (float | np.ndarray): Vertical velocity, for the inertia.
+    :ivar left (bool): Whether balls bounce off its right face.
+    """
+
+    x: float | np.ndarray
+    y: float | np.ndarray
+    width: float
+    height: float
+    vy: float | np.ndarray
+    left: bool
+
+
+# Justification: One array per temporary, so kernels never allocate
+# pylint: disable=too-many-instance-attributes
+class Scratch:
+    """
+    Preallocated temporaries the kernels work in.
+
+    Kernels overwrite them freely, so never pass one of these arrays as a
+    kernel input, and copy a returned one before the next kernel call if
+    it is still needed.
+    """
+
+    def __init__(self, n: int):
+        """
+        :param n: Slots per array.
+        :type n: int
+        """
+        self.tmp = np.zeros(n)
+        self.tmp2 = np.zeros(n)
+        self.hit = np.zeros(n, dtype=bool)
+        self.mask = np.zeros(n, dtype=bool)
+        self.mask2 = np.zeros(n, dtype=bool)
+        # sweep_balls state
+        self.first = np.zeros(n)
+        self.remaining = np.zeros(n)
+        self.entry = np.zeros(n)
+        self.leave = np.zeros(n)
+        self.live = np.zeros(n, dtype=bool)
+        self.heading = np.zeros(n, dtype=bool)
+        self.contact = np.zeros(n, dtype=np.int8)
+        self.hits = np.zeros(n, dtype=np.int64)
+
+    def head(self, n: int) -> Scratch:
+        """
+        Scratch for the first `n` slots, sharing this one's memory.
+
+        :param n: Slots needed.
+        :type n: int
+
+        :return: Views of the first n slots.
+        :rtype: Scratch
+        """
+        view = Scratch(0)
+        for name, array in vars(self).items():
+            setattr(view, name, array[:n])
+        return view
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+def bounce_walls(
+    ball: BallArrays, size: float, top: float, bottom: float, scratch: Scratch
+):
+    """
+    BallWallBounceSystem (VerticalBounce): clamp balls inside
+    [top, bottom] and reflect vy.
+
+    :param ball: The balls.
+    :type ball: BallArrays
+
+    :param size: Ball side.
+    :type size: float
+
+    :param top: Top bound.
+    :type top: float
+
+    :param bottom: Bottom bound (the ball's lower edge stops here).
+    :type bottom: float
+
+    :param scratch: Temporaries.
+    :type scratch: Scratch
+    """
+    _, y, _, vy = ball
+    hit = scratch.hit
+    np.less_equal(y, top, out=hit)
+    np.copyto(y, top, where=hit)
+    np.negative(vy, out=vy, where=hit)
+    np.greater_equal(np.add(y, size, out=scratch.tmp), bottom, out=hit)
+    np.copyto(y, bottom - size, where=hit)
+    np.negative(vy, out=vy, where=hit)
+
+
+def _paddle_overlap(
+    ball: BallArrays, size: float, paddle: PaddleBox, scratch: Scratch
+) -> np.ndarray | None:
+    """Inclusive AABB test (RectCollider.intersects) into scratch.hit."""
+    x, y, _, _ = ball
+    hit = scratch.hit
+    mask = scratch.mask
+    tmp = scratch.tmp
+    np.greater_equal(np.add(x, size, out=tmp), paddle.x, out=hit)
+    hit &= np.less_equal(x, np.add(paddle.x, paddle.width, out=tmp), out=mask)
+    if not hit.any():
+        return None
+    hit &= np.greater_equal(np.add(y, size, out=tmp), paddle.y, out=mask)
+    hit &= np.less_equal(y, np.add(paddle.y, paddle.height, out=tmp), out=mask)
+    if not hit.any():
+        return None
+    return hit
+
+
+def collide_paddle(
+    ball: BallArrays,
+    size: float,
+    paddle: PaddleBox,
+    rules: type,
+    scratch: Scratch,
+) -> np.ndarray | None:
+    """
+    BallPaddleCollisionSystem for one paddle: put every overlapping ball
+    against the paddle's face, send it back and apply
+    _apply_paddle_influence.
+
+    :param ball: The balls.
+    :type ball: BallArrays
+
+    :param size: Ball side.
+    :type size: float
+
+    :param paddle: The paddle.
+    :type paddle: PaddleBox
+
+    :param rules: Holder of the tuning constants (base_vy, inertia_factor,
+        max_vy, speed_up), e.g. BallPaddleCollisionSystem.
+    :type rules: type
+
+    :param scratch: Temporaries.
+    :type scratch: Scratch
+
+    :return: Mask of the balls that hit (scratch.hit), or None if none did.
+    :rtype: np.ndarray | None
+    """
+    hit = _paddle_overlap(ball, size, paddle, scratch)
+    if hit is None:
+        return None
+    _bounce_off(ball, size, paddle, hit, rules, scratch)
+    return hit
+
+
+# Justification: Names each array the response works in
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+# pylint: disable=too-many-locals
+def _bounce_off(
+    ball: BallArrays,
+    size: float,
+    paddle: PaddleBox,
+    hit: np.ndarray,
+    rules: type,
+    scratch: Scratch,
+):
+    """
+    BallPaddleCollisionSystem._bounce for the balls in `hit`: against the
+    face, vx away from the paddle, then _apply_paddle_influence. Works in
+    scratch.tmp and scratch.tmp2.
+    """
+    x, y, vx, vy = ball
+    tmp = scratch.tmp
+    tmp2 = scratch.tmp2
+    abs_vx = np.abs(vx, out=tmp)
+    if paddle.left:
+        np.copyto(x, paddle.x + paddle.width, where=hit)
+        np.copyto(vx, abs_vx, where=hit)
+    else:
+        np.copyto(x, paddle.x - size, where=hit)
+        np.negative(abs_vx, out=vx, where=hit)
+
+    # offset of the ball center from the paddle center, normalized
+    half = paddle.height / 2
+    norm = np.add(y, size / 2, out=tmp)
+    norm -= np.add(paddle.y, half, out=tmp2)
+    if paddle.height > 0:
+        norm /= half
+    else:
+        norm.fill(0.0)
+    np.clip(norm, -1.0, 1.0, out=norm)
+
+    new_vy = np.multiply(norm, rules.base_vy, out=tmp)
+    new_vy += np.multiply(paddle.vy, rules.inertia_factor, out=tmp2)
+    np.clip(new_vy, -rules.max_vy, rules.max_vy, out=new_vy)
+    np.copyto(vy, new_vy, where=hit)
+    np.multiply(vx, rules.speed_up, out=vx, where=hit)
+
+
+# pylint: enable=too-many-locals
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+# Justification: Two slabs, each with an entry and an exit per ball
+# pylint: disable=too-many-locals
+def _sweep_paddle(
+    ball: BallArrays, size: float, paddle: PaddleBox, scratch: Scratch
+):
+    """
+    SweptBallCollisionSystem._paddle_hit for the balls in scratch.heading:
+    0 if the ball already touches the paddle, else sweep_aabb's time of
+    impact within scratch.first. Balls with a contact no later than
+    scratch.first get it as their new scratch.first; the others are
+    cleared from scratch.heading.
+    """
+    x, y, vx, vy = ball
+    tmp = scratch.tmp
+    tmp2 = scratch.tmp2
+    entry = scratch.entry
+    leave = scratch.leave
+    first = scratch.first
+    heading = scratch.heading
+    mask = scratch.mask
+    mask2 = scratch.mask2
+
+    # overlaps(): already touching is a contact at t=0
+    touching = scratch.hit
+    np.greater_equal(np.add(x, size, out=tmp), paddle.x, out=touching)
+    touching &= np.less_equal(
+        x, np.add(paddle.x, paddle.width, out=tmp), out=mask
+    )
+    touching &= np.greater_equal(np.add(y, size, out=tmp), paddle.y, out=mask)
+    touching &= np.less_equal(
+        y, np.add(paddle.y, paddle.height, out=tmp), out=mask
+    )
+    touching &= heading
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # _slab on x; vx is never 0 for a ball heading for a paddle
+        near = np.subtract(paddle.x, np.add(x, size, out=tmp), out=tmp)
+        near /= vx
+        far = np.subtract(paddle.x + paddle.width, x, out=tmp2)
+        far /= vx
+        if paddle.left:  # vx < 0
+            np.copyto(entry, far)
+            np.copyto(leave, near)
+        else:
+            np.copyto(entry, near)
+            np.copyto(leave, far)
+
+        # _slab on y, folded into entry/leave as max()/min()
+        near = np.subtract(paddle.y, np.add(y, size, out=tmp), out=tmp)
+        near /= vy
+        far = np.add(paddle.y, paddle.height, out=tmp2)
+        far -= y
+        far /= vy
+    down = np.greater(vy, 0.0, out=mask)
+    np.maximum(entry, near, out=entry, where=down)
+    np.minimum(leave, far, out=leave, where=down)
+    up = np.less(vy, 0.0, out=mask)
+    np.maximum(entry, far, out=entry, where=up)
+    np.minimum(leave, near, out=leave, where=up)
+    # Level with the paddle: never in the slab if not in it already
+    apart = np.less(np.add(y, size, out=tmp), paddle.y, out=mask)
+    apart |= np.greater(y, np.add(paddle.y, paddle.height, out=tmp), out=mask2)
+    apart &= np.equal(vy, 0.0, out=mask2)
+    np.copyto(entry, np.inf, where=apart)
+
+    swept = np.less_equal(entry, leave, out=mask)
+    swept &= np.greater_equal(entry, 0.0, out=mask2)
+    swept &= np.less_equal(entry, first, out=mask2)
+    heading &= swept | touching
+    np.copyto(first, entry, where=swept)
+    np.copyto(first, 0.0, where=touching)
+
+
+# pylint: enable=too-many-locals
+
+
+# Justification: One loop resolving every contact kind in order, as in
+# SweptBallCollisionSystem.update
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+# pylint: disable=too-many-locals,too-many-statements
+def sweep_balls(
+    ball: BallArrays,
+    size: float,
+    paddles: Sequence[PaddleBox],
+    bounds: Tuple[float, float],
+    dt: float,
+    rules: type,
+    scratch: Scratch,
+) -> np.ndarray:
+    """
+    SweptBallCollisionSystem: move the balls through one step of `dt`
+    seconds from where they are, stopping at every wall or paddle contact
+    and carrying on with the bounced velocity.
+
+    Takes the place of the KinematicEntity move, bounce_walls() and
+    collide_paddle(). A ball is only tested against the paddles it is
+    heading for (by PaddleBox.left), and paddles do not move during the
+    step.
+
+    :param ball: The balls, at their start-of-step positions.
+    :type ball: BallArrays
+
+    :param size: Ball side.
+    :type size: float
+
+    :param paddles: Paddles at their end-of-step positions.
+    :type paddles: Sequence[PaddleBox]
+
+    :param bounds: (top, bottom) bounds of the ball.
+    :type bounds: Tuple[float, float]
+
+    :param dt: Step in seconds.
+    :type dt: float
+
+    :param rules: Holder of the tuning constants (base_vy, inertia_factor,
+        max_vy, speed_up, max_bounces), e.g. SweptBallCollisionSystem.
+    :type rules: type
+
+    :param scratch: Temporaries.
+    :type scratch: Scratch
+
+    :return: Paddle contacts per ball this step (scratch.hits).
+    :rtype: np.ndarray
+    """
+    x, y, vx, vy = ball
+    top, bottom = bounds
+    tmp = scratch.tmp
+    first = scratch.first
+    remaining = scratch.remaining
+    live = scratch.live
+    contact = scratch.contact
+    heading = scratch.heading
+    hits = scratch.hits
+    remaining.fill(dt)
+    live.fill(True)
+    hits.fill(0)
+
+    for _ in range(rules.max_bounces):
+        np.copyto(first, remaining)
+        contact.fill(_NONE)
+
+        # The wall the ball is heading for
+        for code, bound, toward in (
+            (_TOP, top, np.less),
+            (_BOTTOM, bottom - size, np.greater),
+        ):
+            toward(vy, 0.0, out=heading)
+            heading &= live
+            if not heading.any():
+                continue
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t = np.divide(np.subtract(bound, y, out=tmp), vy, out=tmp)
+            np.maximum(t, 0.0, out=t)
+            heading &= np.less_equal(t, first, out=scratch.mask)
+            np.copyto(first, t, where=heading)
+            np.copyto(contact, code, where=heading)
+
+        # The paddle the ball is heading for; it wins a tie with a wall
+        for index, paddle in enumerate(paddles):
+            toward = np.less if paddle.left else np.greater
+            toward(vx, 0.0, out=heading)
+            heading &= live
+            if not heading.any():
+                continue
+            _sweep_paddle(ball, size, paddle, scratch)
+            np.copyto(contact, _PADDLE + index, where=heading)
+
+        np.add(x, np.multiply(vx, first, out=tmp), out=x, where=live)
+        np.add(y, np.multiply(vy, first, out=tmp), out=y, where=live)
+        np.subtract(remaining, first, out=remaining, where=live)
+        np.not_equal(contact, _NONE, out=live)
+        if not live.any():
+            return hits
+
+        for code, bound in ((_TOP, top), (_BOTTOM, bottom - size)):
+            wall = np.equal(contact, code, out=heading)
+            np.copyto(y, bound, where=wall)
+            np.negative(vy, out=vy, where=wall)
+        for index, paddle in enumerate(paddles):
+            struck = np.equal(contact, _PADDLE + index, out=heading)
+            if struck.any():
+                hits += struck
+                _bounce_off(ball, size, paddle, struck, rules, scratch)
+
+    # Out of bounces: finish the step and keep the ball in bounds
+    np.add(x, np.multiply(vx, remaining, out=tmp), out=x, where=live)
+    np.add(y, np.multiply(vy, remaining, out=tmp), out=y, where=live)
+    np.minimum(y, bottom - size, out=y, where=live)
+    np.maximum(y, top, out=y, where=live)
+    return hits
+
+
+# pylint: enable=too-many-locals,too-many-statements
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def serve_balls(
+    where: np.ndarray,
+    ball: BallArrays,
+    spawn: Tuple[float, float],
+    velocity: Tuple[float | np.ndarray, float | np.ndarray],
+):
+    """
+    ResetRallySystem: put the selected balls at `spawn` with `velocity`.
+
+    :param where: Mask or indices of the balls to serve.
+    :type where: np.ndarray
+
+    :param ball: The balls.
+    :type ball: BallArrays
+
+    :param spawn: (x, y) top-left corner to serve from.
+    :type spawn: Tuple[float, float]
+
+    :param velocity: (vx, vy), each a float or one value per served ball.
+    :type velocity: Tuple[float | np.ndarray, float | np.ndarray]
+    """
+    x, y, vx, vy = ball
+    x[where] = spawn[0]
+    y[where] = spawn[1]
+    vx[where] = velocity[0]
+    vy[where] = velocity[1]
+
+
+def take_out(
+    x: np.ndarray, left: float, right: float, scratch: Scratch
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    BallOutSystem's test: which balls left the field on either side.
+
+    :param x: Ball left edges.
+    :type x: np.ndarray
+
+    :param left: Balls with x below this are out on the left.
+    :type left: float
+
+    :param right: Balls with x above this are out on the right (not below
+        `left`, so a ball is never out on both sides).
+    :type right: float
+
+    :param scratch: Temporaries.
+    :type scratch: Scratch
+
+    :return: (out on the left, out on the right) masks, in scratch.mask
+        and scratch.mask2.
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    return (
+        np.less(x, left, out=scratch.mask),
+        np.greater(x, right, out=scratch.mask2),
+    )
+
+
+def score_points(
+    out: Tuple[np.ndarray, np.ndarray],
+    scores: Tuple[np.ndarray, np.ndarray],
+    serve_direction: np.ndarray,
+    reset_rally: np.ndarray,
+):
+    """
+    ScoreLeftCommand/ScoreRightCommand for matches whose ball is out:
+    award the point and queue a serve towards the side that missed.
+
+    :param out: (out on the left, out on the right) masks from take_out().
+    :type out: Tuple[np.ndarray, np.ndarray]
+
+    :param scores: (left, right) scores, updated in place.
+    :type scores: Tuple[np.ndarray, np.ndarray]
+
+    :param serve_direction: -1/+1 serve direction per match.
+    :type serve_direction: np.ndarray
+
+    :param reset_rally: Whether each match serves on its next step.
+    :type reset_rally: np.ndarray
+    """
+    out_left, out_right = out
+    score_left, score_right = scores
+    score_right += out_left
+    score_left += out_right
+    np.copyto(serve_direction, -1.0, where=out_left)
+    np.copyto(serve_direction, 1.0, where=out_right)
+    np.logical_or(out_left, out_right, out=reset_rally)
+
+
+# Justification: The cached path is one array per component, as in
+# InterceptPredictor
+# pylint: disable=too-many-instance-attributes
+class InterceptCache:
+    """
+    InterceptPredictor for one paddle in many matches: a cached
+    predict_intercept_y per slot, recomputed only for slots whose ball
+    left the path the prediction was made on.
+
+    :ivar y (np.ndarray): Cached predictions.
+    """
+
+    def __init__(self, n: int, plane_x: float, top: float, bottom: float):
+        """
+        :param n: Slots.
+        :type n: int
+
+        :param plane_x: Ball x at which the intercept happens.
+        :type plane_x: float
+
+        :param top: Highest reachable ball y.
+        :type top: float
+
+        :param bottom: Lowest reachable ball y.
+        :type bottom: float
+        """
+        self.plane_x = plane_x
+        self.top = top
+        self.bottom = bottom
+        self.y = np.zeros(n)
+        self._vx = np.full(n, np.nan)
+        self._vy = np.full(n, np.nan)
+        self._line = np.full(n, np.nan)
+        self._slack = np.zeros(n)
+
+    def invalidate(self, where: np.ndarray | slice = slice(None)):
+        """
+        Forget the cached predictions of the selected slots.
+
+        :param where: Mask or indices (all slots by default).
+        :type where: np.ndarray | slice
+        """
+        self._vx[where] = np.nan
+
+    def compact(self, keep: np.ndarray):
+        """
+        Drop the slots not in `keep`.
+
+        :param keep: Mask of the slots to keep.
+        :type keep: np.ndarray
+        """
+        self.y = self.y[keep]
+        self._vx = self._vx[keep]
+        self._vy = self._vy[keep]
+        self._line = self._line[keep]
+        self._slack = self._slack[keep]
+
+    # Justification: Names each step of predict_intercept_y
+    # pylint: disable=too-many-locals
+    def predict(
+        self, ball: BallArrays, tracking: np.ndarray, scratch: Scratch
+    ) -> np.ndarray:
+        """
+        Predicted ball y at the plane, refreshed where `tracking` is set
+        and the cached path is stale.
+
+        :param ball: The balls.
+        :type ball: BallArrays
+
+        :param tracking: Slots that need a current prediction (not a
+            scratch array).
+        :type tracking: np.ndarray
+
+        :param scratch: Temporaries.
+        :type scratch: Scratch
+
+        :return: The cached predictions (self.y).
+        :rtype: np.ndarray
+        """
+        x, y, vx, vy = ball
+        tmp = scratch.tmp
+        tmp2 = scratch.tmp2
+        line = np.multiply(y, vx, out=tmp)
+        line -= np.multiply(x, vy, out=tmp2)
+        drift = np.abs(np.subtract(line, self._line, out=tmp2), out=tmp2)
+        refresh = np.less_equal(drift, self._slack, out=scratch.hit)
+        np.logical_not(refresh, out=refresh)
+        refresh |= np.not_equal(vx, self._vx, out=scratch.mask)
+        refresh |= np.not_equal(vy, self._vy, out=scratch.mask)
+        refresh &= tracking
+        if not refresh.any():
+            return self.y
+        np.copyto(self._line, line, where=refresh)
+
+        # predict_intercept_y, for every slot; only refreshed ones are kept
+        top = self.top
+        span = self.bottom - top
+        if span <= 0:
+            np.copyto(self.y, top, where=refresh)
+        else:
+            period = 2.0 * span
+            t = np.subtract(self.plane_x, x, out=tmp)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                t /= vx
+            np.maximum(t, 0.0, out=t)
+            t *= vy
+            t += np.subtract(y, top, out=tmp2)
+            m = np.mod(t, period, out=t)
+            fresh = np.subtract(period, m, out=tmp2)
+            np.copyto(fresh, m, where=np.less_equal(m, span, out=scratch.mask))
+            fresh += top
+            np.copyto(self.y, fresh, where=refresh)
+
+        np.copyto(self._vx, vx, where=refresh)
+        np.copyto(self._vy, vy, where=refresh)
+        slack = np.abs(vx, out=tmp)
+        slack += np.abs(vy, out=tmp2)
+        slack *= InterceptPredictor.tolerance
+        np.copyto(self._slack, slack, where=refresh)
+        return self.y
+
+    # pylint: enable=too-many-locals
+
+
+# pylint: enable=too-many-instance-attributes
@@ -0,0 +1,29 @@
+"""
+Online versus play with rollback netcode.
+
+Match broadcasts to spectators live in deja_bounce.net.spectate, which is
+not imported here so that it can run as ``python -m``.
+"""
+
+from __future__ import annotations
+
+from .lobby import host, join
+from .protocol import Hello, InputPacket, Welcome, decode
+from .rollback import RollbackSession
+from .scene import NetPongScene
+from .transport import LinkConditions, NetLoop, UdpPeer, get_net_loop
+
+__all__ = [
+    "Hello",
+    "InputPacket",
+    "LinkConditions",
+    "NetLoop",
+    "NetPongScene",
+    "RollbackSession",
+    "UdpPeer",
+    "Welcome",
+    "decode",
+    "get_net_loop",
+    "host",
+    "join",
+]
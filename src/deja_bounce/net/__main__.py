@@ -0,0 +1,128 @@
+"""
+Command line entry point for online versus matches.
+
+Usage:
+    python -m deja_bounce.net --host 7777
+    python -m deja_bounce.net --join 192.168.1.20:7777
+    python -m deja_bounce.net --loopback --latency 50 --loss 5 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from deja_bounce.net.lobby import host, join
+from deja_bounce.net.transport import LinkConditions
+
+
+def _connect(args: argparse.Namespace, conditions: LinkConditions):
+    if args.host is not None:
+        print(f"Waiting for a guest on port {args.host}...")
+        peer, seed = host(("0.0.0.0", args.host), conditions)
+        return peer, "LEFT", seed
+    address, port = args.join.rsplit(":", 1)
+    peer, welcome = join((address, int(port)), conditions)
+    return peer, "RIGHT", welcome.seed
+
+
+def _play(args: argparse.Namespace, conditions: LinkConditions):
+    # The native backend is only needed to play, so import it lazily
+    # pylint: disable=import-outside-toplevel
+    from mini_arcade_core import Game, GameConfig
+    from mini_arcade_native_backend import NativeBackend
+
+    from deja_bounce.assets import get_asset_manager
+    from deja_bounce.constants import DEFAULT_FONT, FPS, WINDOW_SIZE
+    from deja_bounce.net.scene import NetPongScene
+    from deja_bounce.scenes.registry import LazySceneRegistry
+
+    # pylint: enable=import-outside-toplevel
+
+    peer, side, seed = _connect(args, conditions)
+    game = Game(
+        GameConfig(
+            width=WINDOW_SIZE[0],
+            height=WINDOW_SIZE[1],
+            title=f"DejaBounce online ({side.lower()} paddle)",
+            fps=FPS,
+            backend=NativeBackend(
+                font_path=str(get_asset_manager().path(DEFAULT_FONT)),
+                font_size=24,
+            ),
+        ),
+        registry=LazySceneRegistry().discover("deja_bounce.scenes"),
+    )
+    game.run(NetPongScene(game, peer, side, seed))
+
+
+def _loopback(args: argparse.Namespace, conditions: LinkConditions):
+    # pylint: disable=import-outside-toplevel
+    from deja_bounce.net.loopback import run_loopback
+
+    # pylint: enable=import-outside-toplevel
+
+    report = run_loopback(args.seconds, conditions, args.seed)
+    print(
+        f"{report.seconds:.1f}s over localhost, "
+        f"{conditions.latency * 2000:.0f} ms RTT, "
+        f"{conditions.jitter * 1000:.0f} ms jitter, "
+        f"{conditions.loss:.0%} loss, input delay 0 ticks"
+    )
+    for name, stats, score in zip(
+        ("host", "guest"), report.peers, report.scores
+    ):
+        rollbacks = stats["rollbacks"] or 1
+        print(
+            f"  {name:<5} {stats['ticks']:>5} ticks  "
+            f"{stats['rollbacks']:>4} rollbacks "
+            f"(avg {stats['resimulated'] / rollbacks:.1f}, "
+            f"max {stats['max_resimulated']} ticks, "
+            f"max {stats['max_resim_ms']:.2f} ms)  "
+            f"{stats['stalls']:>3} stalls  "
+            f"{stats['bytes_sent'] / report.seconds:,.0f} B/s  "
+            f"{stats['checked']} checks, {stats['desyncs']} desyncs  "
+            f"score {score[0]}-{score[1]}"
+        )
+    print("in sync" if report.in_sync else "DESYNC")
+    if not report.in_sync:
+        raise SystemExit(1)
+
+
+def main(argv: list[str] | None = None):
+    """Host, join, or test an online match over localhost."""
+    parser = argparse.ArgumentParser(prog="python -m deja_bounce.net")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--host", type=int, metavar="PORT")
+    mode.add_argument("--join", metavar="HOST:PORT")
+    mode.add_argument(
+        "--loopback",
+        action="store_true",
+        help="play two scripted peers against each other over localhost",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="added one-way ms"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="random extra ms"
+    )
+    parser.add_argument(
+        "--loss", type=float, default=0.0, help="percent of packets dropped"
+    )
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    conditions = LinkConditions(
+        latency=args.latency / 1000.0,
+        jitter=args.jitter / 1000.0,
+        loss=args.loss / 100.0,
+        seed=args.seed,
+    )
+    if args.loopback:
+        _loopback(args, conditions)
+    else:
+        _play(args, conditions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Handshake that starts an online versus match.
+
+The host binds a port and waits; the guest sends hellos until the host's
+welcome arrives with the match seed. A guest whose welcome was lost keeps
+saying hello, and the host's RollbackSession answers it again.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Tuple
+
+from deja_bounce.constants import FPS
+from deja_bounce.replay import new_seed
+
+from .protocol import Hello, Welcome, decode, encode_hello, encode_welcome
+from .transport import Address, LinkConditions, UdpPeer, get_net_loop
+
+HELLO_INTERVAL = 0.1
+
+
+def host(
+    local: Address,
+    conditions: LinkConditions = LinkConditions(),
+    seed: int | None = None,
+    timeout: float = 60.0,
+) -> Tuple[UdpPeer, int]:
+    """
+    Wait for a guest and welcome it.
+
+    :param local: Address to listen on.
+    :type local: Address
+
+    :param conditions: Simulated impairments of outgoing datagrams.
+    :type conditions: LinkConditions
+
+    :param seed: Match seed (a fresh one if omitted).
+    :type seed: int, optional
+
+    :param timeout: Seconds to wait for a guest.
+    :type timeout: float
+
+    :return: The connected peer and the match seed.
+    :rtype: Tuple[UdpPeer, int]
+
+    :raises TimeoutError: If no guest said hello in time.
+    """
+    peer = get_net_loop().open_peer(local, None, conditions)
+    seed = new_seed() if seed is None else seed
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for data in peer.receive():
+            if isinstance(decode(data), Hello):
+                peer.send(encode_welcome(seed, FPS))
+                return peer, seed
+        time.sleep(0.01)
+    peer.close()
+    raise TimeoutError(f"no guest joined {local[0]}:{local[1]}")
+
+
+def join(
+    remote: Address,
+    conditions: LinkConditions = LinkConditions(),
+    local: Address = ("0.0.0.0", 0),
+    timeout: float = 10.0,
+) -> Tuple[UdpPeer, Welcome]:
+    """
+    Say hello to a host until it answers.
+
+    :param remote: Host address.
+    :type remote: Address
+
+    :param conditions: Simulated impairments of outgoing datagrams.
+    :type conditions: LinkConditions
+
+    :param local: Address to bind.
+    :type local: Address
+
+    :param timeout: Seconds to keep trying.
+    :type timeout: float
+
+    :return: The connected peer and the host's welcome.
+    :rtype: Tuple[UdpPeer, Welcome]
+
+    :raises TimeoutError: If the host never answered.
+    """
+    peer = get_net_loop().open_peer(local, remote, conditions)
+    hello = encode_hello()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        peer.send(hello)
+        resend = time.monotonic() + HELLO_INTERVAL
+        while time.monotonic() < resend:
+            for data in peer.receive():
+                packet = decode(data)
+                if isinstance(packet, Welcome):
+                    return peer, packet
+            time.sleep(0.01)
+    peer.close()
+    raise TimeoutError(f"host {remote[0]}:{remote[1]} did not answer")
@@ -0,0 +1,170 @@
+"""
+Wire format of online versus matches.
+
+Peers only exchange input edges, encoded with the replay log's edge codes
+(see deja_bounce.replay.log), plus the bookkeeping rollback needs. Every
+input packet repeats all edges the other side has not acknowledged yet, so
+a lost or reordered packet is repaired by the next one. Layout (little
+endian)::
+
+    hello    kind u8 | version u8
+    welcome  kind u8 | version u8 | seed u32 | fps u16
+    input    kind u8 | frame u32 | ack u32 | sync tick u32 | sync crc u32
+             | count u8 | (tick u32 | code u8) * count
+
+`frame` is the sender's next tick: every edge of its earlier ticks is in
+this packet or was acknowledged. `ack` is the sender's `frame` count of
+the receiver's ticks. `sync tick`/`sync crc` are the checksum of the
+sender's state at a tick whose inputs are confirmed on both sides.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import List, NamedTuple, Sequence, Union
+
+from deja_bounce.replay.log import InputEdge
+
+VERSION = 1
+MAX_EDGES = 255
+
+_HELLO = 1
+_WELCOME = 2
+_INPUT = 3
+
+_KIND = struct.Struct("<B")
+_HELLO_PACKET = struct.Struct("<BB")
+_WELCOME_PACKET = struct.Struct("<BBIH")
+_INPUT_HEADER = struct.Struct("<BIIIIB")
+_EDGE = struct.Struct("<IB")
+
+
+class Hello(NamedTuple):
+    """
+    Guest asking to join.
+
+    :ivar version (int): Protocol version of the guest.
+    """
+
+    version: int
+
+
+class Welcome(NamedTuple):
+    """
+    Host accepting a guest.
+
+    :ivar version (int): Protocol version of the host.
+    :ivar seed (int): Match seed both peers simulate with.
+    :ivar fps (int): Simulation ticks per second.
+    """
+
+    version: int
+    seed: int
+    fps: int
+
+
+class InputPacket(NamedTuple):
+    """
+    Input edges and rollback bookkeeping from one peer.
+
+    :ivar frame (int): Sender's next tick.
+    :ivar ack (int): Ticks of the receiver's input the sender has.
+    :ivar sync_tick (int): Tick of the state checksum.
+    :ivar sync_crc (int): Checksum of the sender's state at sync_tick.
+    :ivar edges (List[InputEdge]): Sender's unacknowledged edges.
+    """
+
+    frame: int
+    ack: int
+    sync_tick: int
+    sync_crc: int
+    edges: List[InputEdge]
+
+
+Packet = Union[Hello, Welcome, InputPacket]
+
+
+def encode_hello() -> bytes:
+    """
+    :return: A hello packet.
+    :rtype: bytes
+    """
+    return _HELLO_PACKET.pack(_HELLO, VERSION)
+
+
+def encode_welcome(seed: int, fps: int) -> bytes:
+    """
+    :param seed: Match seed.
+    :type seed: int
+
+    :param fps: Simulation ticks per second.
+    :type fps: int
+
+    :return: A welcome packet.
+    :rtype: bytes
+    """
+    return _WELCOME_PACKET.pack(_WELCOME, VERSION, seed, fps)
+
+
+def encode_input(
+    frame: int,
+    ack: int,
+    sync_tick: int,
+    sync_crc: int,
+    edges: Sequence[InputEdge],
+) -> bytes:
+    """
+    Encode an input packet; only the first MAX_EDGES edges fit, the rest
+    go in a later packet.
+
+    :return: The encoded packet.
+    :rtype: bytes
+    """
+    edges = edges[:MAX_EDGES]
+    out = bytearray(_INPUT_HEADER.size + len(edges) * _EDGE.size)
+    _INPUT_HEADER.pack_into(
+        out, 0, _INPUT, frame, ack, sync_tick, sync_crc, len(edges)
+    )
+    pos = _INPUT_HEADER.size
+    for edge in edges:
+        _EDGE.pack_into(out, pos, edge.tick, edge.code)
+        pos += _EDGE.size
+    return bytes(out)
+
+
+def decode(data: bytes) -> Packet | None:
+    """
+    Decode any packet.
+
+    :param data: Datagram payload.
+    :type data: bytes
+
+    :return: The packet, or None if it is malformed or of another version.
+    :rtype: Packet | None
+    """
+    if not data:
+        return None
+    (kind,) = _KIND.unpack_from(data)
+    try:
+        if kind == _INPUT:
+            _, frame, ack, sync_tick, sync_crc, count = (
+                _INPUT_HEADER.unpack_from(data)
+            )
+            edges = [
+                InputEdge(*_EDGE.unpack_from(data, pos))
+                for pos in range(
+                    _INPUT_HEADER.size,
+                    _INPUT_HEADER.size + count * _EDGE.size,
+                    _EDGE.size,
+                )
+            ]
+            return InputPacket(frame, ack, sync_tick, sync_crc, edges)
+        if kind == _HELLO:
+            packet: Packet = Hello(_HELLO_PACKET.unpack_from(data)[1])
+        elif kind == _WELCOME:
+            packet = Welcome(*_WELCOME_PACKET.unpack_from(data)[1:])
+        else:
+            return None
+    except struct.error:
+        return None
+    return packet if packet.version == VERSION else None
@@ -0,0 +1,309 @@
+"""
+Rollback netcode for online versus matches.
+
+Each peer simulates every tick as soon as its own input is known,
+predicting that the remote paddle keeps doing what it did last (input
+edges are absolute presses and releases, so "no new edge" is the
+prediction). When the remote's edges arrive and one of them falls on a
+tick that was already simulated, the scene is restored from its
+RewindBuffer to that tick and the ticks since are re-simulated with the
+corrected input, all within the current frame.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from time import perf_counter
+from typing import TYPE_CHECKING, Dict, List
+
+from deja_bounce.controllers.cpu import Side
+from deja_bounce.entities.paddle import Paddle
+from deja_bounce.replay.log import InputEdge, paddle_code
+
+from .protocol import Hello, InputPacket, decode, encode_input, encode_welcome
+
+if TYPE_CHECKING:
+    from deja_bounce.scenes.pong import PongScene
+
+    from .transport import UdpPeer
+
+_CHECKSUMS_KEPT = 256
+
+
+# Justification: Rollback bookkeeping plus the stats it reports
+# pylint: disable=too-many-instance-attributes
+class RollbackSession:
+    """
+    Drives a PongScene's ticks for one side of an online match.
+
+    Local input reaches the session through the same `edge()` call the
+    paddle commands make on a ReplayRecorder, so it is applied with no
+    added delay.
+
+    :ivar side (Side): Paddle this peer controls.
+    :ivar max_rollback (int): Ticks the simulation may run ahead of the
+        remote's confirmed input before it waits.
+    :ivar remote_frame (int): Ticks of remote input received so far.
+    :ivar rollbacks (int): Corrections that needed re-simulation.
+    :ivar resimulated (int): Ticks re-simulated in total.
+    :ivar max_resimulated (int): Most ticks re-simulated in one step.
+    :ivar max_resim_ms (float): Longest single re-simulation, in ms.
+    :ivar stalls (int): Ticks skipped waiting for the remote.
+    :ivar checked (int): State checksums compared with the remote.
+    :ivar desyncs (int): Checksums that did not match.
+    """
+
+    def __init__(
+        self,
+        scene: PongScene,
+        peer: UdpPeer,
+        side: Side,
+        max_rollback: int = 8,
+    ):
+        """
+        :param scene: Scene to drive; its RewindBuffer must hold at least
+            max_rollback + 1 ticks.
+        :type scene: PongScene
+
+        :param peer: Link to the other player.
+        :type peer: UdpPeer
+
+        :param side: Paddle this peer controls.
+        :type side: Side
+
+        :param max_rollback: Prediction window in ticks.
+        :type max_rollback: int
+        """
+        self.scene = scene
+        self.peer = peer
+        self.side = side
+        self.max_rollback = max_rollback
+        self.remote_side: Side = "RIGHT" if side == "LEFT" else "LEFT"
+
+        self.local_edges: List[InputEdge] = []
+        self.remote_frame = 0
+        self._inputs: Dict[int, List[InputEdge]] = defaultdict(list)
+        self._peer_ack = 0  # ticks of our input the remote has
+        self._remote_advantage = 0
+        self._rollback_to: int | None = None
+        self._steps = 0
+        self._synced = -1  # newest tick whose checksum was taken
+        self._checksums: Dict[int, int] = {}
+        self._remote_checksums: Dict[int, int] = {}
+
+        self.rollbacks = 0
+        self.resimulated = 0
+        self.max_resimulated = 0
+        self.max_resim_ms = 0.0
+        self.stalls = 0
+        self.checked = 0
+        self.desyncs = 0
+
+    @property
+    def local_paddle(self) -> Paddle:
+        """Paddle this peer controls."""
+        scene = self.scene
+        return scene.left_paddle if self.side == "LEFT" else scene.right_paddle
+
+    @property
+    def advantage(self) -> int:
+        """Ticks this peer runs ahead of the remote (negative if behind)."""
+        local = self.scene.tick - self.remote_frame
+        return (local - self._remote_advantage) // 2
+
+    def edge(self, paddle: Paddle, direction: str, pressed: bool):
+        """
+        Record a local input edge for the next tick (the ReplayRecorder
+        interface MovePaddleCommand and StopPaddleCommand report to).
+
+        :param paddle: Paddle the command targeted.
+        :type paddle: Paddle
+
+        :param direction: "up" or "down".
+        :type direction: str
+
+        :param pressed: True when the paddle starts moving.
+        :type pressed: bool
+        """
+        if paddle is not self.local_paddle:
+            return
+        edge = InputEdge(
+            self.scene.tick, paddle_code(self.side, direction, pressed)
+        )
+        self.local_edges.append(edge)
+        self._inputs[edge.tick].append(edge)
+
+    def step(self) -> bool:
+        """
+        Take in the remote's input, re-simulate anything it corrected and
+        run the next tick.
+
+        :return: False if the tick was skipped to wait for the remote.
+        :rtype: bool
+        """
+        self._poll()
+        scene = self.scene
+        if self._rollback_to is not None:
+            self._resimulate(self._rollback_to)
+            self._rollback_to = None
+
+        # Wait rather than predict further than history can undo, and give
+        # the remote a tick now and then to catch up when running ahead
+        self._steps += 1
+        waiting = scene.tick - self.remote_frame >= self.max_rollback or (
+            self.advantage > 1 and self._steps % 4 == 0
+        )
+        if waiting:
+            self.stalls += 1
+        else:
+            self._simulate_tick()
+        self._send()
+        return not waiting
+
+    def _simulate_tick(self):
+        scene = self.scene
+        self._apply(scene.tick)
+        scene.rewind.capture()
+        scene._simulate()  # pylint: disable=protected-access
+
+    def _apply(self, tick: int):
+        edges = self._inputs.get(tick)
+        if not edges:
+            return
+        scene = self.scene
+        for edge in edges:
+            paddle = (
+                scene.right_paddle
+                if edge.side == "RIGHT"
+                else scene.left_paddle
+            )
+            if edge.direction == "up":
+                paddle.moving_up = edge.pressed
+            else:
+                paddle.moving_down = edge.pressed
+
+    def _resimulate(self, tick: int):
+        scene = self.scene
+        now = scene.tick
+        start = perf_counter()
+        if not scene.rewind.rewind_to(tick):
+            # Cannot happen while max_rollback fits the buffer
+            raise RuntimeError(f"rollback to tick {tick} is out of history")
+        while scene.tick < now:
+            self._simulate_tick()
+        # Local edges for the coming tick were applied by their commands,
+        # but the restored paddle flags predate them
+        self._apply(now)
+        elapsed = (perf_counter() - start) * 1000.0
+        self.rollbacks += 1
+        self.resimulated += now - tick
+        self.max_resimulated = max(self.max_resimulated, now - tick)
+        self.max_resim_ms = max(self.max_resim_ms, elapsed)
+
+    def _poll(self):
+        for data in self.peer.receive():
+            packet = decode(data)
+            if isinstance(packet, InputPacket):
+                self._receive(packet)
+            elif isinstance(packet, Hello):
+                # The guest missed our welcome
+                scene = self.scene
+                self.peer.send(encode_welcome(scene.seed, scene.fps))
+
+    def _receive(self, packet: InputPacket):
+        self._peer_ack = max(self._peer_ack, packet.ack)
+        if packet.sync_crc:
+            self._remote_checksums[packet.sync_tick] = packet.sync_crc
+            self._compare(packet.sync_tick)
+        if packet.frame <= self.remote_frame:
+            return  # old or duplicate: everything in it is known
+        self._remote_advantage = packet.frame - packet.ack
+        tick = self.scene.tick
+        for edge in packet.edges:
+            if not self.remote_frame <= edge.tick < packet.frame:
+                continue
+            if edge.side != self.remote_side:
+                continue
+            self._inputs[edge.tick].append(edge)
+            if edge.tick < tick and (
+                self._rollback_to is None or edge.tick < self._rollback_to
+            ):
+                self._rollback_to = edge.tick
+        self.remote_frame = packet.frame
+
+    def _send(self):
+        scene = self.scene
+        peer_ack = self._peer_ack
+        self.local_edges = [e for e in self.local_edges if e.tick >= peer_ack]
+        # Edges of the coming tick may still change, so they wait
+        unacked = [e for e in self.local_edges if e.tick < scene.tick]
+
+        # Checksum every tick whose inputs both sides now agree on
+        sync_tick = min(self.remote_frame, scene.tick) - 1
+        for tick in range(max(self._synced + 1, 0), sync_tick + 1):
+            crc = scene.rewind.checksum(tick)
+            if crc is not None:
+                self._checksums[tick] = crc
+                self._compare(tick)
+        self._synced = max(self._synced, sync_tick)
+        sync_crc = scene.rewind.checksum(sync_tick) if sync_tick >= 0 else None
+
+        self.peer.send(
+            encode_input(
+                scene.tick,
+                self.remote_frame,
+                max(sync_tick, 0),
+                sync_crc or 0,
+                unacked,
+            )
+        )
+        self._trim(scene.tick)
+
+    def _compare(self, tick: int):
+        local = self._checksums.get(tick)
+        remote = self._remote_checksums.pop(tick, None)
+        if local is None or remote is None:
+            if remote is not None:
+                self._remote_checksums[tick] = remote
+            return
+        # Each tick is compared once; repeats of it are trimmed later
+        del self._checksums[tick]
+        self.checked += 1
+        if local != remote:
+            self.desyncs += 1
+
+    def _trim(self, tick: int):
+        oldest = tick - _CHECKSUMS_KEPT
+        for table in (self._checksums, self._remote_checksums):
+            for old in [t for t in table if t < oldest]:
+                del table[old]
+        for old in [
+            t
+            for t in self._inputs
+            if t < min(self.remote_frame, tick) - self.max_rollback - 1
+        ]:
+            del self._inputs[old]
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Netplay counters, e.g. for logging when the match ends.
+
+        :return: Counter name to value.
+        :rtype: Dict[str, float]
+        """
+        return {
+            "ticks": self.scene.tick,
+            "rollbacks": self.rollbacks,
+            "resimulated": self.resimulated,
+            "max_resimulated": self.max_resimulated,
+            "max_resim_ms": self.max_resim_ms,
+            "stalls": self.stalls,
+            "checked": self.checked,
+            "desyncs": self.desyncs,
+            "sent": self.peer.sent,
+            "dropped": self.peer.dropped,
+            "bytes_sent": self.peer.bytes_sent,
+        }
+
+
+# pylint: enable=too-many-instance-attributes
@@ -0,0 +1,105 @@
+"""
+Pong scene for online versus matches.
+"""
+
+from __future__ import annotations
+
+from mini_arcade_core import Game
+from mini_arcade_core.keymaps import Key
+
+from deja_bounce.constants import FPS
+from deja_bounce.controllers.cpu import Side
+from deja_bounce.scenes.commands import (
+    MovePaddleCommand,
+    QuitCommand,
+    StopPaddleCommand,
+    TogglePerfHudCommand,
+)
+from deja_bounce.scenes.overlays import (
+    PerfHudOverlay,
+    ScoreOverlay,
+    WallsOverlay,
+)
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.utils import logger
+
+from .rollback import RollbackSession
+from .transport import UdpPeer
+
+
+class NetPongScene(PongScene):
+    """
+    PongScene where each of two peers plays one paddle over the network.
+
+    There are no CPU paddles, cheats, rewind or multiball, since every
+    tick has to be re-simulated identically on both machines. W/S (or the
+    arrow keys) move the local paddle; the RollbackSession runs the ticks.
+
+    :cvar max_rollback (int): Ticks of remote input that may be predicted.
+    """
+
+    record_replays = False
+    max_rollback = 8
+
+    def __init__(self, game: Game, peer: UdpPeer, side: Side, seed: int):
+        """
+        :param game: The game instance.
+        :type game: Game
+
+        :param peer: Link to the other player.
+        :type peer: UdpPeer
+
+        :param side: Paddle this peer plays.
+        :type side: Side
+
+        :param seed: Match seed agreed with the other player.
+        :type seed: int
+        """
+        # History only has to reach back over the prediction window
+        self.rewind_seconds = (self.max_rollback + 2) / FPS
+        super().__init__(game, seed=seed)
+        self.session = RollbackSession(self, peer, side, self.max_rollback)
+
+    def on_enter(self):
+        logger.info("NetPongScene on_enter (%s paddle)", self.session.side)
+        inputs = self.services.input
+        inputs.on_quit(QuitCommand(), "quit")
+        inputs.on_key_down(Key.ESCAPE, QuitCommand(), "quit")
+        inputs.on_key_down(Key.H, TogglePerfHudCommand(), "perf_hud")
+        paddle = self.session.local_paddle
+        for key, direction in (
+            (Key.W, "up"),
+            (Key.S, "down"),
+            (Key.UP, "up"),
+            (Key.DOWN, "down"),
+        ):
+            inputs.on_key_down(
+                key,
+                MovePaddleCommand(paddle, direction, self.session),
+                f"net_{direction}",
+            )
+            inputs.on_key_up(
+                key,
+                StopPaddleCommand(paddle, direction, self.session),
+                f"net_{direction}",
+            )
+        self.services.entities.add(
+            self.left_paddle, self.right_paddle, self.ball
+        )
+        self.retained = (
+            WallsOverlay(self.model, self.size),
+            ScoreOverlay(self.model, self.size),
+        )
+        for overlay in self.retained:
+            self.services.overlays.add(overlay)
+        self.services.overlays.add(PerfHudOverlay(self.model, self.size, self))
+        self._add_rule_systems()
+        self._systems_on_enter()
+
+    def on_exit(self):
+        super().on_exit()
+        logger.info("Netplay session: %s", self.session.stats())
+        self.session.peer.close()
+
+    def _step(self) -> bool:
+        return self.session.step()
@@ -0,0 +1,648 @@
+"""
+Spectator broadcast: a headless match streamed to many TCP viewers.
+
+Every tick the server captures a SpectatorState (quantized ball and paddle
+positions, the score and the model toggles) and encodes it once as a delta
+against the previous tick: a bit mask of the fields that changed, followed
+by just those fields. The same bytes are written to every spectator.
+Periodic keyframes carry the whole state. A viewer that joins, or that
+fell behind and had frames skipped, gets a keyframe before any more
+deltas. Messages on the stream (little endian)::
+
+    message   length u8 | payload
+    keyframe  1 u8 | tick u32 | fields
+    delta     2 u8 | ticks since previous message u8 | mask u8 | fields
+
+Fields, in mask bit order: ball x, ball y, left paddle y, right paddle y
+(i16 quarter pixels), score left, score right, flags (u16).
+
+Usage:
+    python -m deja_bounce.net.spectate --serve 7778
+    python -m deja_bounce.net.spectate --watch 127.0.0.1:7778
+    python -m deja_bounce.net.spectate --load 500 --seconds 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional
+
+from deja_bounce.constants import FPS
+from deja_bounce.replay import new_seed
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.simulation.headless import HeadlessMatch
+from deja_bounce.utils import logger
+
+KEYFRAME_SECONDS = 1.0
+MAX_CLIENT_BUFFER = 16 * 1024  # bytes queued for a viewer before skipping
+READ_CHUNK = 4096  # bytes read (and dropped) at a time from a viewer
+
+_KEYFRAME = 1
+_DELTA = 2
+
+_FIELDS = ("ball_x", "ball_y", "left_y", "right_y", "left", "right", "flags")
+_FIELD_FORMATS = "hhhhHHH"
+_FIELD_STRUCTS = [struct.Struct("<" + fmt) for fmt in _FIELD_FORMATS]
+_KEYFRAME_HEADER = struct.Struct("<BI")
+_DELTA_HEADER = struct.Struct("<BBB")
+_ALL_FIELDS = struct.Struct("<" + _FIELD_FORMATS)
+
+# PongModel flags streamed to viewers, one bit each
+_FLAGS = (
+    "wall_left",
+    "wall_right",
+    "god_mode_p1",
+    "god_mode_p2",
+    "slow_mo",
+    "cpu_vs_cpu",
+    "trail_mode",
+    "photo_mode",
+)
+_WINNER_P1 = 1 << 8
+_WINNER_P2 = 1 << 9
+
+
+class SpectatorState(NamedTuple):
+    """
+    What a viewer needs to draw one tick.
+
+    :ivar tick (int): Server tick.
+    :ivar ball_x (int): Ball left edge, in quarter pixels.
+    :ivar ball_y (int): Ball top edge, in quarter pixels.
+    :ivar left_y (int): Left paddle top edge, in quarter pixels.
+    :ivar right_y (int): Right paddle top edge, in quarter pixels.
+    :ivar left (int): Left player's score.
+    :ivar right (int): Right player's score.
+    :ivar flags (int): PongModel toggles and winner bits.
+    """
+
+    tick: int
+    ball_x: int
+    ball_y: int
+    left_y: int
+    right_y: int
+    left: int
+    right: int
+    flags: int
+
+
+def _quarter(value: float) -> int:
+    return max(-32768, min(32767, round(value * 4)))
+
+
+def capture_state(scene: PongScene, tick: int) -> SpectatorState:
+    """
+    Quantize a scene's current state.
+
+    :param scene: Scene to capture.
+    :type scene: PongScene
+
+    :param tick: Tick number to stamp the state with.
+    :type tick: int
+
+    :return: The state.
+    :rtype: SpectatorState
+    """
+    model = scene.model
+    flags = 0
+    for bit, name in enumerate(_FLAGS):
+        if getattr(model, name):
+            flags |= 1 << bit
+    if model.winner == "P1":
+        flags |= _WINNER_P1
+    elif model.winner == "P2":
+        flags |= _WINNER_P2
+    return SpectatorState(
+        tick,
+        _quarter(scene.ball.position.x),
+        _quarter(scene.ball.position.y),
+        _quarter(scene.left_paddle.position.y),
+        _quarter(scene.right_paddle.position.y),
+        model.score.left,
+        model.score.right,
+        flags,
+    )
+
+
+class DeltaEncoder:
+    """
+    Turns successive states into keyframe and delta messages.
+
+    :ivar keyframe_interval (int): Ticks between forced keyframes.
+    """
+
+    def __init__(self, keyframe_interval: int = round(KEYFRAME_SECONDS * FPS)):
+        """
+        :param keyframe_interval: Ticks between forced keyframes.
+        :type keyframe_interval: int
+        """
+        self.keyframe_interval = keyframe_interval
+        self._last: Optional[SpectatorState] = None
+        self._last_keyframe = 0
+
+    def keyframe(self, state: SpectatorState) -> bytes:
+        """
+        Encode the whole state.
+
+        :param state: State to encode.
+        :type state: SpectatorState
+
+        :return: A framed keyframe message.
+        :rtype: bytes
+        """
+        payload = _KEYFRAME_HEADER.pack(_KEYFRAME, state.tick) + (
+            _ALL_FIELDS.pack(*state[1:])
+        )
+        return bytes((len(payload),)) + payload
+
+    def encode(self, state: SpectatorState) -> bytes:
+        """
+        Encode `state` against the previously encoded one; a keyframe when
+        one is due or there is nothing to diff against.
+
+        :param state: State to encode.
+        :type state: SpectatorState
+
+        :return: A framed message.
+        :rtype: bytes
+        """
+        last = self._last
+        self._last = state
+        if (
+            last is None
+            or state.tick - self._last_keyframe >= self.keyframe_interval
+            or not 0 < state.tick - last.tick < 256
+        ):
+            self._last_keyframe = state.tick
+            return self.keyframe(state)
+
+        mask = 0
+        body = bytearray()
+        for bit in range(len(_FIELDS)):
+            value = state[bit + 1]
+            if value != last[bit + 1]:
+                mask |= 1 << bit
+                body += _FIELD_STRUCTS[bit].pack(value)
+        payload = _DELTA_HEADER.pack(_DELTA, state.tick - last.tick, mask)
+        return bytes((len(payload) + len(body),)) + payload + body
+
+
+class DeltaDecoder:
+    """
+    Rebuilds states from a spectator stream, fed in arbitrary chunks.
+
+    :ivar state (SpectatorState | None): Latest decoded state.
+    :ivar keyframes (int): Keyframes decoded.
+    :ivar deltas (int): Deltas applied.
+    """
+
+    def __init__(self):
+        self.state: Optional[SpectatorState] = None
+        self.keyframes = 0
+        self.deltas = 0
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> int:
+        """
+        Decode every complete message in `data` plus what was buffered.
+
+        :param data: Bytes read from the stream.
+        :type data: bytes
+
+        :return: Number of states decoded.
+        :rtype: int
+        """
+        buffer = self._buffer
+        buffer += data
+        pos = 0
+        decoded = 0
+        while pos < len(buffer) and pos + 1 + buffer[pos] <= len(buffer):
+            end = pos + 1 + buffer[pos]
+            if self._apply(memoryview(buffer)[pos + 1 : end]):
+                decoded += 1
+            pos = end
+        del buffer[:pos]
+        return decoded
+
+    def _apply(self, payload: memoryview) -> bool:
+        kind = payload[0]
+        if kind == _KEYFRAME:
+            (_, tick) = _KEYFRAME_HEADER.unpack_from(payload)
+            values = _ALL_FIELDS.unpack_from(payload, _KEYFRAME_HEADER.size)
+            self.state = SpectatorState(tick, *values)
+            self.keyframes += 1
+            return True
+        state = self.state
+        if kind != _DELTA or state is None:
+            return False  # a delta needs a keyframe first
+        _, ticks, mask = _DELTA_HEADER.unpack_from(payload)
+        values = list(state)
+        values[0] += ticks
+        pos = _DELTA_HEADER.size
+        for bit in range(len(_FIELDS)):
+            if mask & (1 << bit):
+                (values[bit + 1],) = _FIELD_STRUCTS[bit].unpack_from(
+                    payload, pos
+                )
+                pos += _FIELD_STRUCTS[bit].size
+        self.state = SpectatorState(*values)
+        self.deltas += 1
+        return True
+
+
+@dataclass
+class _Viewer:
+    writer: asyncio.StreamWriter
+    needs_keyframe: bool = True
+
+
+# Justification: Broadcast loop state plus the counters it reports
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class BroadcastStats:
+    """
+    Counters of a SpectatorServer.
+
+    :ivar ticks (int): Ticks simulated and broadcast.
+    :ivar viewers (int): Viewers connected right now.
+    :ivar peak_viewers (int): Most viewers connected at once.
+    :ivar messages (int): Messages written, summed over viewers.
+    :ivar keyframes (int): Keyframes among them.
+    :ivar bytes_sent (int): Bytes written, summed over viewers.
+    :ivar keyframe_bytes (int): Bytes of keyframes among them.
+    :ivar skipped (int): Messages skipped for viewers that fell behind.
+    :ivar late_ticks (int): Ticks that started after their deadline.
+    :ivar cpu_seconds (float): Server thread CPU time spent in ticks.
+    :ivar wall_seconds (float): Real time the server has been running.
+    """
+
+    ticks: int = 0
+    viewers: int = 0
+    peak_viewers: int = 0
+    messages: int = 0
+    keyframes: int = 0
+    bytes_sent: int = 0
+    keyframe_bytes: int = 0
+    skipped: int = 0
+    late_ticks: int = 0
+    cpu_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def cpu_us_per_viewer_tick(self) -> float:
+        """Server CPU microseconds per viewer per tick."""
+        sends = max(1, self.messages + self.skipped)
+        return self.cpu_seconds * 1e6 / sends
+
+    @property
+    def bytes_per_viewer_second(self) -> float:
+        """Average bytes each viewer was sent per second."""
+        if not self.wall_seconds or not self.peak_viewers:
+            return 0.0
+        return self.bytes_sent / self.peak_viewers / self.wall_seconds
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+class SpectatorServer:
+    """
+    Runs a CPU-vs-CPU match at a fixed tick rate and streams it to every
+    connected viewer from one asyncio loop. When a match is won, a new one
+    starts.
+
+    :ivar stats (BroadcastStats): Server counters.
+    :ivar last_state (SpectatorState | None): Latest broadcast state.
+    """
+
+    def __init__(
+        self,
+        match: HeadlessMatch | None = None,
+        keyframe_interval: int = round(KEYFRAME_SECONDS * FPS),
+        max_buffer: int = MAX_CLIENT_BUFFER,
+    ):
+        """
+        :param match: Match to run (two "normal" CPUs if omitted).
+        :type match: HeadlessMatch, optional
+
+        :param keyframe_interval: Ticks between forced keyframes.
+        :type keyframe_interval: int
+
+        :param max_buffer: Bytes that may queue for one viewer before its
+            messages are skipped (it gets a keyframe once it catches up).
+        :type max_buffer: int
+        """
+        self.match = match if match is not None else HeadlessMatch()
+        self.match.scene.reset_match(new_seed())
+        self.encoder = DeltaEncoder(keyframe_interval)
+        self.max_buffer = max_buffer
+        self.stats = BroadcastStats()
+        self.last_state: Optional[SpectatorState] = None
+        self._viewers: List[_Viewer] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def port(self) -> int:
+        """Port the server listens on."""
+        assert self._server is not None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start accepting viewers.
+
+        :param host: Address to listen on.
+        :type host: str
+
+        :param port: Port (0 picks a free one).
+        :type port: int
+        """
+        self._server = await asyncio.start_server(
+            self._serve, host, port, backlog=1024
+        )
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        viewer = _Viewer(writer)
+        self._viewers.append(viewer)
+        stats = self.stats
+        stats.viewers = len(self._viewers)
+        stats.peak_viewers = max(stats.peak_viewers, stats.viewers)
+        try:
+            # Viewers have nothing to say; drop whatever arrives until they
+            # disconnect, so a chatty client cannot grow the buffer
+            while await reader.read(READ_CHUNK):
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self._viewers.remove(viewer)
+            stats.viewers = len(self._viewers)
+            writer.close()
+
+    def tick(self):
+        """Simulate one tick and send it to every viewer."""
+        match = self.match
+        scene = match.scene
+        scene.update(match.dt)
+        if scene.model.winner is not None:
+            scene.reset_match(new_seed())
+        state = capture_state(scene, self.stats.ticks)
+        self.stats.ticks += 1
+        self.last_state = state
+        self.broadcast(state)
+
+    def broadcast(self, state: SpectatorState):
+        """
+        Encode `state` once and write it to every viewer.
+
+        :param state: State to send.
+        :type state: SpectatorState
+        """
+        stats = self.stats
+        message = self.encoder.encode(state)
+        is_keyframe = message[1] == _KEYFRAME
+        keyframe = message if is_keyframe else None
+        for viewer in self._viewers:
+            writer = viewer.writer
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                viewer.needs_keyframe = True
+                stats.skipped += 1
+                continue
+            out = message
+            if viewer.needs_keyframe and not is_keyframe:
+                if keyframe is None:
+                    keyframe = self.encoder.keyframe(state)
+                out = keyframe
+            viewer.needs_keyframe = False
+            writer.write(out)
+            stats.messages += 1
+            stats.bytes_sent += len(out)
+            if out is keyframe:
+                stats.keyframes += 1
+                stats.keyframe_bytes += len(out)
+
+    async def run(self, seconds: float | None = None):
+        """
+        Tick at FPS until `seconds` have passed (forever if None).
+
+        :param seconds: How long to run.
+        :type seconds: float, optional
+        """
+        stats = self.stats
+        interval = 1.0 / FPS
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        due = start
+        while seconds is None or due - start < seconds:
+            now = loop.time()
+            if now - due > interval / 2:
+                stats.late_ticks += 1
+            cpu = time.thread_time()
+            self.tick()
+            stats.cpu_seconds += time.thread_time() - cpu
+            due += interval
+            await asyncio.sleep(max(0.0, due - loop.time()))
+        stats.wall_seconds = loop.time() - start
+
+    async def close(self):
+        """Disconnect every viewer and stop listening."""
+        for viewer in list(self._viewers):
+            viewer.writer.close()
+        # Let each connection handler see its disconnect and finish
+        while self._viewers:
+            await asyncio.sleep(0.01)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def watch(host: str, port: int, decoder: DeltaDecoder) -> int:
+    """
+    Connect as a viewer and decode the stream until the server closes it.
+
+    :param host: Server address.
+    :type host: str
+
+    :param port: Server port.
+    :type port: int
+
+    :param decoder: Decoder to feed.
+    :type decoder: DeltaDecoder
+
+    :return: Bytes received.
+    :rtype: int
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    received = 0
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            received += len(data)
+            decoder.feed(data)
+    finally:
+        writer.close()
+    return received
+
+
+@dataclass
+class LoadReport:
+    """
+    Outcome of a load test.
+
+    :ivar spectators (int): Viewers connected.
+    :ivar stats (BroadcastStats): Server counters.
+    :ivar received (List[int]): Bytes each viewer received.
+    :ivar in_sync (int): Viewers whose last decoded state matched the
+        server's last state.
+    """
+
+    spectators: int
+    stats: BroadcastStats
+    received: List[int]
+    in_sync: int
+
+
+def run_load_test(spectators: int = 200, seconds: float = 5.0) -> LoadReport:
+    """
+    Serve a match on a background thread and connect `spectators` local
+    viewers to it from this one.
+
+    The server's CPU time is measured on its own thread, so the viewers'
+    decoding does not count against it.
+
+    :param spectators: Number of viewers.
+    :type spectators: int
+
+    :param seconds: How long to broadcast once everyone is connected.
+    :type seconds: float
+
+    :return: Server counters and what the viewers received.
+    :rtype: LoadReport
+    """
+    server = SpectatorServer()
+    server_loop = asyncio.new_event_loop()
+    ready = threading.Event()
+    go = threading.Event()
+
+    async def serve():
+        await server.start()
+        ready.set()
+        while not go.is_set() or server.stats.viewers < spectators:
+            await asyncio.sleep(0.01)
+        await server.run(seconds)
+        await server.close()
+
+    thread = threading.Thread(
+        target=server_loop.run_until_complete, args=(serve(),), daemon=True
+    )
+    thread.start()
+    ready.wait()
+
+    decoders = [DeltaDecoder() for _ in range(spectators)]
+
+    async def viewers():
+        tasks = [
+            asyncio.ensure_future(watch("127.0.0.1", server.port, decoder))
+            for decoder in decoders
+        ]
+        go.set()
+        return await asyncio.gather(*tasks)
+
+    received = asyncio.run(viewers())
+    thread.join()
+    server_loop.close()
+    in_sync = sum(d.state == server.last_state for d in decoders)
+    logger.info("Load test: %d/%d viewers in sync", in_sync, spectators)
+    return LoadReport(spectators, server.stats, list(received), in_sync)
+
+
+def _serve(port: int):
+    async def serve():
+        server = SpectatorServer()
+        await server.start("0.0.0.0", port)
+        print(f"Broadcasting on port {server.port}")
+        try:
+            await server.run()
+        finally:
+            await server.close()
+
+    asyncio.run(serve())
+
+
+def _watch(address: str):
+    host, port = address.rsplit(":", 1)
+    decoder = DeltaDecoder()
+
+    async def show():
+        task = asyncio.ensure_future(watch(host, int(port), decoder))
+        while not task.done():
+            await asyncio.sleep(0.5)
+            state = decoder.state
+            if state is not None:
+                print(
+                    f"tick {state.tick:>7}  score {state.left}-{state.right}"
+                    f"  ball ({state.ball_x / 4:.0f}, {state.ball_y / 4:.0f})"
+                )
+        return task.result()
+
+    received = asyncio.run(show())
+    print(f"Stream closed after {received:,} bytes")
+
+
+def _load(spectators: int, seconds: float):
+    report = run_load_test(spectators, seconds)
+    stats = report.stats
+    deltas = max(1, stats.messages - stats.keyframes)
+    print(
+        f"{report.spectators} spectators, {stats.ticks} ticks in "
+        f"{stats.wall_seconds:.1f}s, {stats.late_ticks} late ticks"
+    )
+    print(
+        f"  server CPU {stats.cpu_seconds / stats.ticks * 1000:.3f} ms/tick, "
+        f"{stats.cpu_us_per_viewer_tick:.2f} us per spectator per tick"
+    )
+    print(
+        f"  {stats.bytes_per_viewer_second:,.0f} B/s per spectator, "
+        f"delta avg {(stats.bytes_sent - stats.keyframe_bytes) / deltas:.1f} B, "
+        f"keyframe {stats.keyframe_bytes / max(1, stats.keyframes):.0f} B, "
+        f"{stats.skipped} skipped"
+    )
+    print(f"  {report.in_sync}/{report.spectators} spectators in sync")
+    if report.in_sync != report.spectators:
+        raise SystemExit(1)
+
+
+def main(argv: list[str] | None = None):
+    """Serve a match to spectators, watch one, or load test locally."""
+    parser = argparse.ArgumentParser(prog="python -m deja_bounce.net.spectate")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--serve", type=int, metavar="PORT")
+    mode.add_argument("--watch", metavar="HOST:PORT")
+    mode.add_argument(
+        "--load",
+        type=int,
+        metavar="N",
+        help="serve N local stand-in spectators and report the cost",
+    )
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    if args.serve is not None:
+        _serve(args.serve)
+    elif args.watch is not None:
+        _watch(args.watch)
+    else:
+        _load(args.load, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
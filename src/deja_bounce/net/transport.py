@@ -0,0 +1,223 @@
+"""
+UDP transport for online versus matches.
+
+The asyncio event loop runs on a background thread so the game loop never
+waits on the network: received datagrams are queued for the game thread to
+drain once per tick, and sends are handed to the loop thread. Links can be
+given artificial latency, jitter and packet loss to test netplay over
+localhost.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import functools
+import queue
+import random
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+Address = Tuple[str, int]
+
+
+@dataclass(frozen=True)
+class LinkConditions:
+    """
+    Impairments applied to every datagram a peer sends.
+
+    :ivar latency (float): One-way delay in seconds (RTT is twice this when
+        both peers use the same conditions).
+    :ivar jitter (float): Extra random delay in seconds, up to this much;
+        it can reorder packets.
+    :ivar loss (float): Probability of dropping a datagram.
+    :ivar seed (int | None): Seed for jitter and loss (random if None).
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    loss: float = 0.0
+    seed: int | None = None
+
+    @property
+    def impaired(self) -> bool:
+        """True if any impairment is configured."""
+        return bool(self.latency or self.jitter or self.loss)
+
+
+# Justification: asyncio protocol callbacks plus traffic counters
+# pylint: disable=too-many-instance-attributes
+class UdpPeer(asyncio.DatagramProtocol):
+    """
+    One end of a two-player UDP link.
+
+    A peer created without a remote address (the host) adopts the address
+    of the first datagram it receives.
+
+    :ivar remote (Address | None): Address datagrams are sent to.
+    :ivar sent (int): Datagrams handed to the socket.
+    :ivar dropped (int): Datagrams discarded by the simulated loss.
+    :ivar received (int): Datagrams received from the remote.
+    :ivar bytes_sent (int): Payload bytes handed to the socket.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        remote: Address | None = None,
+        conditions: LinkConditions = LinkConditions(),
+    ):
+        """
+        :param loop: Event loop the transport runs on.
+        :type loop: asyncio.AbstractEventLoop
+
+        :param remote: Address of the other peer, if known.
+        :type remote: Address, optional
+
+        :param conditions: Simulated link impairments.
+        :type conditions: LinkConditions
+        """
+        self.loop = loop
+        self.remote = remote
+        self.conditions = conditions
+        self.sent = 0
+        self.dropped = 0
+        self.received = 0
+        self.bytes_sent = 0
+        self._rng = random.Random(conditions.seed)
+        self._inbox: queue.SimpleQueue[bytes] = queue.SimpleQueue()
+        self._transport: Optional[asyncio.DatagramTransport] = None
+
+    @property
+    def address(self) -> Address:
+        """Local address the peer is bound to."""
+        assert self._transport is not None
+        return self._transport.get_extra_info("sockname")[:2]
+
+    def connection_made(self, transport):
+        self._transport = transport
+
+    def datagram_received(self, data: bytes, addr: Address):
+        if self.remote is None:
+            self.remote = addr
+        elif addr[:2] != self.remote[:2]:
+            return
+        self.received += 1
+        self._inbox.put(data)
+
+    def receive(self) -> List[bytes]:
+        """
+        Drain every datagram received since the last call (game thread).
+
+        :return: Payloads in arrival order.
+        :rtype: List[bytes]
+        """
+        packets = []
+        inbox = self._inbox
+        while not inbox.empty():
+            packets.append(inbox.get_nowait())
+        return packets
+
+    def send(self, data: bytes):
+        """
+        Send a datagram to the remote (any thread). Dropped silently until
+        the remote address is known.
+
+        :param data: Payload.
+        :type data: bytes
+        """
+        self.loop.call_soon_threadsafe(self._send, data)
+
+    def _send(self, data: bytes):
+        if self._transport is None or self.remote is None:
+            return
+        conditions = self.conditions
+        if conditions.impaired:
+            rng = self._rng
+            if rng.random() < conditions.loss:
+                self.dropped += 1
+                return
+            delay = conditions.latency + rng.random() * conditions.jitter
+            self.loop.call_later(delay, self._sendto, data)
+        else:
+            self._sendto(data)
+
+    def _sendto(self, data: bytes):
+        if self._transport is None:
+            return
+        self._transport.sendto(data, self.remote)
+        self.sent += 1
+        self.bytes_sent += len(data)
+
+    def close(self):
+        """Close the socket (any thread)."""
+        self.loop.call_soon_threadsafe(self._close)
+
+    def _close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+class NetLoop:
+    """
+    Background thread running the asyncio loop all peers share.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="deja-bounce-net", daemon=True
+        )
+        self._thread.start()
+
+    def open_peer(
+        self,
+        local: Address = ("127.0.0.1", 0),
+        remote: Address | None = None,
+        conditions: LinkConditions = LinkConditions(),
+    ) -> UdpPeer:
+        """
+        Bind a UDP peer.
+
+        :param local: Address to bind (port 0 picks a free one).
+        :type local: Address
+
+        :param remote: Address of the other peer (None to learn it from the
+            first datagram, as the host does).
+        :type remote: Address, optional
+
+        :param conditions: Simulated link impairments.
+        :type conditions: LinkConditions
+
+        :return: The bound peer.
+        :rtype: UdpPeer
+        """
+        coro = self.loop.create_datagram_endpoint(
+            lambda: UdpPeer(self.loop, remote, conditions), local_addr=local
+        )
+        _, peer = asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+        return peer
+
+    def close(self):
+        """Stop the loop thread."""
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+
+
+@functools.cache
+def get_net_loop() -> NetLoop:
+    """
+    The process-wide NetLoop; stopped when the interpreter exits.
+
+    :return: The shared loop.
+    :rtype: NetLoop
+    """
+    net_loop = NetLoop()
+    atexit.register(net_loop.close)
+    return net_loop
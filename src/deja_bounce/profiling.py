@@ -0,0 +1,304 @@
+"""
+Opt-in frame profiler for Deja Bounce scenes.
+
+Set DEJA_BOUNCE_PROFILE to a .csv or .json path to time every scene
+section and system call; the percentiles are written there on scene exit.
+When the variable is unset no profiler is created and the scenes take
+their plain code path.
+
+:cvar PROFILE_ENV (str): Environment variable holding the dump path.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from array import array
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from mini_arcade_core.scenes import BaseSceneSystem
+
+from deja_bounce.backends.counting import DrawCallCounter
+
+PROFILE_ENV = "DEJA_BOUNCE_PROFILE"
+
+_SUB_BITS = 3  # 8 buckets per power of two, i.e. <= 6.25% error
+_SUB = 1 << _SUB_BITS
+_MAX_BITS = 40  # ~18 minutes in ns; anything slower lands in the last bucket
+
+
+class Histogram:
+    """
+    Fixed-size log-linear histogram of durations in nanoseconds.
+
+    Recording is a few integer operations and never allocates, so it can
+    sit inside the frame loop.
+
+    :ivar count (int): Number of samples.
+    :ivar total (int): Sum of all samples (ns).
+    :ivar max (int): Largest sample (ns).
+    """
+
+    size = (_MAX_BITS - _SUB_BITS + 1) * _SUB
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * self.size))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _index(ns: int) -> int:
+        bits = ns.bit_length()
+        if bits <= _SUB_BITS:
+            return ns
+        sub = (ns >> (bits - _SUB_BITS - 1)) & (_SUB - 1)
+        return min((bits - _SUB_BITS) * _SUB + sub, Histogram.size - 1)
+
+    @staticmethod
+    def _value(index: int) -> float:
+        if index < _SUB:
+            return float(index)
+        bits = index // _SUB + _SUB_BITS
+        width = 1 << (bits - _SUB_BITS - 1)
+        low = (_SUB + index % _SUB) * width
+        return low + width / 2
+
+    def record(self, ns: int):
+        """
+        Add one sample.
+
+        :param ns: Duration in nanoseconds.
+        :type ns: int
+        """
+        self.counts[self._index(ns)] += 1
+        self.count += 1
+        self.total += ns
+        self.max = max(self.max, ns)
+
+    def percentile(self, pct: float) -> float:
+        """
+        Approximate percentile of the recorded samples.
+
+        :param pct: Percentile in [0, 100].
+        :type pct: float
+
+        :return: Duration in nanoseconds (0 if empty).
+        :rtype: float
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, round(self.count * pct / 100.0))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._value(index), float(self.max))
+        return float(self.max)
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in nanoseconds."""
+        return self.total / self.count if self.count else 0.0
+
+
+class FrameStats:
+    """
+    Timings of the most recent frame, for on-screen display.
+
+    :ivar update_ns (int): Time spent in the last update (all ticks).
+    :ivar draw_ns (int): Time spent in the last draw.
+    :ivar frame_ns (int): Time between the last two draws.
+    :ivar draw_calls (int): Draw calls in the last counted draw.
+    :ivar counter (DrawCallCounter): Backend wrapper used for counting.
+    """
+
+    def __init__(self):
+        self.update_ns = 0
+        self.draw_ns = 0
+        self.frame_ns = 0
+        self.draw_calls = 0
+        self.counter = DrawCallCounter()
+        self._draw_start = 0
+
+    def begin_draw(self) -> int:
+        """
+        Mark the start of a draw.
+
+        :return: The start timestamp (perf_counter_ns).
+        :rtype: int
+        """
+        now = perf_counter_ns()
+        if self._draw_start:
+            self.frame_ns = now - self._draw_start
+        self._draw_start = now
+        return now
+
+    def end_draw(self, counted: bool):
+        """
+        Mark the end of the draw started by begin_draw.
+
+        :param counted: Whether the frame was drawn through `counter`.
+        :type counted: bool
+        """
+        self.draw_ns = perf_counter_ns() - self._draw_start
+        if counted:
+            self.draw_calls = self.counter.calls
+
+
+class FrameProfiler:
+    """
+    Named histograms for scene sections and individual systems.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        :param path: Where dump() writes by default (.csv or .json).
+        :type path: Path, optional
+        """
+        self.path = path
+        self.histograms: Dict[str, Histogram] = {}
+        self._system_keys: Dict[tuple, str] = {}
+        self._last_frame = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["FrameProfiler"]:
+        """
+        Build a profiler if PROFILE_ENV is set.
+
+        :return: A profiler dumping to the configured path, or None.
+        :rtype: Optional[FrameProfiler]
+        """
+        path = os.environ.get(PROFILE_ENV)
+        return cls(Path(path)) if path else None
+
+    def histogram(self, name: str) -> Histogram:
+        """
+        Histogram for `name`, created on first use.
+
+        :param name: Section name.
+        :type name: str
+
+        :return: The histogram.
+        :rtype: Histogram
+        """
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms[name] = Histogram()
+        return hist
+
+    def call(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Call `fn(*args)` and record how long it took under `name`.
+
+        :param name: Section name.
+        :type name: str
+
+        :param fn: Callable to time.
+        :type fn: Callable[..., Any]
+
+        :return: Whatever `fn` returned.
+        :rtype: Any
+        """
+        start = perf_counter_ns()
+        result = fn(*args)
+        self.histogram(name).record(perf_counter_ns() - start)
+        return result
+
+    def run_systems(
+        self, systems: Iterable[BaseSceneSystem], phase: str, arg: Any
+    ):
+        """
+        Run `phase` ("update" or "draw") on every enabled system, timing
+        each one under "<Class> (<priority>) <phase>".
+
+        :param systems: Systems in run order.
+        :type systems: Iterable[BaseSceneSystem]
+
+        :param phase: Method name to call.
+        :type phase: str
+
+        :param arg: dt or surface, passed to the method.
+        :type arg: Any
+        """
+        for system in systems:
+            if not getattr(system, "enabled", True):
+                continue
+            key = (type(system), phase)
+            name = self._system_keys.get(key)
+            if name is None:
+                priority = getattr(system, "priority", 0)
+                name = f"{type(system).__name__} ({priority}) {phase}"
+                self._system_keys[key] = name
+            start = perf_counter_ns()
+            getattr(system, phase)(arg)
+            self.histogram(name).record(perf_counter_ns() - start)
+
+    def frame(self):
+        """
+        Mark the end of a rendered frame, recording the frame-to-frame time.
+        """
+        now = perf_counter_ns()
+        if self._last_frame:
+            self.histogram("frame").record(now - self._last_frame)
+        self._last_frame = now
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Per-section statistics in microseconds, slowest p99 first.
+
+        :return: Rows with name, count, mean, p50, p95, p99 and max.
+        :rtype: List[Dict[str, Any]]
+        """
+        rows = [
+            {
+                "name": name,
+                "count": hist.count,
+                "mean_us": round(hist.mean / 1000, 2),
+                "p50_us": round(hist.percentile(50) / 1000, 2),
+                "p95_us": round(hist.percentile(95) / 1000, 2),
+                "p99_us": round(hist.percentile(99) / 1000, 2),
+                "max_us": round(hist.max / 1000, 2),
+            }
+            for name, hist in self.histograms.items()
+        ]
+        rows.sort(key=lambda row: row["p99_us"], reverse=True)
+        return rows
+
+    def dump(self, path: Optional[Path] = None) -> Optional[Path]:
+        """
+        Write report() as JSON (for .json paths) or CSV.
+
+        :param path: Destination (defaults to the configured path).
+        :type path: Path, optional
+
+        :return: The file written, or None if there was no path.
+        :rtype: Optional[Path]
+        """
+        path = Path(path) if path is not None else self.path
+        if path is None:
+            return None
+        rows = self.report()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".json":
+            path.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+            return path
+        with path.open("w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(
+                fh,
+                fieldnames=[
+                    "name",
+                    "count",
+                    "mean_us",
+                    "p50_us",
+                    "p95_us",
+                    "p99_us",
+                    "max_us",
+                ],
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+        return path
@@ -0,0 +1,16 @@
+"""
+Deterministic match recording and playback.
+"""
+
+from __future__ import annotations
+
+from .log import InputEdge, ReplayLog, new_seed
+from .session import ReplayPlayer, ReplayRecorder
+
+__all__ = [
+    "InputEdge",
+    "ReplayLog",
+    "ReplayPlayer",
+    "ReplayRecorder",
+    "new_seed",
+]
@@ -0,0 +1,104 @@
+"""
+Command line entry point for replay logs.
+
+Usage:
+    python -m deja_bounce.replay replays/20260101-120000-0badf00d.djr
+    python -m deja_bounce.replay --verify replays/*.djr
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from mini_arcade_core import Game
+
+from deja_bounce.replay.log import ReplayLog
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.simulation.headless import make_headless_game
+
+
+def resimulate(log: ReplayLog) -> tuple[int, int]:
+    """
+    Play a log back without a window, as fast as possible.
+
+    :param log: Log to play back.
+    :type log: ReplayLog
+
+    :return: Final (left, right) score.
+    :rtype: tuple[int, int]
+    """
+    game = make_headless_game(fps=log.fps)
+    scene = PongScene(game, replay=log)
+    scene.on_enter()
+    while scene.tick < log.ticks:
+        scene.update(scene.max_frame_time)
+    return scene.model.score.left, scene.model.score.right
+
+
+def _watch(log: ReplayLog, turbo: int):
+    # The native backend is only needed to watch, so import it lazily
+    # pylint: disable=import-outside-toplevel
+    from mini_arcade_core import GameConfig
+    from mini_arcade_native_backend import NativeBackend
+
+    from deja_bounce.assets import get_asset_manager
+    from deja_bounce.constants import DEFAULT_FONT, WINDOW_SIZE
+    from deja_bounce.scenes.registry import LazySceneRegistry
+
+    # pylint: enable=import-outside-toplevel
+
+    font_path = get_asset_manager().path(DEFAULT_FONT)
+    width, height = WINDOW_SIZE
+    game = Game(
+        GameConfig(
+            width=width,
+            height=height,
+            title="DejaBounce replay",
+            fps=log.fps,
+            backend=NativeBackend(font_path=str(font_path), font_size=24),
+        ),
+        registry=LazySceneRegistry().discover("deja_bounce.scenes"),
+    )
+    scene = PongScene(game, replay=log)
+    scene.model.turbo = turbo
+    game.run(scene)
+
+
+def main(argv: list[str] | None = None):
+    """Watch a replay, or check that logs still reproduce their score."""
+    parser = argparse.ArgumentParser(prog="python -m deja_bounce.replay")
+    parser.add_argument("logs", nargs="+")
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="re-simulate headlessly and compare final scores",
+    )
+    parser.add_argument(
+        "--turbo",
+        type=int,
+        default=1,
+        help="ticks per frame when watching (0 = uncapped)",
+    )
+    args = parser.parse_args(argv)
+
+    if not args.verify:
+        _watch(ReplayLog.load(args.logs[0]), args.turbo)
+        return
+
+    mismatches = 0
+    for path in args.logs:
+        log = ReplayLog.load(path)
+        score = resimulate(log)
+        ok = score == tuple(log.score)
+        mismatches += not ok
+        print(
+            f"{path}: {log.ticks} ticks, {len(log.edges)} edges, "
+            f"score {score[0]}-{score[1]} "
+            f"{'ok' if ok else f'!= recorded {log.score[0]}-{log.score[1]}'}"
+        )
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
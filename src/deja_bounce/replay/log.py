@@ -0,0 +1,287 @@
+"""
+Compact binary replay log for Deja Bounce matches.
+
+A match is fully determined by its RNG seed, the CPU difficulty, the tick
+rate and the input edges fed into the fixed-timestep simulation, so that
+is all a log stores. Layout (little endian)::
+
+    header   "DJBR" | version u8 | seed u32 | fps u16 | ticks u32
+             | score left u16 | score right u16 | difficulty len u8
+    name     difficulty (utf-8)
+    body     zlib( varint tick delta | code u8 ) * edges
+
+An edge is recorded against the number of ticks simulated before it, so
+playback applies it right before that tick runs.
+"""
+
+from __future__ import annotations
+
+import random
+import struct
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, NamedTuple, Tuple
+
+from deja_bounce.constants import MULTIBALL_LEVELS
+from deja_bounce.controllers.cpu import Side
+
+MAGIC = b"DJBR"
+# 2: live matches use swept collisions, so version 1 logs no longer replay
+VERSION = 2
+
+_HEADER = struct.Struct("<4sBIHIHHB")
+
+# Paddle edge codes: bit 0 = right paddle, bit 1 = "down", bit 2 = pressed
+_RIGHT = 0b001
+_DOWN = 0b010
+_PRESSED = 0b100
+
+# Toggle edge codes flip a PongModel flag that changes the simulation
+TOGGLES: Tuple[str, ...] = (
+    "god_mode_p1",
+    "god_mode_p2",
+    "slow_mo",
+    "cpu_vs_cpu",
+)
+_TOGGLE_BASE = 8
+
+# Multiball edge codes set PongModel.multiball to a MULTIBALL_LEVELS entry
+_MULTIBALL_BASE = 32
+
+
+def new_seed() -> int:
+    """
+    Draw a fresh 32-bit seed from the OS entropy pool.
+
+    :return: A seed suitable for random.Random.
+    :rtype: int
+    """
+    return random.SystemRandom().randrange(2**32)
+
+
+def paddle_code(side: Side, direction: str, pressed: bool) -> int:
+    """
+    Encode a paddle input edge.
+
+    :param side: Which paddle the edge belongs to.
+    :type side: Side
+
+    :param direction: "up" or "down".
+    :type direction: str
+
+    :param pressed: True for a MovePaddleCommand, False for a stop.
+    :type pressed: bool
+
+    :return: Edge code.
+    :rtype: int
+    """
+    code = _RIGHT if side == "RIGHT" else 0
+    if direction == "down":
+        code |= _DOWN
+    if pressed:
+        code |= _PRESSED
+    return code
+
+
+def toggle_code(name: str) -> int:
+    """
+    Encode a flip of one of the TOGGLES model flags.
+
+    :param name: PongModel attribute name.
+    :type name: str
+
+    :return: Edge code.
+    :rtype: int
+    """
+    return _TOGGLE_BASE + TOGGLES.index(name)
+
+
+def multiball_code(balls: int) -> int:
+    """
+    Encode a change of the multiball ball count.
+
+    :param balls: New PongModel.multiball value, one of MULTIBALL_LEVELS.
+    :type balls: int
+
+    :return: Edge code.
+    :rtype: int
+
+    :raises ValueError: If `balls` is not one of MULTIBALL_LEVELS.
+    """
+    return _MULTIBALL_BASE + MULTIBALL_LEVELS.index(balls)
+
+
+class InputEdge(NamedTuple):
+    """
+    One recorded input change.
+
+    :ivar tick (int): Ticks simulated before the edge took effect.
+    :ivar code (int): Encoded edge (see paddle_code, toggle_code and
+        multiball_code).
+    """
+
+    tick: int
+    code: int
+
+    @property
+    def toggle(self) -> str | None:
+        """Model flag this edge flips, or None for other edges."""
+        if _TOGGLE_BASE <= self.code < _TOGGLE_BASE + len(TOGGLES):
+            return TOGGLES[self.code - _TOGGLE_BASE]
+        return None
+
+    @property
+    def multiball(self) -> int | None:
+        """Ball count this edge sets, or None for other edges."""
+        if self.code >= _MULTIBALL_BASE:
+            return MULTIBALL_LEVELS[self.code - _MULTIBALL_BASE]
+        return None
+
+    @property
+    def side(self) -> Side:
+        """Paddle the edge belongs to."""
+        return "RIGHT" if self.code & _RIGHT else "LEFT"
+
+    @property
+    def direction(self) -> str:
+        """Direction of the edge, "up" or "down"."""
+        return "down" if self.code & _DOWN else "up"
+
+    @property
+    def pressed(self) -> bool:
+        """True if the edge starts moving the paddle."""
+        return bool(self.code & _PRESSED)
+
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _decode_edges(body: bytes) -> List[InputEdge]:
+    edges = []
+    tick = 0
+    pos = 0
+    while pos < len(body):
+        delta, pos = _read_varint(body, pos)
+        tick += delta
+        edges.append(InputEdge(tick, body[pos]))
+        pos += 1
+    return edges
+
+
+@dataclass
+class ReplayLog:
+    """
+    Everything needed to replay one match.
+
+    :ivar seed (int): Seed of the match RNG (32-bit).
+    :ivar difficulty (str): Difficulty preset name the CPUs used.
+    :ivar fps (int): Simulation ticks per second.
+    :ivar edges (List[InputEdge]): Input edges in tick order.
+    :ivar ticks (int): Ticks simulated when the log was closed.
+    :ivar score (Tuple[int, int]): Score when the log was closed.
+    """
+
+    seed: int
+    difficulty: str
+    fps: int
+    edges: List[InputEdge] = field(default_factory=list)
+    ticks: int = 0
+    score: Tuple[int, int] = (0, 0)
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the log.
+
+        :return: The encoded log.
+        :rtype: bytes
+        """
+        name = self.difficulty.encode("utf-8")
+        body = bytearray()
+        last = 0
+        for edge in self.edges:
+            _write_varint(body, edge.tick - last)
+            body.append(edge.code)
+            last = edge.tick
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.seed,
+            self.fps,
+            self.ticks,
+            self.score[0],
+            self.score[1],
+            len(name),
+        )
+        return header + name + zlib.compress(bytes(body), 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ReplayLog":
+        """
+        Parse a log produced by to_bytes.
+
+        :param data: Encoded log.
+        :type data: bytes
+
+        :return: The decoded log.
+        :rtype: ReplayLog
+
+        :raises ValueError: If the data is not a supported replay log.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Replay log is truncated")
+        magic, version, seed, fps, ticks, left, right, name_len = (
+            _HEADER.unpack_from(data)
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a Deja Bounce replay log")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}")
+
+        pos = _HEADER.size
+        difficulty = data[pos : pos + name_len].decode("utf-8")
+        edges = _decode_edges(zlib.decompress(data[pos + name_len :]))
+        return cls(seed, difficulty, fps, edges, ticks, (left, right))
+
+    def save(self, path: Path | str) -> Path:
+        """
+        Write the log to `path`, creating parent directories.
+
+        :param path: Destination file.
+        :type path: Path | str
+
+        :return: The path written.
+        :rtype: Path
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+        return path
+
+    @classmethod
+    def load(cls, path: Path | str) -> "ReplayLog":
+        """
+        Read a log written by save.
+
+        :param path: Log file.
+        :type path: Path | str
+
+        :return: The decoded log.
+        :rtype: ReplayLog
+        """
+        return cls.from_bytes(Path(path).read_bytes())
@@ -0,0 +1,178 @@
+"""
+Recording and playback of replay logs inside PongScene.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from deja_bounce.entities.paddle import Paddle
+from deja_bounce.utils import logger
+
+from .log import (
+    TOGGLES,
+    InputEdge,
+    ReplayLog,
+    multiball_code,
+    paddle_code,
+    toggle_code,
+)
+
+if TYPE_CHECKING:
+    from deja_bounce.scenes.pong import PongScene
+
+
+class ReplayRecorder:
+    """
+    Collects the input edges of a live match into a ReplayLog.
+
+    Paddle edges are reported by MovePaddleCommand/StopPaddleCommand; the
+    simulation-affecting model toggles (cheats) and the multiball ball
+    count are sampled once per tick.
+    """
+
+    def __init__(self, scene: PongScene, directory: Optional[Path] = None):
+        """
+        :param scene: Scene being recorded.
+        :type scene: PongScene
+
+        :param directory: Where finish() saves the log (None to keep it in
+            memory only).
+        :type directory: Path, optional
+        """
+        self.scene = scene
+        self.directory = directory
+        self.log = ReplayLog(
+            seed=scene.seed,
+            difficulty=scene.game.settings.difficulty,
+            fps=scene.fps,
+        )
+        self.path: Optional[Path] = None
+        self._closed = False
+        self._toggles = [getattr(scene.model, name) for name in TOGGLES]
+        self._multiball = scene.model.multiball
+
+    @property
+    def finished(self) -> bool:
+        """True once finish() has closed the log."""
+        return self._closed
+
+    def edge(self, paddle: Paddle, direction: str, pressed: bool):
+        """
+        Record a paddle input edge at the current tick.
+
+        :param paddle: Paddle the command targeted.
+        :type paddle: Paddle
+
+        :param direction: "up" or "down".
+        :type direction: str
+
+        :param pressed: True when the paddle starts moving.
+        :type pressed: bool
+        """
+        if self.finished:
+            return
+        side = "RIGHT" if paddle is self.scene.right_paddle else "LEFT"
+        self.log.edges.append(
+            InputEdge(self.scene.tick, paddle_code(side, direction, pressed))
+        )
+
+    def sample(self):
+        """
+        Record any model toggle that changed since the previous tick.
+        """
+        model = self.scene.model
+        if model.multiball != self._multiball:
+            self._multiball = model.multiball
+            if not self.finished:
+                self.log.edges.append(
+                    InputEdge(self.scene.tick, multiball_code(model.multiball))
+                )
+        for i, name in enumerate(TOGGLES):
+            value = getattr(model, name)
+            if value != self._toggles[i]:
+                self._toggles[i] = value
+                if not self.finished:
+                    self.log.edges.append(
+                        InputEdge(self.scene.tick, toggle_code(name))
+                    )
+
+    def finish(self) -> Optional[Path]:
+        """
+        Close the log and save it (once) if a directory was given.
+
+        :return: The file written, if any (None if saving failed).
+        :rtype: Optional[Path]
+        """
+        if self.finished:
+            return self.path
+        score = self.scene.model.score
+        self.log.ticks = self.scene.tick
+        self.log.score = (score.left, score.right)
+        self._closed = True
+        if self.directory is None:
+            return None
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = self.directory / f"{stamp}-{self.log.seed:08x}.djr"
+        try:
+            self.path = self.log.save(path)
+            size = self.path.stat().st_size
+        except OSError as e:
+            # A read-only install or a full disk must not end the match
+            logger.warning("Could not save replay %s: %s", path, e)
+            return None
+        logger.info("Saved replay %s (%d bytes)", self.path.name, size)
+        return self.path
+
+
+class ReplayPlayer:
+    """
+    Feeds a ReplayLog's edges back into PongScene, tick by tick.
+    """
+
+    def __init__(self, scene: PongScene, log: ReplayLog):
+        """
+        :param scene: Scene to drive.
+        :type scene: PongScene
+
+        :param log: Log to replay.
+        :type log: ReplayLog
+        """
+        self.scene = scene
+        self.log = log
+        self._next = 0
+
+    @property
+    def finished(self) -> bool:
+        """True once every recorded tick has been simulated."""
+        return self.scene.tick >= self.log.ticks
+
+    def apply(self):
+        """
+        Apply every edge due before the scene's next tick.
+        """
+        edges = self.log.edges
+        tick = self.scene.tick
+        while self._next < len(edges) and edges[self._next].tick <= tick:
+            edge = edges[self._next]
+            self._next += 1
+            balls = edge.multiball
+            if balls is not None:
+                self.scene.model.multiball = balls
+                continue
+            toggle = edge.toggle
+            if toggle is not None:
+                model = self.scene.model
+                setattr(model, toggle, not getattr(model, toggle))
+                continue
+            paddle = (
+                self.scene.right_paddle
+                if edge.side == "RIGHT"
+                else self.scene.left_paddle
+            )
+            if edge.direction == "up":
+                paddle.moving_up = edge.pressed
+            else:
+                paddle.moving_down = edge.pressed
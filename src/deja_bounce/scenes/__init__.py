@@ -1,21 +1,45 @@
 """
 Scene modules for Deja Bounce.
+
+Scene modules are imported on first use (see LazySceneRegistry), so the
+menu can appear before the Pong scene and its systems are loaded.
+
+:cvar SCENES (Dict[str, Tuple[str, str]]): Scene ids mapped to the module
+    and class implementing them.
 """
 
-# TODO: Refactor cyclic imports later. (MenuScene <-> PongScene)
-# Justification: These imports are necessary for scene management
-# and may cause cyclic imports. They will be refactored later.
-# pylint: disable=cyclic-import
 from __future__ import annotations
 
-from .menu import MenuScene
-from .pause import PauseScene
-from .pong import PongScene
+import importlib
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from .registry import LazySceneRegistry
+
+if TYPE_CHECKING:
+    from .menu import MenuScene
+    from .pause import PauseScene
+    from .pong import PongScene
+
+SCENES: Dict[str, Tuple[str, str]] = {
+    "menu": ("deja_bounce.scenes.menu", "MenuScene"),
+    "pause": ("deja_bounce.scenes.pause", "PauseScene"),
+    "pong": ("deja_bounce.scenes.pong", "PongScene"),
+}
+
+_LAZY_EXPORTS = {attr: module for module, attr in SCENES.values()}
+
+
+def __getattr__(name: str):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
+
 
 __all__ = [
+    "LazySceneRegistry",
+    "SCENES",
     "PongScene",
     "MenuScene",
     "PauseScene",
 ]
-
-# pylint: enable=cyclic-import
@@ -15,12 +15,14 @@ from mini_arcade_core import (
 from mini_arcade_core.game import Game
 from mini_arcade_core.managers import BaseCheatCommand
 
-from deja_bounce.constants import ROOT
+from deja_bounce.capture import get_capture_writer
+from deja_bounce.constants import MULTIBALL_LEVELS
 from deja_bounce.difficulty import DIFFICULTY_PRESETS
 from deja_bounce.entities.paddle import Paddle
 from deja_bounce.scenes.models import PongModel
 
 if TYPE_CHECKING:
+    from deja_bounce.replay import ReplayRecorder
     from deja_bounce.scenes.pong import PongScene
 
 
@@ -69,6 +71,72 @@ class PhotoModeCommand(BaseSceneCommand):
         context.photo_mode = not context.photo_mode
 
 
+class TogglePerfHudCommand(BaseSceneCommand):
+    """
+    Command to toggle the performance HUD.
+    """
+
+    def execute(self, context: PongModel) -> None:
+        context.perf_hud = not context.perf_hud
+
+
+class ToggleRecordingCommand(BaseSceneCommand):
+    """
+    Command to start or stop capturing frames to an image sequence.
+    """
+
+    def execute(self, context: PongModel) -> None:
+        context.recording = not context.recording
+
+
+class CycleTurboCommand(BaseSceneCommand):
+    """
+    Command to cycle fast-forward speed: 1x, 2x, 8x, uncapped (0).
+    """
+
+    levels = [1, 2, 8, 0]
+
+    def execute(self, context: PongModel) -> None:
+        current = context.turbo
+        idx = self.levels.index(current) if current in self.levels else 0
+        context.turbo = self.levels[(idx + 1) % len(self.levels)]
+        context.turbo_rate = float(context.turbo or 1)
+
+
+class CycleMultiballCommand(BaseSceneCommand):
+    """
+    Command to cycle the number of balls in play through MULTIBALL_LEVELS.
+    """
+
+    levels = list(MULTIBALL_LEVELS)
+
+    def execute(self, context: PongModel) -> None:
+        current = context.multiball
+        idx = self.levels.index(current) if current in self.levels else 0
+        context.multiball = self.levels[(idx + 1) % len(self.levels)]
+
+
+class StartRewindCommand(BaseSceneCommand):
+    """
+    Command to start scrubbing time backwards (not while multiball is on,
+    as the extra balls are not in the rewind history).
+    """
+
+    def execute(self, context: PongModel) -> None:
+        if context.multiball > 1:
+            return
+        context.rewinding = True
+
+
+class StopRewindCommand(BaseSceneCommand):
+    """
+    Command to stop scrubbing time backwards.
+    """
+
+    def execute(self, context: PongModel) -> None:
+        context.rewinding = False
+
+
 class PauseGameCommand(BaseGameCommand):
     """
     Command to pause the game.
@@ -83,15 +151,33 @@ class MovePaddleCommand(BaseCommand):
     Command to move a paddle up or down.
     """
 
-    def __init__(self, paddle: Paddle, direction: str):
+    def __init__(
+        self,
+        paddle: Paddle,
+        direction: str,
+        recorder: ReplayRecorder | None = None,
+    ):
+        """
+        :param paddle: Paddle to control.
+        :type paddle: Paddle
+
+        :param direction: "up" or "down".
+        :type direction: str
+
+        :param recorder: Replay recorder to report the input edge to.
+        :type recorder: ReplayRecorder, optional
+        """
         self.paddle = paddle
         self.direction = direction  # "up" or "down"
+        self.recorder = recorder
 
     def execute(self, _context) -> None:
         if self.direction == "up":
             self.paddle.moving_up = True
         if self.direction == "down":
             self.paddle.moving_down = True
+        if self.recorder is not None:
+            self.recorder.edge(self.paddle, self.direction, True)
 
 
 class StopPaddleCommand(BaseCommand):
@@ -99,15 +185,33 @@ class StopPaddleCommand(BaseCommand):
     Command to stop a paddle's movement.
     """
 
-    def __init__(self, paddle: Paddle, direction: str):
+    def __init__(
+        self,
+        paddle: Paddle,
+        direction: str,
+        recorder: ReplayRecorder | None = None,
+    ):
+        """
+        :param paddle: Paddle to control.
+        :type paddle: Paddle
+
+        :param direction: "up" or "down".
+        :type direction: str
+
+        :param recorder: Replay recorder to report the input edge to.
+        :type recorder: ReplayRecorder, optional
+        """
         self.paddle = paddle
         self.direction = direction  # "up" or "down"
+        self.recorder = recorder
 
     def execute(self, _context) -> None:
         if self.direction == "up":
             self.paddle.moving_up = False
         if self.direction == "down":
             self.paddle.moving_down = False
+        if self.recorder is not None:
+            self.recorder.edge(self.paddle, self.direction, False)
 
 
 class ScoreCommandExecutor:
@@ -238,7 +342,10 @@ class SetWinnerP2Command(BaseSceneCommand):
 class TakeScreenshotCommand(BaseGameCommand):
     """
     Command to take a screenshot of the game.
+
+    The frame is copied out on the game thread; PNG encoding and the disk
+    write happen on the capture writer's thread.
     """
 
     def execute(self, context: Game) -> None:
-        context.screenshot("screenshot.bmp", str(ROOT / "screenshots"))
+        get_capture_writer().capture(context.backend)
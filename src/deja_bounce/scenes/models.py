@@ -4,12 +4,13 @@ Data models for the Pong scene.
 
 from __future__ import annotations
 
-from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal, Optional
 
 from mini_arcade_core.scenes import SceneModel
 
+from deja_bounce.scenes.trail import TrailBuffer
+
 Player = Literal["P1", "P2"]
 
 
@@ -45,8 +46,16 @@ class PongModel(SceneModel):
     :ivar slow_mo (bool): Whether slow motion is enabled.
     :ivar cpu_vs_cpu (bool): Whether CPU vs CPU mode is enabled.
     :ivar trail_mode (bool): Whether trail mode is enabled.
-    :ivar trail (deque): Trail of previous ball positions.
+    :ivar trail (TrailBuffer): Trail of previous ball positions.
     :ivar photo_mode (bool): Whether photo mode is enabled.
+    :ivar turbo (int): Simulation substeps per rendered frame (0 = uncapped).
+    :ivar turbo_rate (float): Simulated seconds per real second, measured
+        while turbo is active.
+    :ivar rewinding (bool): Whether time is being scrubbed backwards.
+    :ivar perf_hud (bool): Whether the performance HUD is shown.
+    :ivar recording (bool): Whether frames are captured to an image sequence.
+    :ivar multiball (int): Balls in play; above 1 the extra balls live in a
+        MultiBallSystem's BallSet.
     """
 
     # walls
@@ -67,8 +76,18 @@ class PongModel(SceneModel):
     slow_mo: bool = False
     cpu_vs_cpu: bool = False
     trail_mode: bool = False
-    trail: deque = deque(maxlen=15)
+    trail: TrailBuffer = field(default_factory=TrailBuffer)
     photo_mode: bool = False
 
+    # fast-forward
+    turbo: int = 1
+    turbo_rate: float = 1.0
+    rewinding: bool = False
+    perf_hud: bool = False
+    recording: bool = False
+
+    # chaos
+    multiball: int = 1
+
 
 # pylint: enable=too-many-instance-attributes
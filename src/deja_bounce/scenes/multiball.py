@@ -0,0 +1,278 @@
+"""
+Structure-of-arrays storage for the extra balls of multiball mode.
+
+Every ball field is one NumPy array with a slot per ball, and the rules of
+BallWallBounceSystem, BallPaddleCollisionSystem, BallOutSystem,
+ResetRallySystem and TrailModeSystem are applied to the whole set with
+the vectorized kernels in deja_bounce.kernels, so thousands of balls cost
+a handful of array passes per tick instead of thousands of entity
+updates.
+
+Requires NumPy (``pip install deja-bounce[sim]``).
+"""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+from mini_arcade_core.backend import Backend
+
+from deja_bounce.backends.rects import draw_rects
+from deja_bounce.entities.paddle import Paddle
+from deja_bounce.kernels import (
+    PaddleBox,
+    Scratch,
+    bounce_walls,
+    collide_paddle,
+    serve_balls,
+    take_out,
+)
+from deja_bounce.scenes.trail import TrailRing
+
+
+# Justification: One array per ball field is the point of the layout.
+# pylint: disable=too-many-instance-attributes
+class BallSet:
+    """
+    Fixed-capacity set of equally sized balls.
+
+    Balls [0, count) are live; resizing only moves `count`, so the arrays
+    are allocated once.
+
+    :ivar capacity (int): Maximum number of balls.
+    :ivar count (int): Number of live balls.
+    :ivar size (int): Side of every ball.
+    :ivar x (np.ndarray): Left edges.
+    :ivar y (np.ndarray): Top edges.
+    :ivar vx (np.ndarray): Horizontal velocities.
+    :ivar vy (np.ndarray): Vertical velocities.
+    :ivar trail (TrailRing): Slots and colors of the trail rows.
+    """
+
+    # Justification: Spawn geometry and serve speed are all independent.
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        capacity: int,
+        size: int,
+        center: Tuple[float, float],
+        serve: Tuple[float, float],
+        seed: int,
+        trail_length: int = 15,
+    ):
+        """
+        :param capacity: Maximum number of balls.
+        :type capacity: int
+
+        :param size: Side of every ball.
+        :type size: int
+
+        :param center: Where balls are served from (center of the ball).
+        :type center: Tuple[float, float]
+
+        :param serve: (vx, vy) serve speed.
+        :type serve: Tuple[float, float]
+
+        :param seed: Seed for serve directions.
+        :type seed: int
+
+        :param trail_length: Positions kept per ball for trail mode.
+        :type trail_length: int
+        """
+        self.capacity = capacity
+        self.count = 0
+        self.size = size
+        self.spawn_x = center[0] - size / 2
+        self.spawn_y = center[1] - size / 2
+        self.serve_vx, self.serve_vy = serve
+        self.rng = np.random.default_rng(seed)
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self._scratch = Scratch(capacity)
+
+        # One row of positions per TrailRing slot
+        self.trail = TrailRing(trail_length)
+        self._trail_x = np.zeros((self.trail.capacity, capacity), np.int32)
+        self._trail_y = np.zeros((self.trail.capacity, capacity), np.int32)
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def __len__(self) -> int:
+        return self.count
+
+    def resize(self, count: int):
+        """
+        Change the number of live balls; new ones are served from the
+        center in random directions.
+
+        :param count: New number of balls (clamped to capacity).
+        :type count: int
+        """
+        count = max(0, min(count, self.capacity))
+        if count > self.count:
+            self.serve(np.arange(self.count, count))
+        self.count = count
+        self.trail.clear()
+
+    def serve(self, index: np.ndarray, direction: np.ndarray | None = None):
+        """
+        Put balls back at the center with a fresh serve velocity.
+
+        :param index: Slots to serve.
+        :type index: np.ndarray
+
+        :param direction: -1/+1 horizontal direction per slot (random if
+            omitted).
+        :type direction: np.ndarray, optional
+        """
+        n = len(index)
+        if direction is None:
+            direction = self.rng.choice((-1.0, 1.0), n)
+        serve_balls(
+            index,
+            (self.x, self.y, self.vx, self.vy),
+            (self.spawn_x, self.spawn_y),
+            (
+                self.serve_vx * direction * self.rng.uniform(0.8, 1.2, n),
+                self.serve_vy * self.rng.uniform(-1.0, 1.0, n),
+            ),
+        )
+
+    def advance(self, dt: float):
+        """
+        Integrate positions.
+
+        :param dt: Scaled step in seconds.
+        :type dt: float
+        """
+        n = self.count
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+
+    def bounce_walls(
+        self, top: float, bottom: float, left: float, right: float
+    ):
+        """
+        Reflect balls off the top/bottom bounds and, where walls are up,
+        off `left`/`right` (pass -inf/+inf for open sides).
+        """
+        n = self.count
+        x, vx = self.x[:n], self.vx[:n]
+        size = self.size
+        bounce_walls(self._live(), size, top, bottom, self._scratch.head(n))
+        hit = x < left
+        x[hit] = left
+        vx[hit] = np.abs(vx[hit])
+        hit = x + size > right
+        x[hit] = right - size
+        vx[hit] = -np.abs(vx[hit])
+
+    def collide_paddle(self, paddle: Paddle, rules: type) -> int:
+        """
+        Bounce every ball overlapping `paddle` off its face, steering it by
+        hit offset and paddle velocity like BallPaddleCollisionSystem.
+
+        :param paddle: The paddle.
+        :type paddle: Paddle
+
+        :param rules: Holder of the tuning constants, e.g.
+            BallPaddleCollisionSystem.
+        :type rules: type
+
+        :return: Number of balls that hit the paddle.
+        :rtype: int
+        """
+        box = PaddleBox(
+            paddle.position.x,
+            paddle.position.y,
+            paddle.size.width,
+            paddle.size.height,
+            paddle.vy,
+            paddle.position.x < self.spawn_x,
+        )
+        hit = collide_paddle(
+            self._live(),
+            self.size,
+            box,
+            rules,
+            self._scratch.head(self.count),
+        )
+        return 0 if hit is None else int(np.count_nonzero(hit))
+
+    def take_out(self, left: float, right: float) -> Tuple[int, int]:
+        """
+        Serve again every ball that left the field, towards the side that
+        missed it (as ResetRallySystem does).
+
+        :param left: Balls with x below this are out on the left.
+        :type left: float
+
+        :param right: Balls with x above this are out on the right.
+        :type right: float
+
+        :return: (balls out on the left, balls out on the right).
+        :rtype: Tuple[int, int]
+        """
+        n = self.count
+        out_left, out_right = (
+            np.flatnonzero(out)
+            for out in take_out(self.x[:n], left, right, self._scratch.head(n))
+        )
+        if len(out_left):
+            self.serve(out_left, np.full(len(out_left), -1.0))
+        if len(out_right):
+            self.serve(out_right, np.full(len(out_right), 1.0))
+        return len(out_left), len(out_right)
+
+    def _live(self) -> Tuple[np.ndarray, ...]:
+        """(x, y, vx, vy) views of the live balls."""
+        n = self.count
+        return self.x[:n], self.y[:n], self.vx[:n], self.vy[:n]
+
+    def record_trail(self):
+        """Append the current positions to the trail ring."""
+        n = self.count
+        row = self.trail.push()
+        self._trail_x[row, :n] = self.x[:n]
+        self._trail_y[row, :n] = self.y[:n]
+
+    def draw(self, surface: Backend):
+        """
+        Draw every live ball.
+
+        :param surface: Backend to draw on.
+        :type surface: Backend
+        """
+        n = self.count
+        draw_rects(
+            surface,
+            self.x[:n].astype(np.int32),
+            self.y[:n].astype(np.int32),
+            self.size,
+            (255, 255, 255),
+        )
+
+    def draw_trail(self, surface: Backend):
+        """
+        Draw the trail of every ball, oldest positions first, one
+        draw_rects batch per trail row.
+
+        :param surface: Backend to draw on.
+        :type surface: Backend
+        """
+        n = self.count
+        size = self.size
+        for row, color in self.trail.slots():
+            draw_rects(
+                surface,
+                self._trail_x[row, :n],
+                self._trail_y[row, :n],
+                size,
+                color,
+            )
+
+
+# pylint: enable=too-many-instance-attributes
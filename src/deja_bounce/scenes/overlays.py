@@ -4,15 +4,17 @@ Overlay scenes for Deja Bounce.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import time
+from array import array
+from typing import TYPE_CHECKING, Hashable
 
 from mini_arcade_core.backend import Backend
 from mini_arcade_core.spaces.d2 import Size2D
 from mini_arcade_core.ui import BaseOverlay
 
-from deja_bounce.constants import WHITE
+from deja_bounce.constants import DIM, WHITE
 from deja_bounce.scenes.models import PongModel
-from deja_bounce.utils import logger
+from deja_bounce.scenes.rewind import RewindBuffer
 
 if TYPE_CHECKING:
     from deja_bounce.scenes.pong import PongScene
@@ -38,30 +40,262 @@ class PhotoOverlay(BaseOverlay):
         surface.draw_text(x, y + 60, "in a Pong-like", color=(155, 155, 255))
 
 
-class ScoreOverlay(BaseOverlay):
-    """Simple overlay to draw the score."""
+# Justification: The HUD caches its layout and text between frames.
+# pylint: disable=too-many-instance-attributes
+class PerfHudOverlay(BaseOverlay):
+    """
+    Performance HUD: frame time, simulation/render split, entity and system
+    counts, draw calls and a rolling frame-time graph.
+
+    Text lines are re-formatted only when a shown value changes, at most
+    every `refresh` seconds (values are averaged over that window). The
+    graph is a ring of precomputed bar heights; each frame adds one bar.
+    """
+
+    refresh = 0.25  # seconds between text refreshes
+    bars = 90
+    bar_width = 2
+    graph_height = 40
+    graph_ms = 1000.0 / 30  # frame time drawn at full graph height
+
+    def __init__(self, model: PongModel, size: Size2D, scene: PongScene):
+        self.model = model
+        self.size = size
+        self.scene = scene
+        self.x = 20
+        self.y = 40
+        self.graph_y = self.y + 3 * 24 + self.graph_height
+        self.budget_y = self.graph_y - round(
+            self.graph_height * 1000.0 / scene.fps / self.graph_ms
+        )
+        self._bar_x = tuple(
+            self.x + i * self.bar_width for i in range(self.bars)
+        )
+        self._heights = array("B", bytes(self.bars))
+        self._head = 0
+        self._lines = ["", "", ""]
+        self._shown: list[tuple] = [(), (), ()]
+        self._next_refresh = 0.0
+        self._frames = 0
+        self._frame_ns = 0
+        self._update_ns = 0
+        self._draw_ns = 0
+
+    def _push_bar(self, frame_ns: int):
+        ms = frame_ns / 1e6
+        self._heights[self._head] = min(
+            self.graph_height, round(ms * self.graph_height / self.graph_ms)
+        )
+        self._head = (self._head + 1) % self.bars
+
+    def _refresh_text(self):
+        frames = max(1, self._frames)
+        frame_ms = self._frame_ns / frames / 1e6
+        scene = self.scene
+        values = (
+            (round(frame_ms, 1), round(1000.0 / frame_ms) if frame_ms else 0),
+            (
+                round(self._update_ns / frames / 1e6, 2),
+                round(self._draw_ns / frames / 1e6, 2),
+            ),
+            (
+                # Extra multiball balls are not entities but count as ones
+                len(scene.services.entities) + scene.model.multiball - 1,
+                len(scene.services.systems),
+                scene.stats.draw_calls,
+            ),
+        )
+        if values[0] != self._shown[0]:
+            self._lines[0] = f"FRAME {values[0][0]:.1f} ms  {values[0][1]} fps"
+        if values[1] != self._shown[1]:
+            self._lines[1] = (
+                f"SIM {values[1][0]:.2f} ms  RENDER {values[1][1]:.2f} ms"
+            )
+        if values[2] != self._shown[2]:
+            self._lines[2] = (
+                f"ENT {values[2][0]}  SYS {values[2][1]}  DRAW {values[2][2]}"
+            )
+        self._shown = list(values)
+        self._frames = 0
+        self._frame_ns = 0
+        self._update_ns = 0
+        self._draw_ns = 0
+
+    def draw(self, surface: Backend):
+        if not self.model.perf_hud:
+            return
+
+        stats = self.scene.stats
+        self._push_bar(stats.frame_ns)
+        self._frames += 1
+        self._frame_ns += stats.frame_ns
+        self._update_ns += stats.update_ns
+        self._draw_ns += stats.draw_ns
+        now = time.perf_counter()
+        if now >= self._next_refresh:
+            self._next_refresh = now + self.refresh
+            self._refresh_text()
+
+        for i, line in enumerate(self._lines):
+            surface.draw_text(self.x, self.y + i * 24, line, color=DIM)
+
+        # Oldest bar on the left; the line marks the frame budget
+        heights = self._heights
+        head = self._head
+        base = self.graph_y
+        for i, x in enumerate(self._bar_x):
+            h = heights[(head + i) % self.bars]
+            if h:
+                surface.draw_rect(
+                    x, base - h, self.bar_width, h, color=(90, 200, 120)
+                )
+        surface.draw_rect(
+            self.x,
+            self.budget_y,
+            self.bars * self.bar_width,
+            1,
+            color=(200, 90, 90),
+        )
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+class TurboOverlay(BaseOverlay):
+    """
+    Overlay showing the fast-forward speed while turbo is active.
+    """
 
     def __init__(self, model: PongModel, size: Size2D):
         self.model = model
         self.size = size
 
     def draw(self, surface: Backend):
+        turbo = self.model.turbo
+        if turbo == 1:
+            return
+
+        if turbo:
+            text = f"TURBO {turbo}x"
+        else:
+            text = f"TURBO MAX {self.model.turbo_rate:.0f}x"
+        surface.draw_text(
+            self.size.width // 2 + 20, self.size.height - 30, text, color=DIM
+        )
+
+
+class RewindOverlay(BaseOverlay):
+    """
+    Overlay showing how much history is left while rewinding.
+    """
+
+    def __init__(self, model: PongModel, size: Size2D, buffer: RewindBuffer):
+        self.model = model
+        self.size = size
+        self.buffer = buffer
+
+    def draw(self, surface: Backend):
+        if not self.model.rewinding:
+            return
+
+        surface.draw_text(
+            self.size.width // 2 + 20,
+            60,
+            f"<< {self.buffer.seconds:.1f}s",
+            color=DIM,
+        )
+
+
+class RetainedOverlay(BaseOverlay):
+    """
+    Overlay whose pixels only change when layer_key() does.
+
+    The scene offers it to the backend with retain() before anything else
+    is drawn in the frame. A backend that retains layers (RasterBackend)
+    keeps it in the background it clears to and only redraws it when the
+    key changes; it then sits under the rest of the frame. On any other
+    backend draw() draws it every frame, in overlay order.
+    """
+
+    _retained = False
+
+    def layer_key(self) -> Hashable:
+        """
+        Everything the overlay's pixels depend on.
+
+        :return: Key compared from frame to frame.
+        :rtype: Hashable
+        """
+        raise NotImplementedError
+
+    def draw_layer(self, surface: Backend):
+        """
+        Draw the overlay's pixels.
+
+        :param surface: The backend surface to draw on.
+        :type surface: Backend
+        """
+        raise NotImplementedError
+
+    def retain(self, surface: Backend) -> bool:
+        """
+        Hand the overlay to `surface` for this frame, if it retains layers.
+
+        :param surface: The backend the frame is drawn on.
+        :type surface: Backend
+
+        :return: True if the backend draws the overlay, and draw() skips it.
+        :rtype: bool
+        """
+        retain_layer = getattr(surface, "retain_layer", None)
+        self._retained = retain_layer is not None and retain_layer(
+            self, self.layer_key(), self.draw_layer
+        )
+        return self._retained
+
+    def draw(self, surface: Backend):
+        if not self._retained:
+            self.draw_layer(surface)
+
+
+class ScoreOverlay(RetainedOverlay):
+    """
+    Simple overlay to draw the score.
+
+    The score strings are only formatted when the score changes.
+    """
+
+    def __init__(self, model: PongModel, size: Size2D):
+        self.model = model
+        self.size = size
+        self._score: tuple[int, int] | None = None
+        self._texts = ("", "")
+
+    def layer_key(self) -> Hashable:
+        score = self.model.score
+        return score.left, score.right, self.size.width
+
+    def draw_layer(self, surface: Backend):
+        score = self.model.score
+        if (score.left, score.right) != self._score:
+            self._score = (score.left, score.right)
+            self._texts = (str(score.left), str(score.right))
         score_y = 20
         surface.draw_text(
             self.size.width // 4,
             score_y,
-            str(self.model.score.left),
+            self._texts[0],
             color=WHITE,
         )
         surface.draw_text(
             self.size.width * 3 // 4,
             score_y,
-            str(self.model.score.right),
+            self._texts[1],
             color=WHITE,
         )
 
 
-class WallsOverlay(BaseOverlay):
+class WallsOverlay(RetainedOverlay):
     """
     Simple overlay to draw walls.
     """
@@ -70,6 +304,16 @@ class WallsOverlay(BaseOverlay):
         self.model = model
         self.size = size
 
+    def layer_key(self) -> Hashable:
+        model = self.model
+        return (
+            model.wall_height,
+            model.wall_left,
+            model.wall_right,
+            self.size.width,
+            self.size.height,
+        )
+
     def _middle_line(self, surface: Backend):
         line_width = 5
         x = self.size.width // 2 - line_width // 2
@@ -78,7 +322,7 @@ class WallsOverlay(BaseOverlay):
         # Color gray
         surface.draw_rect(x, y, line_width, h, color=(150, 150, 150))
 
-    def draw(self, surface: Backend):
+    def draw_layer(self, surface: Backend):
         wall_height = self.model.wall_height
         w = self.size.width
         h = self.size.height
@@ -96,6 +340,4 @@ class WallsOverlay(BaseOverlay):
 
         if self.model.wall_right:
             # Right wall
-            logger.critical("Drawing right wall")
-            surface.draw_rect(w - wall_height, 0, wall_height, h, color=WHITE)
             surface.draw_rect(w - wall_height, 0, wall_height, h, color=WHITE)
@@ -4,39 +4,79 @@ Minimal Pong-like scene using mini-arcade-core.
 
 from __future__ import annotations
 
+import random
+import time
+
 from mini_arcade_core import Game
 from mini_arcade_core.backend import Backend, Event
 from mini_arcade_core.keymaps import Key
 from mini_arcade_core.scenes import Scene, register_scene
 from mini_arcade_core.spaces.d2 import KinematicData, Position2D, Size2D
 
-from deja_bounce.constants import PADDLE_SIZE
+from deja_bounce.broadphase import UniformGrid
+from deja_bounce.capture import FrameSequence, get_capture_writer
+from deja_bounce.constants import (
+    BALL_SIZE,
+    BALL_VELOCITY,
+    FPS,
+    PADDLE_MARGIN,
+    PADDLE_SIZE,
+    ROOT,
+)
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
 from deja_bounce.entities import Ball, Paddle, PaddleConfig
+from deja_bounce.profiling import FrameProfiler, FrameStats
+from deja_bounce.replay import (
+    ReplayLog,
+    ReplayPlayer,
+    ReplayRecorder,
+    new_seed,
+)
 from deja_bounce.utils import logger
 
 from .commands import (
+    CycleMultiballCommand,
+    CycleTurboCommand,
     EnableTrialModeCommand,
     PauseGameCommand,
     PhotoModeCommand,
     QuitCommand,
+    StartRewindCommand,
+    StopRewindCommand,
     TakeScreenshotCommand,
+    TogglePerfHudCommand,
+    ToggleRecordingCommand,
 )
 from .models import PongModel, ScoreState
-from .overlays import PhotoOverlay, ScoreOverlay, WallsOverlay
+from .overlays import (
+    PerfHudOverlay,
+    PhotoOverlay,
+    RetainedOverlay,
+    RewindOverlay,
+    ScoreOverlay,
+    TurboOverlay,
+    WallsOverlay,
+)
+from .rewind import RewindBuffer
 from .systems import (
     BallOutSystem,
     BallPaddleCollisionSystem,
     BallWallBounceSystem,
+    BroadphaseSystem,
     CpuPaddleControlSystem,
     CPUVsCPUSystem,
     GodModeSystem,
+    MultiBallSystem,
     PaddleControlSystem,
     PongCheatsSystem,
     ResetRallySystem,
     SlowMoSystem,
+    SweptBallCollisionSystem,
     TrailModeSystem,
     WinConditionSystem,
 )
+from .trail import TrailBuffer
 
 
 # pylint: disable=too-many-instance-attributes
@@ -44,30 +84,114 @@ from .systems import (
 class PongScene(Scene):
     """
     Minimal scene: opens a window, clears screen, handles quit/ESC.
+
+    Setting DEJA_BOUNCE_PROFILE attaches a FrameProfiler that times every
+    section and system and dumps the percentiles on exit.
+
+    The simulation advances in fixed ticks of 1/fps seconds, and every match
+    draws its CPU aim errors from a seeded RNG, so a match is reproducible
+    from its ReplayLog. Passing `replay` plays such a log back instead of
+    taking live paddle input.
+
+    :cvar swept_collisions (bool): Use SweptBallCollisionSystem instead of
+        the per-frame wall and paddle overlap checks. On by default, since
+        the per-hit speed-up lets long rallies reach speeds at which the
+        overlap checks let the ball pass through a paddle. The headless
+        simulators (HeadlessPongScene, BatchSimulator, VecPongEnv) follow
+        this setting unless told otherwise.
+    :cvar turbo_budget (float): Wall-clock seconds per frame that uncapped
+        turbo may spend simulating.
+    :cvar turbo_window (float): Real seconds over which turbo_rate is
+        averaged.
+    :cvar max_frame_time (float): Longest frame dt turned into ticks; a
+        longer hitch is dropped instead of simulated.
+    :cvar record_replays (bool): Record live matches to ROOT/replays.
+    :cvar rewind_seconds (float): History kept for rewinding (hold R); none
+        is kept while multiball is on.
+    :cvar capture_fps (float): Frame rate of image sequences (toggle F11).
+    :cvar trail_length (int): Ball positions kept for trail mode (toggle T).
+    :cvar broadphase_cell (float): Cell size of the `bodies` grid.
     """
 
+    swept_collisions = True
+    turbo_budget = 0.012
+    turbo_window = 0.5
+    max_frame_time = 0.25
+    record_replays = True
+    rewind_seconds = 30.0
+    capture_fps = 30.0
+    trail_length = 15
+    broadphase_cell = 50.0
+
     right_paddle: Paddle
     left_paddle: Paddle
     ball: Ball
 
-    def __init__(self, game: Game):
+    def __init__(
+        self,
+        game: Game,
+        replay: ReplayLog | None = None,
+        seed: int | None = None,
+    ):
         """
         :param game: The game instance.
         :type game: Game
+
+        :param replay: Log to play back instead of a live match.
+        :type replay: ReplayLog, optional
+
+        :param seed: Match seed for a live match (a fresh one if omitted).
+        :type seed: int, optional
         """
         super().__init__(game)
         self.model = PongModel(
             score=ScoreState(),
+            trail=TrailBuffer(self.trail_length),
         )
+        # Everything the balls collide with (see BroadphaseSystem)
+        self.bodies: UniformGrid[Paddle] = UniformGrid(self.broadphase_cell)
         self._set_entities()
 
+        self.fps = replay.fps if replay is not None else FPS
+        self.tick_dt = 1.0 / self.fps
+        self.tick = 0
+        self._lag = 0.0
+        if replay is not None:
+            self.seed = replay.seed
+        else:
+            self.seed = seed if seed is not None else new_seed()
+        self.rng = random.Random(self.seed)
+        self.player: ReplayPlayer | None = None
+        self.recorder: ReplayRecorder | None = None
+        # CPU settings the match is played with; None follows the game's
+        # difficulty setting
+        self.cpu_config: CpuConfig | None = None
+        if replay is not None:
+            self.cpu_config = DIFFICULTY_PRESETS.get(
+                replay.difficulty, DIFFICULTY_PRESETS["normal"]
+            )
+            self.player = ReplayPlayer(self, replay)
+        elif self.record_replays:
+            self.recorder = ReplayRecorder(self, ROOT / "replays")
+        self.rewind = RewindBuffer(self, self.rewind_seconds)
+        self.sequence: FrameSequence | None = None
+        self._turbo_clock = time.perf_counter()
+        self._turbo_real = 0.0
+        self._turbo_sim = 0.0
+        self.profiler = FrameProfiler.from_env()
+        self.stats = FrameStats()
+        # Overlays offered to the backend as retained layers each frame
+        self.retained: tuple[RetainedOverlay, ...] = ()
+
     def _set_entities(self):
         pad_w, pad_h = PADDLE_SIZE
 
         # Left paddle
         self.left_paddle = Paddle(
             PaddleConfig(
-                position=Position2D(20, self.size.height / 2 - pad_h / 2),
+                position=Position2D(
+                    PADDLE_MARGIN, self.size.height / 2 - pad_h / 2
+                ),
                 size=Size2D(pad_w, pad_h),
                 window_height=self.size.height,
             )
@@ -77,7 +201,7 @@ class PongScene(Scene):
         self.right_paddle = Paddle(
             PaddleConfig(
                 position=Position2D(
-                    self.size.width - 20 - pad_w,
+                    self.size.width - PADDLE_MARGIN - pad_w,
                     self.size.height / 2 - pad_h / 2,
                 ),
                 size=Size2D(pad_w, pad_h),
@@ -86,14 +210,15 @@ class PongScene(Scene):
         )
 
         # Ball
+        vx, vy = BALL_VELOCITY
         self.ball = Ball(
             KinematicData.rect(
-                x=self.size.width / 2 - 5,
-                y=self.size.height / 2 - 5,
-                width=10,
-                height=10,
-                vx=-250.0,
-                vy=-200.0,
+                x=self.size.width / 2 - BALL_SIZE / 2,
+                y=self.size.height / 2 - BALL_SIZE / 2,
+                width=BALL_SIZE,
+                height=BALL_SIZE,
+                vx=vx,
+                vy=vy,
             )
         )
 
@@ -112,28 +237,76 @@ class PongScene(Scene):
         self.services.input.on_key_down(
             Key.F12, TakeScreenshotCommand(), "screenshot"
         )
+        self.services.input.on_key_down(
+            Key.F11, ToggleRecordingCommand(), "recording"
+        )
+        self.services.input.on_key_down(Key.F, CycleTurboCommand(), "turbo")
+        self.services.input.on_key_down(
+            Key.H, TogglePerfHudCommand(), "perf_hud"
+        )
         self.services.entities.add(
             self.left_paddle, self.right_paddle, self.ball
         )
         self.services.overlays.add(PhotoOverlay(self.model))
-        self.services.overlays.add(WallsOverlay(self.model, self.size))
-        self.services.overlays.add(ScoreOverlay(self.model, self.size))
-        self.services.systems.add(PaddleControlSystem(self))
-        self.services.systems.add(CpuPaddleControlSystem(self))
-        self.services.systems.add(BallWallBounceSystem(self))
-        self.services.systems.add(BallPaddleCollisionSystem(self))
-        self.services.systems.add(ResetRallySystem(self))
-        self.services.systems.add(BallOutSystem(self))
-        self.services.systems.add(PongCheatsSystem(scene=self))
+        self.retained = (
+            WallsOverlay(self.model, self.size),
+            ScoreOverlay(self.model, self.size),
+        )
+        for overlay in self.retained:
+            self.services.overlays.add(overlay)
+        self.services.overlays.add(TurboOverlay(self.model, self.size))
+        self.services.overlays.add(PerfHudOverlay(self.model, self.size, self))
+        self.services.overlays.add(
+            RewindOverlay(self.model, self.size, self.rewind)
+        )
+        if self.player is None:
+            self.services.input.on_key_down(
+                Key.R, StartRewindCommand(), "rewind"
+            )
+            self.services.input.on_key_up(Key.R, StopRewindCommand(), "rewind")
+            self.services.input.on_key_down(
+                Key.M, CycleMultiballCommand(), "multiball"
+            )
+            self.services.systems.add(PaddleControlSystem(self))
+            self.services.systems.add(PongCheatsSystem(scene=self))
+        self.services.systems.add(
+            CpuPaddleControlSystem(self, config=self.cpu_config)
+        )
+        self._add_rule_systems()
         self.services.systems.add(GodModeSystem(self))
         self.services.systems.add(SlowMoSystem(self))
         self.services.systems.add(CPUVsCPUSystem(self))
+        self.services.systems.add(MultiBallSystem(self))
         self.services.systems.add(TrailModeSystem(self))
-        self.services.systems.add(WinConditionSystem(self))
         self._systems_on_enter()
 
+    def _add_rule_systems(self):
+        """
+        Add the systems every match runs: ball collisions, serving, scoring
+        and the win check.
+        """
+        self._add_ball_collision_systems()
+        self.services.systems.add(ResetRallySystem(self))
+        self.services.systems.add(BallOutSystem(self))
+        self.services.systems.add(WinConditionSystem(self))
+
+    def _add_ball_collision_systems(self):
+        self.services.systems.add(BroadphaseSystem(self))
+        if self.swept_collisions:
+            self.services.systems.add(SweptBallCollisionSystem(self))
+        else:
+            self.services.systems.add(BallWallBounceSystem(self))
+            self.services.systems.add(BallPaddleCollisionSystem(self))
+
     def on_exit(self):
         logger.info("PongScene on_exit")
+        self.model.recording = False
+        self._record(None)
+        if self.recorder is not None:
+            self.recorder.finish()
+        if self.profiler is not None:
+            path = self.profiler.dump()
+            logger.info("Wrote frame profile to %s", path)
 
     def handle_event(self, event: Event):  # type: ignore[override]
         """
@@ -145,15 +318,170 @@ class PongScene(Scene):
 
     def update(self, dt: float):
         """
-        Update game logic. (None yet.)
+        Advance the simulation by the ticks `dt` covers; in turbo mode run
+        several times as many (draw still runs once).
+        """
+        start = time.perf_counter_ns()
+        if self.profiler is None:
+            self._advance(dt)
+        else:
+            self.profiler.call("scene.update", self._advance, dt)
+        self.stats.update_ns = time.perf_counter_ns() - start
+
+    def _advance(self, dt: float):
+        now = time.perf_counter()
+        self._lag = min(self._lag + dt, self.max_frame_time)
+        ticks = int(self._lag / self.tick_dt)
+        self._lag -= ticks * self.tick_dt
+
+        turbo = self.model.turbo
+        if turbo == 1:
+            for _ in range(ticks):
+                self._step()
+            self._turbo_clock = now
+            self._turbo_real = 0.0
+            self._turbo_sim = 0.0
+            return
+
+        if turbo:
+            for _ in range(ticks * turbo):
+                self._step()
+            simulated = ticks * turbo * self.tick_dt
+        else:
+            simulated = 0.0
+            deadline = now + self.turbo_budget
+            while time.perf_counter() < deadline:
+                if not self._step():
+                    break
+                simulated += self.tick_dt
+        self._measure_turbo(now, simulated)
+
+    def _step(self) -> bool:
+        """
+        Run one fixed tick.
+
+        :return: False if a finished replay or an exhausted rewind left
+            nothing to simulate.
+        :rtype: bool
         """
-        self.services.entities.update(dt)
-        self._systems_update(dt)
+        if self.model.multiball > 1:
+            # Snapshots do not hold the extra balls, so there is no history
+            # to rewind through while they are in play
+            if self.rewind.count:
+                self.rewind.clear()
+        elif self.model.rewinding:
+            # History no longer matches the inputs, so end the recording
+            if self.recorder is not None:
+                self.recorder.finish()
+            return self.rewind.rewind()
+        else:
+            self.rewind.capture()
+
+        if self.player is not None:
+            if self.player.finished:
+                return False
+            self.player.apply()
+        elif self.recorder is not None:
+            self.recorder.sample()
+
+        self._simulate()
+
+        if self.recorder is not None and self.model.winner is not None:
+            self.recorder.finish()
+        return True
+
+    def _simulate(self):
+        """
+        Run the entities and systems for one tick, with whatever inputs are
+        already applied.
+        """
+        if self.profiler is None:
+            self.services.entities.update(self.tick_dt)
+            self._systems_update(self.tick_dt)
+        else:
+            self.profiler.call(
+                "entities.update", self.services.entities.update, self.tick_dt
+            )
+            self.profiler.call(
+                "systems.update", self._systems_update, self.tick_dt
+            )
+        self.tick += 1
+
+    def _measure_turbo(self, now: float, simulated: float):
+        # Real time is taken between update calls so that draw and the
+        # frame-cap sleep count against the rate too.
+        self._turbo_real += now - self._turbo_clock
+        self._turbo_sim += simulated
+        self._turbo_clock = now
+        if self._turbo_real >= self.turbo_window:
+            self.model.turbo_rate = self._turbo_sim / self._turbo_real
+            self._turbo_real = 0.0
+            self._turbo_sim = 0.0
 
     def draw(self, surface: Backend):  # type: ignore[override]
         """
         Draw the frame using the Backend as the 'surface'.
         """
-        self.services.entities.draw(surface)
-        self._systems_draw(surface)
-        self.services.overlays.draw(surface)
+        stats = self.stats
+        stats.begin_draw()
+        counted = self.model.perf_hud
+        if counted:
+            surface = stats.counter.wrap(surface)
+
+        # Before anything is drawn, while the backend can still retain them
+        for overlay in self.retained:
+            overlay.retain(surface)
+        profiler = self.profiler
+        if profiler is None:
+            self.services.entities.draw(surface)
+            self._systems_draw(surface)
+            self.services.overlays.draw(surface)
+        else:
+            profiler.call(
+                "entities.draw", self.services.entities.draw, surface
+            )
+            profiler.call("systems.draw", self._systems_draw, surface)
+            profiler.call(
+                "overlays.draw", self.services.overlays.draw, surface
+            )
+            profiler.frame()
+        stats.end_draw(counted)
+        if self.model.recording or self.sequence is not None:
+            self._record(surface)
+
+    def _record(self, surface: Backend | None):
+        """
+        Start, feed or stop the image sequence to match model.recording.
+        """
+        sequence = self.sequence
+        if not self.model.recording:
+            if sequence is not None:
+                logger.info(
+                    "Captured %d frames to %s (%d dropped)",
+                    sequence.frames,
+                    sequence.directory,
+                    sequence.dropped,
+                )
+                self.sequence = None
+            return
+        if sequence is None:
+            sequence = self.sequence = FrameSequence(
+                get_capture_writer(), self.capture_fps
+            )
+        sequence(surface)
+
+    def _systems_update(self, dt: float):
+        if self.profiler is None:
+            super()._systems_update(dt)
+        else:
+            self.profiler.run_systems(
+                self.services.systems.sorted(), "update", dt
+            )
+
+    def _systems_draw(self, surface: Backend):
+        if self.profiler is None:
+            super()._systems_draw(surface)
+        else:
+            self.profiler.run_systems(
+                self.services.systems.sorted(), "draw", surface
+            )
@@ -0,0 +1,80 @@
+"""
+Scene registry that imports scene modules on first use.
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from mini_arcade_core import SceneRegistry
+from mini_arcade_core.scenes.registry import SceneFactory
+
+if TYPE_CHECKING:
+    from mini_arcade_core.game import Game
+    from mini_arcade_core.scenes import Scene
+
+
+@dataclass
+class LazySceneRegistry(SceneRegistry):
+    """
+    SceneRegistry whose entries name a module and class instead of holding
+    the class, so a scene's module (and everything it imports) is loaded
+    only when that scene is first created.
+
+    Packages opt in by exposing a SCENES catalog mapping scene ids to
+    (module, class name) pairs; packages without one are discovered
+    eagerly, as SceneRegistry does.
+    """
+
+    _factories: Dict[str, SceneFactory] = field(default_factory=dict)
+
+    def register_lazy(self, scene_id: str, module: str, attr: str):
+        """
+        Register a scene by where it lives rather than by its class.
+
+        :param scene_id: The string ID for the scene.
+        :type scene_id: str
+
+        :param module: Absolute module path of the scene.
+        :type module: str
+
+        :param attr: Name of the Scene class in that module.
+        :type attr: str
+        """
+
+        def import_factory(game: "Game") -> "Scene":
+            scene_cls = getattr(importlib.import_module(module), attr)
+            # Later requests skip the import lookup entirely
+            self.register_cls(scene_id, scene_cls)
+            return scene_cls(game)
+
+        self.register(scene_id, import_factory)
+
+    def load_lazy_catalog(self, catalog: Dict[str, Tuple[str, str]]):
+        """
+        Register every entry of a SCENES-style catalog.
+
+        :param catalog: Scene ids mapped to (module, class name).
+        :type catalog: Dict[str, Tuple[str, str]]
+        """
+        for scene_id, (module, attr) in catalog.items():
+            self.register_lazy(scene_id, module, attr)
+
+    def discover(self, package: str) -> "LazySceneRegistry":
+        """
+        Register the scenes of `package` without importing them.
+
+        :param package: The package name holding a SCENES catalog.
+        :type package: str
+
+        :return: The registry instance (for chaining).
+        :rtype: LazySceneRegistry
+        """
+        catalog = getattr(importlib.import_module(package), "SCENES", None)
+        if catalog is None:
+            super().discover(package)
+        else:
+            self.load_lazy_catalog(catalog)
+        return self
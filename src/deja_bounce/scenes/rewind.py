@@ -0,0 +1,225 @@
+"""
+Time-rewind history for the Pong scene.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from deja_bounce.scenes.pong import PongScene
+
+# tick | ball x, y, vx, vy, prev_x, prev_y, time_scale
+# | left y, vy | right y, vy | score left, right | serve direction | flags
+_RECORD = struct.Struct("<I7d2d2dHHbH")
+
+_FLAGS = (
+    "reset_rally",
+    "god_mode_p1",
+    "god_mode_p2",
+    "slow_mo",
+    "cpu_vs_cpu",
+    "wall_left",
+    "wall_right",
+)
+_LEFT_UP = 1 << 8
+_LEFT_DOWN = 1 << 9
+_RIGHT_UP = 1 << 10
+_RIGHT_DOWN = 1 << 11
+_WINNER_P1 = 1 << 12
+_WINNER_P2 = 1 << 13
+
+
+class RewindBuffer:
+    """
+    Ring buffer of the last `seconds` of scene state, one packed record per
+    tick, preallocated so capturing never allocates.
+
+    :ivar capacity (int): Number of ticks the buffer holds.
+    :ivar count (int): Number of ticks currently stored.
+    """
+
+    def __init__(self, scene: PongScene, seconds: float = 30.0):
+        """
+        :param scene: Scene whose state is captured and restored.
+        :type scene: PongScene
+
+        :param seconds: History length.
+        :type seconds: float
+        """
+        self.scene = scene
+        self.capacity = max(1, round(seconds * scene.fps))
+        self.count = 0
+        self._head = 0  # slot the next capture goes to
+        self._data = bytearray(self.capacity * _RECORD.size)
+
+    @property
+    def seconds(self) -> float:
+        """Seconds of history currently stored."""
+        return self.count * self.scene.tick_dt
+
+    def clear(self):
+        """Drop all history."""
+        self.count = 0
+        self._head = 0
+
+    def capture(self):
+        """
+        Append the scene's current state, overwriting the oldest record
+        once the buffer is full.
+        """
+        scene = self.scene
+        model = scene.model
+        ball = scene.ball
+        left = scene.left_paddle
+        right = scene.right_paddle
+
+        flags = 0
+        for bit, name in enumerate(_FLAGS):
+            if getattr(model, name):
+                flags |= 1 << bit
+        if left.moving_up:
+            flags |= _LEFT_UP
+        if left.moving_down:
+            flags |= _LEFT_DOWN
+        if right.moving_up:
+            flags |= _RIGHT_UP
+        if right.moving_down:
+            flags |= _RIGHT_DOWN
+        if model.winner == "P1":
+            flags |= _WINNER_P1
+        elif model.winner == "P2":
+            flags |= _WINNER_P2
+
+        _RECORD.pack_into(
+            self._data,
+            self._head * _RECORD.size,
+            scene.tick,
+            ball.position.x,
+            ball.position.y,
+            ball.velocity.vx,
+            ball.velocity.vy,
+            ball.prev_x,
+            ball.prev_y,
+            ball.time_scale,
+            left.position.y,
+            left.velocity.vy,
+            right.position.y,
+            right.velocity.vy,
+            model.score.left,
+            model.score.right,
+            model.reset_rally_direction or 0,
+            flags,
+        )
+        self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    # Justification: one local per packed field keeps the unpack readable.
+    # pylint: disable=too-many-locals
+    def rewind(self) -> bool:
+        """
+        Restore the newest stored state and drop it from the buffer.
+
+        :return: False if there was no history left.
+        :rtype: bool
+        """
+        if self.count == 0:
+            return False
+        self._head = (self._head - 1) % self.capacity
+        self.count -= 1
+        (
+            tick,
+            ball_x,
+            ball_y,
+            ball_vx,
+            ball_vy,
+            prev_x,
+            prev_y,
+            time_scale,
+            left_y,
+            left_vy,
+            right_y,
+            right_vy,
+            score_left,
+            score_right,
+            direction,
+            flags,
+        ) = _RECORD.unpack_from(self._data, self._head * _RECORD.size)
+
+        scene = self.scene
+        model = scene.model
+        ball = scene.ball
+        left = scene.left_paddle
+        right = scene.right_paddle
+
+        scene.tick = tick
+        ball.position.x = ball_x
+        ball.position.y = ball_y
+        ball.velocity.vx = ball_vx
+        ball.velocity.vy = ball_vy
+        ball.prev_x = prev_x
+        ball.prev_y = prev_y
+        ball.time_scale = time_scale
+        left.position.y = left_y
+        left.velocity.vy = left_vy
+        left.vy = left_vy
+        right.position.y = right_y
+        right.velocity.vy = right_vy
+        right.vy = right_vy
+        model.score.left = score_left
+        model.score.right = score_right
+        model.reset_rally_direction = direction or None
+
+        for bit, name in enumerate(_FLAGS):
+            setattr(model, name, bool(flags & (1 << bit)))
+        left.moving_up = bool(flags & _LEFT_UP)
+        left.moving_down = bool(flags & _LEFT_DOWN)
+        right.moving_up = bool(flags & _RIGHT_UP)
+        right.moving_down = bool(flags & _RIGHT_DOWN)
+        if flags & _WINNER_P1:
+            model.winner = "P1"
+        elif flags & _WINNER_P2:
+            model.winner = "P2"
+        else:
+            model.winner = None
+        return True
+
+    # pylint: enable=too-many-locals
+
+    def rewind_to(self, tick: int) -> bool:
+        """
+        Restore the state captured at the start of `tick`, dropping every
+        newer record. Used by rollback netplay to re-simulate from a tick
+        whose inputs were mispredicted.
+
+        :param tick: Tick to go back to.
+        :type tick: int
+
+        :return: False if that tick is no longer (or not yet) stored.
+        :rtype: bool
+        """
+        newer = self.scene.tick - tick - 1
+        if newer < 0 or newer >= self.count:
+            return False
+        self._head = (self._head - newer) % self.capacity
+        self.count -= newer
+        return self.rewind()
+
+    def checksum(self, tick: int) -> int | None:
+        """
+        CRC-32 of the state captured at the start of `tick`, so two
+        simulations can check they agree.
+
+        :param tick: Tick whose record to hash.
+        :type tick: int
+
+        :return: The checksum, or None if that tick is not stored.
+        :rtype: int | None
+        """
+        back = self.scene.tick - tick
+        if back < 1 or back > self.count:
+            return None
+        start = ((self._head - back) % self.capacity) * _RECORD.size
+        return zlib.crc32(self._data[start : start + _RECORD.size])
@@ -8,6 +8,7 @@ Minimal Pong-like scene using mini-arcade-core.
 
 from __future__ import annotations
 
+import random
 from typing import TYPE_CHECKING
 
 from mini_arcade_core.backend import Backend
@@ -16,9 +17,13 @@ from mini_arcade_core.managers.cheats import CheatSystem
 from mini_arcade_core.scenes import BaseSceneSystem
 from mini_arcade_core.spaces.d2 import Bounds2D, Size2D, VerticalBounce
 
-from deja_bounce.controllers.cpu import CpuPaddleController
+from deja_bounce.broadphase import entity_rect
+from deja_bounce.constants import MULTIBALL_LEVELS
+from deja_bounce.controllers.cpu import CpuConfig, CpuPaddleController, Side
 from deja_bounce.difficulty import DIFFICULTY_PRESETS
 from deja_bounce.entities.paddle import Paddle
+from deja_bounce.physics import overlaps, sweep_aabb
+from deja_bounce.utils import logger
 
 from .commands import (
     CpuVsCpuCommand,
@@ -34,9 +39,27 @@ from .commands import (
 )
 
 if TYPE_CHECKING:
+    from deja_bounce.scenes.multiball import BallSet
     from deja_bounce.scenes.pong import PongScene
 
 
+def ball_bounds(scene: PongScene) -> Bounds2D:
+    """
+    Bounds the ball bounces inside: the full width, and the height minus
+    both walls.
+
+    :param scene: The PongScene instance.
+    :type scene: PongScene
+
+    :return: A new Bounds2D for the scene.
+    :rtype: Bounds2D
+    """
+    wall_height = scene.model.wall_height
+    return Bounds2D.from_size(
+        Size2D(scene.size.width - 0, scene.size.height - 2 * wall_height)
+    )
+
+
 class PaddleControlSystem(BaseSceneSystem):
     """
     System to handle paddle controls.
@@ -47,17 +70,19 @@ class PaddleControlSystem(BaseSceneSystem):
     scene: PongScene
 
     def on_enter(self) -> None:
+        paddle = self.scene.left_paddle
+        recorder = self.scene.recorder
         self.scene.services.input.on_key_down(
-            Key.W, MovePaddleCommand(self.scene.left_paddle, "up"), "p1_up"
+            Key.W, MovePaddleCommand(paddle, "up", recorder), "p1_up"
         )
         self.scene.services.input.on_key_down(
-            Key.S, MovePaddleCommand(self.scene.left_paddle, "down"), "p1_down"
+            Key.S, MovePaddleCommand(paddle, "down", recorder), "p1_down"
         )
         self.scene.services.input.on_key_up(
-            Key.W, StopPaddleCommand(self.scene.left_paddle, "up"), "p1_up"
+            Key.W, StopPaddleCommand(paddle, "up", recorder), "p1_up"
         )
         self.scene.services.input.on_key_up(
-            Key.S, StopPaddleCommand(self.scene.left_paddle, "down"), "p1_down"
+            Key.S, StopPaddleCommand(paddle, "down", recorder), "p1_down"
         )
 
 
@@ -72,10 +97,7 @@ class BallWallBounceSystem(BaseSceneSystem):
 
     def __init__(self, scene):
         super().__init__(scene)
-        wall_height = scene.model.wall_height
-        self.bounds = Bounds2D.from_size(
-            Size2D(scene.size.width - 0, scene.size.height - 2 * wall_height)
-        )
+        self.bounds = ball_bounds(scene)
         self.ball_vertical_bounds = VerticalBounce(self.bounds)
 
     def update(self, dt: float) -> None:
@@ -92,6 +114,58 @@ class BallWallBounceSystem(BaseSceneSystem):
         self.ball_vertical_bounds.apply(self.scene.ball)
 
 
+def is_left_side(scene: PongScene, body: Paddle) -> bool:
+    """
+    Whether `body` is on the left half of the field (so the ball bounces
+    off its right face).
+
+    :param scene: The PongScene instance.
+    :type scene: PongScene
+
+    :param body: A body from scene.bodies.
+    :type body: Paddle
+
+    :return: True for the left half.
+    :rtype: bool
+    """
+    return body.position.x + body.size.width / 2 < scene.size.width / 2
+
+
+class BroadphaseSystem(BaseSceneSystem):
+    """
+    System keeping `scene.bodies`, the uniform grid of everything the balls
+    collide with, in sync once paddles have moved for the tick.
+
+    Once bodies other than the two paddles are added, the ball collision
+    systems query the grid for the ones near each ball instead of testing
+    every body, so adding bodies does not multiply the exact collision
+    checks. A normal match only has the paddles, which the collision
+    systems check directly, so the grid is left alone.
+
+    :ivar min_bodies (int): Body count from which the grid is used.
+    """
+
+    priority = 55  # after paddle control, before any ball collision
+    enabled = True
+    scene: PongScene
+
+    min_bodies = 3
+
+    def on_enter(self) -> None:
+        scene = self.scene
+        bodies = scene.bodies
+        bodies.clear()
+        for paddle in (scene.left_paddle, scene.right_paddle):
+            bodies.insert(paddle, entity_rect(paddle))
+
+    def update(self, dt: float) -> None:
+        bodies = self.scene.bodies
+        if len(bodies) < self.min_bodies:
+            return
+        for index, body in enumerate(bodies):
+            bodies.move(index, entity_rect(body))
+
+
 class BallPaddleCollisionSystem(BaseSceneSystem):
     """
     System to handle ball collisions with paddles.
@@ -101,6 +175,11 @@ class BallPaddleCollisionSystem(BaseSceneSystem):
     enabled = True
     scene: PongScene
 
+    base_vy = 220.0  # base vertical speed from angle
+    inertia_factor = 0.3  # how much paddle.vy affects ball.velocity.vy
+    max_vy = 400.0  # safety clamp
+    speed_up = 1.03  # vx multiplier per hit
+
     def _apply_paddle_influence(self, paddle: Paddle):
         """
         Adjust ball trajectory based on:
@@ -122,12 +201,10 @@ class BallPaddleCollisionSystem(BaseSceneSystem):
             norm = 0.0
         norm = max(-1.0, min(1.0, norm))
 
-        base_vy = 220.0  # base vertical speed from angle
-        inertia_factor = 0.3  # how much paddle.vy affects ball.velocity.vy
-        max_vy = 400.0  # safety clamp
+        max_vy = self.max_vy
 
         # angle component + inertia from paddle velocity
-        new_vy = norm * base_vy + paddle.vy * inertia_factor
+        new_vy = norm * self.base_vy + paddle.vy * self.inertia_factor
 
         # optional clamp so it doesn't go crazy fast
         if new_vy > max_vy:
@@ -138,34 +215,170 @@ class BallPaddleCollisionSystem(BaseSceneSystem):
         scene.ball.velocity.vy = new_vy
 
         # (optional) tiny speed-up on each hit to make rallies more intense
-        scene.ball.velocity.vx *= 1.03
+        scene.ball.velocity.vx *= self.speed_up
+
+    def _bounce(self, paddle: Paddle, left: bool):
+        """Put the ball against `paddle`'s face and send it back."""
+        ball = self.scene.ball
+        if left:
+            ball.position.x = paddle.position.x + paddle.size.width
+            ball.velocity.vx = abs(ball.velocity.vx)
+        else:
+            ball.position.x = paddle.position.x - ball.size.width
+            ball.velocity.vx = -abs(ball.velocity.vx)
+        self._apply_paddle_influence(paddle)
 
     def update(self, dt: float) -> None:
-        # Paddle collisions
-        if self.scene.ball.collider.intersects(
-            self.scene.left_paddle.collider
-        ):
-            self.scene.ball.position.x = (
-                self.scene.left_paddle.position.x
-                + self.scene.left_paddle.size.width
-            )
-            self.scene.ball.velocity.vx = abs(self.scene.ball.velocity.vx)
-            self._apply_paddle_influence(self.scene.left_paddle)
+        scene = self.scene
+        collider = scene.ball.collider
+        if len(scene.bodies) < BroadphaseSystem.min_bodies:
+            # Just the paddles
+            if collider.intersects(scene.left_paddle.collider):
+                self._bounce(scene.left_paddle, True)
+            if collider.intersects(scene.right_paddle.collider):
+                self._bounce(scene.right_paddle, False)
+            return
 
-        if self.scene.ball.collider.intersects(
-            self.scene.right_paddle.collider
-        ):
-            self.scene.ball.position.x = (
-                self.scene.right_paddle.position.x - self.scene.ball.size.width
-            )
-            self.scene.ball.velocity.vx = -abs(self.scene.ball.velocity.vx)
-            self._apply_paddle_influence(self.scene.right_paddle)
+        # Exact overlap test only against the bodies near the ball
+        for body in scene.bodies.query(entity_rect(scene.ball)):
+            if collider.intersects(body.collider):
+                self._bounce(body, is_left_side(scene, body))
+
+
+class SweptBallCollisionSystem(BallPaddleCollisionSystem):
+    """
+    Continuous replacement for BallWallBounceSystem and
+    BallPaddleCollisionSystem.
+
+    Re-traces the ball's motion for this step from where it started,
+    stopping at every wall or paddle contact (time of impact) and carrying
+    on with the bounced velocity, so large dt values or fast rallies never
+    tunnel through a paddle. Paddles are treated as static at their
+    end-of-step position.
+
+    :ivar max_bounces (int): Contacts resolved per step before giving up.
+    """
+
+    priority = 60
+    enabled = True
+    scene: PongScene
+
+    max_bounces = 8
+
+    def __init__(self, scene):
+        super().__init__(scene)
+        bounds = ball_bounds(scene)
+        self.top = bounds.top
+        self.bottom = bounds.bottom
+
+    def _paddle_hit(self, paddle: Paddle, ball_rect, velocity, remaining):
+        """Time until the ball hits `paddle`'s face, or None."""
+        rect = (
+            paddle.position.x,
+            paddle.position.y,
+            paddle.size.width,
+            paddle.size.height,
+        )
+        if overlaps(ball_rect, rect):
+            return 0.0
+        hit = sweep_aabb(ball_rect, velocity, rect, remaining)
+        return None if hit is None else hit.time
+
+    # Justification: One loop resolving every contact kind in order
+    # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+    def update(self, dt: float) -> None:
+        scene = self.scene
+        ball = scene.ball
+        velocity = ball.velocity
+        w = ball.size.width
+        h = ball.size.height
+        x = ball.prev_x
+        y = ball.prev_y
+        remaining = dt * ball.time_scale
+
+        for _ in range(self.max_bounces):
+            vx = velocity.vx
+            vy = velocity.vy
+            first = remaining
+            contact = None
+
+            if vy < 0:
+                t = max(0.0, (self.top - y) / vy)
+                if t <= first:
+                    first, contact = t, "top"
+            elif vy > 0:
+                t = max(0.0, (self.bottom - h - y) / vy)
+                if t <= first:
+                    first, contact = t, "bottom"
+
+            ball_rect = (x, y, w, h)
+            if vx:
+                if len(scene.bodies) < BroadphaseSystem.min_bodies:
+                    # Just the paddles: the one the ball is heading for
+                    near = [
+                        scene.left_paddle if vx < 0 else scene.right_paddle
+                    ]
+                else:
+                    # Bodies anywhere along this step's path, facing the ball
+                    reach = (
+                        min(x, x + vx * first),
+                        min(y, y + vy * first),
+                        w + abs(vx) * first,
+                        h + abs(vy) * first,
+                    )
+                    near = [
+                        paddle
+                        for paddle in scene.bodies.query(reach)
+                        if (vx < 0) == is_left_side(scene, paddle)
+                    ]
+                for paddle in near:
+                    t = self._paddle_hit(paddle, ball_rect, (vx, vy), first)
+                    if t is not None and t <= first:
+                        first, contact = t, paddle
+
+            x += vx * first
+            y += vy * first
+            remaining -= first
+            if contact is None:
+                break
+
+            if contact == "top":
+                y = self.top
+                velocity.vy *= -1
+            elif contact == "bottom":
+                y = self.bottom - h
+                velocity.vy *= -1
+            else:
+                paddle = contact
+                if is_left_side(scene, paddle):
+                    x = paddle.position.x + paddle.size.width
+                    velocity.vx = abs(velocity.vx)
+                else:
+                    x = paddle.position.x - w
+                    velocity.vx = -abs(velocity.vx)
+                ball.position.x = x
+                ball.position.y = y
+                self._apply_paddle_influence(paddle)
+        else:
+            # Out of bounces: finish the step and keep the ball in bounds
+            x += velocity.vx * remaining
+            y += velocity.vy * remaining
+            y = max(self.top, min(self.bottom - h, y))
+
+        ball.position.x = x
+        ball.position.y = y
+
+    # pylint: enable=too-many-locals,too-many-branches,too-many-statements
 
 
 class CpuPaddleControlSystem(BaseSceneSystem):
     """
     System to control the CPU paddle.
 
+    The controller is built on first use and rebuilt only when the game's
+    difficulty changes (unless a fixed config was given), so its aim error
+    and paddle speed stay stable from frame to frame.
+
     :ivar priority (int): The priority of the system.
     :ivar enabled (bool): Whether the system is enabled.
     :ivar scene (PongScene): The PongScene instance.
@@ -175,16 +388,162 @@ class CpuPaddleControlSystem(BaseSceneSystem):
     enabled = True
     scene: PongScene
 
+    def __init__(
+        self,
+        scene: PongScene,
+        side: Side = "RIGHT",
+        config: CpuConfig | None = None,
+        rng: random.Random | None = None,
+    ):
+        """
+        :param scene: The PongScene instance.
+        :type scene: PongScene
+
+        :param side: Which paddle to control.
+        :type side: Side
+
+        :param config: Fixed CPU settings (defaults to following the game's
+            difficulty).
+        :type config: CpuConfig, optional
+
+        :param rng: Random source for the controller's aim errors (defaults
+            to the scene's match RNG).
+        :type rng: random.Random, optional
+        """
+        super().__init__(scene)
+        self.side = side
+        self.config = config
+        self.rng = rng if rng is not None else scene.rng
+        self.paddle = (
+            scene.right_paddle if side == "RIGHT" else scene.left_paddle
+        )
+        self.controller: CpuPaddleController | None = None
+        self._level: str | None = None
+
+    def sync_controller(self) -> CpuPaddleController:
+        """
+        Return the controller, building it if missing or if the difficulty
+        it was built for is no longer the current one.
+
+        :return: The up-to-date controller.
+        :rtype: CpuPaddleController
+        """
+        level = self.scene.game.settings.difficulty
+        if self.controller is None or (
+            self.config is None and level != self._level
+        ):
+            config = self.config or DIFFICULTY_PRESETS.get(
+                level, DIFFICULTY_PRESETS["normal"]
+            )
+            self.controller = CpuPaddleController(
+                self.paddle,
+                self.scene.ball,
+                side=self.side,
+                config=config,
+                rng=self.rng,
+                bounds=ball_bounds(self.scene),
+            )
+            self._level = level
+        return self.controller
+
+    def update(self, dt: float) -> None:
+        self.sync_controller().update(dt)
+
+
+class MultiBallSystem(BaseSceneSystem):
+    """
+    System running the extra balls of multiball mode (PongModel.multiball
+    above 1) as one BallSet.
+
+    Each tick the whole set is moved, bounced off the walls and paddles,
+    and balls that leave the field score and are served again, mirroring
+    what the single-ball systems do for `scene.ball`. The CPU paddles keep
+    tracking the main ball.
+
+    The BallSet needs NumPy; it is only imported once multiball is turned
+    on, and without NumPy the mode switches itself back off.
+
+    :ivar balls (BallSet | None): The extra balls, once created.
+    """
+
+    priority = 75  # after the main ball's paddle collisions
+    enabled = True
+    scene: PongScene
+
     def __init__(self, scene: PongScene):
+        """
+        :param scene: The PongScene instance.
+        :type scene: PongScene
+        """
         super().__init__(scene)
-        level = scene.game.settings.difficulty
-        cpu_cfg = DIFFICULTY_PRESETS.get(level, DIFFICULTY_PRESETS["normal"])
-        self.controller = CpuPaddleController(
-            scene.right_paddle, scene.ball, side="RIGHT", config=cpu_cfg
+        self.balls: BallSet | None = None
+        bounds = ball_bounds(scene)
+        self.top = bounds.top
+        self.bottom = bounds.bottom
+
+    def _create_balls(self) -> BallSet | None:
+        # NumPy is optional, so only import the ball set when asked to
+        # pylint: disable=import-outside-toplevel
+        try:
+            from deja_bounce.scenes.multiball import BallSet
+        except ImportError:
+            logger.warning("Multiball mode needs NumPy (deja-bounce[sim])")
+            return None
+        # pylint: enable=import-outside-toplevel
+
+        scene = self.scene
+        return BallSet(
+            capacity=max(MULTIBALL_LEVELS) - 1,
+            size=scene.ball.size.width,
+            center=(scene.size.width / 2, scene.size.height / 2),
+            serve=(ResetRallySystem.serve_vx, ResetRallySystem.serve_vy),
+            seed=scene.seed,
+            trail_length=scene.trail_length,
         )
 
     def update(self, dt: float) -> None:
-        self.controller.update(dt)
+        scene = self.scene
+        model = scene.model
+        balls = self.balls
+        if balls is None:
+            if model.multiball <= 1:
+                return
+            balls = self.balls = self._create_balls()
+            if balls is None:
+                model.multiball = 1
+                return
+        if balls.count != model.multiball - 1:
+            balls.resize(model.multiball - 1)
+        if not balls.count:
+            return
+
+        width = scene.size.width
+        wall = model.wall_height
+        balls.advance(dt * scene.ball.time_scale)
+        balls.bounce_walls(
+            self.top,
+            self.bottom,
+            wall if model.wall_left else float("-inf"),
+            width - wall if model.wall_right else float("inf"),
+        )
+        for paddle in scene.bodies:
+            balls.collide_paddle(paddle, BallPaddleCollisionSystem)
+        out_left, out_right = balls.take_out(0, width)
+        model.score.right += out_left
+        model.score.left += out_right
+
+        if model.trail_mode:
+            balls.record_trail()
+        elif balls.trail.count:
+            balls.trail.clear()
+
+    def draw(self, surface: Backend) -> None:
+        balls = self.balls
+        if balls is None or not balls.count:
+            return
+        if self.scene.model.trail_mode:
+            balls.draw_trail(surface)
+        balls.draw(surface)
 
 
 class ResetRallySystem(BaseSceneSystem):
@@ -195,6 +554,9 @@ class ResetRallySystem(BaseSceneSystem):
     priority = 95
     enabled = True
 
+    serve_vx = 250.0
+    serve_vy = 200.0
+
     def update(self, dt: float) -> None:
         if not self.scene.model.reset_rally:
             return
@@ -205,10 +567,10 @@ class ResetRallySystem(BaseSceneSystem):
         self.scene.ball.position.y = (
             self.scene.size.height / 2 - self.scene.ball.size.height / 2
         )
-        self.scene.ball.velocity.vx = 250.0 * float(
+        self.scene.ball.velocity.vx = self.serve_vx * float(
             self.scene.model.reset_rally_direction
         )
-        self.scene.ball.velocity.vy = 200.0
+        self.scene.ball.velocity.vy = self.serve_vy
         ResetRallyCommand().execute(self.scene.model)
 
 
@@ -296,33 +658,39 @@ class SlowMoSystem(BaseSceneSystem):
         self.scene.right_paddle.time_scale = factor
 
 
-class CPUVsCPUSystem(BaseSceneSystem):
+class CPUVsCPUSystem(CpuPaddleControlSystem):
     """
-    System to handle CPU vs CPU mode.
+    System to handle CPU vs CPU mode: drives the left paddle with the same
+    controller lifecycle as CpuPaddleControlSystem while the mode is on.
     """
 
     priority = 45  # before PaddleControlSystem
     enabled = True
 
+    def __init__(self, scene: PongScene):
+        """
+        :param scene: The PongScene instance.
+        :type scene: PongScene
+        """
+        super().__init__(scene, side="LEFT", config=scene.cpu_config)
+        self._player_speed = self.paddle.speed
+
     def update(self, dt: float) -> None:
         if self.scene.model.cpu_vs_cpu:
-            # Control left paddle with CPU as well
-            level = self.scene.game.settings.difficulty
-            cpu_cfg = DIFFICULTY_PRESETS.get(
-                level, DIFFICULTY_PRESETS["normal"]
-            )
-            controller = CpuPaddleController(
-                self.scene.left_paddle,
-                self.scene.ball,
-                side="LEFT",
-                config=cpu_cfg,
-            )
-            controller.update(dt)
+            super().update(dt)
+        elif self.controller is not None:
+            # Hand the paddle back to the player
+            self.controller.reset()
+            self.paddle.speed = self._player_speed
+            self.controller = None
 
 
 class TrailModeSystem(BaseSceneSystem):
     """
     System to handle trail mode.
+
+    Records one ball position per tick into the model's TrailBuffer and
+    draws it as ball-sized squares fading towards the oldest point.
     """
 
     priority = 98
@@ -330,26 +698,17 @@ class TrailModeSystem(BaseSceneSystem):
     scene: PongScene
 
     def update(self, dt: float) -> None:
-        if self.scene.model.trail_mode:
-            self.scene.model.trail.append(
-                (self.scene.ball.position.x, self.scene.ball.position.y)
-            )
+        model = self.scene.model
+        if model.trail_mode:
+            position = self.scene.ball.position
+            model.trail.append(position.x, position.y)
+        elif model.trail.count:
+            model.trail.clear()
 
     def draw(self, surface: Backend) -> None:
-        if self.scene.model.trail_mode:
-            count = len(self.scene.model.trail)
-            for i, (x, y) in enumerate(self.scene.model.trail):
-                t = (i + 1) / count  # 0..1
-                alpha = t * 0.5  # fade in, max 50% alpha
-                # if your ball is e.g. 12x12 rect:
-                size = 12
-                surface.draw_rect(
-                    int(x - size / 2),
-                    int(y - size / 2),
-                    size,
-                    size,
-                    (255, 255, 255, alpha),  # RGBA
-                )
+        model = self.scene.model
+        if model.trail_mode:
+            model.trail.draw(surface, self.scene.ball.size.width)
 
 
 class WinConditionSystem(BaseSceneSystem):
@@ -0,0 +1,151 @@
+"""
+Ring buffer of ball positions for trail mode.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterator, List, Tuple
+
+from mini_arcade_core.backend import Backend, Color
+
+from deja_bounce.backends.rects import draw_rects
+
+
+class TrailRing:
+    """
+    Slot bookkeeping and alpha ramp shared by every trail: which storage
+    slot the next position goes to, and which slots to draw, oldest first,
+    in which color. Subclasses own the position storage.
+
+    The alpha ramp is computed once: the newest point gets `max_alpha` and
+    each older one fades linearly towards zero, so drawing does no color
+    math, whatever the trail length.
+
+    :ivar capacity (int): Number of positions kept.
+    :ivar count (int): Number of positions currently stored.
+    """
+
+    def __init__(self, capacity: int = 15, max_alpha: float = 0.5):
+        """
+        :param capacity: Number of positions kept.
+        :type capacity: int
+
+        :param max_alpha: Alpha of the newest point.
+        :type max_alpha: float
+        """
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self._head = 0  # slot the next position goes to
+        self._colors: List[Color] = [
+            (255, 255, 255, (i + 1) / self.capacity * max_alpha)
+            for i in range(self.capacity)
+        ]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def push(self) -> int:
+        """
+        Claim the slot for a new position, dropping the oldest one when
+        full.
+
+        :return: Slot the caller stores the position in.
+        :rtype: int
+        """
+        head = self._head
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self.count < self.capacity:
+            self.count += 1
+        return head
+
+    def clear(self):
+        """Drop every stored position."""
+        self.count = 0
+        self._head = 0
+
+    def slots(self) -> Iterator[Tuple[int, Color]]:
+        """
+        Stored slots from oldest to newest, with the color to draw each.
+
+        :return: (slot, color) pairs.
+        :rtype: Iterator[Tuple[int, Color]]
+        """
+        capacity = self.capacity
+        colors = self._colors
+        index = (self._head - self.count) % capacity
+        # A partial trail uses the newest end of the ramp
+        for ramp in range(capacity - self.count, capacity):
+            yield index, colors[ramp]
+            index = index + 1 if index + 1 < capacity else 0
+
+    def ordered(self) -> Tuple[List[int], List[Color]]:
+        """
+        The pairs of slots() as two lists, for drawing in one batch.
+
+        :return: Slots from oldest to newest, and the color of each.
+        :rtype: Tuple[List[int], List[Color]]
+        """
+        capacity = self.capacity
+        first = self._head - self.count + capacity
+        slots = [(first + i) % capacity for i in range(self.count)]
+        return slots, self._colors[capacity - self.count :]
+
+
+class TrailBuffer(TrailRing):
+    """
+    Preallocated ring of the last `capacity` ball positions, stored as the
+    integer top-left corners the trail is drawn at.
+    """
+
+    def __init__(self, capacity: int = 15, max_alpha: float = 0.5):
+        """
+        :param capacity: Number of positions kept.
+        :type capacity: int
+
+        :param max_alpha: Alpha of the newest point.
+        :type max_alpha: float
+        """
+        super().__init__(capacity, max_alpha)
+        self._xs = array("i", bytes(4 * self.capacity))
+        self._ys = array("i", bytes(4 * self.capacity))
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Positions from oldest to newest."""
+        for slot, _ in self.slots():
+            yield self._xs[slot], self._ys[slot]
+
+    def append(self, x: float, y: float):
+        """
+        Store a position, overwriting the oldest one when full.
+
+        :param x: Left edge of the ball.
+        :type x: float
+
+        :param y: Top edge of the ball.
+        :type y: float
+        """
+        slot = self.push()
+        self._xs[slot] = int(x)
+        self._ys[slot] = int(y)
+
+    def draw(self, surface: Backend, size: int):
+        """
+        Draw the whole trail, oldest first, in one draw_rects batch.
+
+        :param surface: Backend to draw on.
+        :type surface: Backend
+
+        :param size: Side of each square (the ball size).
+        :type size: int
+        """
+        slots, colors = self.ordered()
+        xs = self._xs
+        ys = self._ys
+        draw_rects(
+            surface,
+            [xs[slot] for slot in slots],
+            [ys[slot] for slot in slots],
+            size,
+            colors,
+        )
@@ -0,0 +1,21 @@
+"""
+Headless simulation tools for Deja Bounce.
+"""
+
+from __future__ import annotations
+
+from deja_bounce.simulation.headless import (
+    BenchmarkReport,
+    HeadlessMatch,
+    HeadlessPongScene,
+    MatchResult,
+    run_benchmark,
+)
+
+__all__ = [
+    "BenchmarkReport",
+    "HeadlessMatch",
+    "HeadlessPongScene",
+    "MatchResult",
+    "run_benchmark",
+]
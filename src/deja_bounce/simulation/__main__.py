@@ -0,0 +1,94 @@
+"""
+Command line entry point for the headless simulator.
+
+Usage:
+    python -m deja_bounce.simulation --matches 1000 --left hard --right easy
+    python -m deja_bounce.simulation --matches 10000 --batch
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.simulation.headless import DEFAULT_DT, run_benchmark
+
+
+def _run_batch(args: argparse.Namespace):
+    # NumPy is optional, so only import the batch engine when asked to
+    # pylint: disable=import-outside-toplevel
+    from deja_bounce.simulation.batch import BatchSimulator
+
+    # pylint: enable=import-outside-toplevel
+
+    result = BatchSimulator(
+        args.matches,
+        left=DIFFICULTY_PRESETS[args.left],
+        right=DIFFICULTY_PRESETS[args.right],
+        dt=args.dt,
+        seed=args.seed,
+        swept=args.swept,
+    ).run()
+    print(
+        f"{result.matches} matches, {result.match_steps} match-steps in "
+        f"{result.wall_seconds:.2f}s: "
+        f"{result.steps_per_second:,.0f} steps/s, "
+        f"{result.matches_per_minute:,.0f} matches/min"
+    )
+
+
+def main(argv: list[str] | None = None):
+    """Run a headless benchmark and print its throughput."""
+    parser = argparse.ArgumentParser(prog="python -m deja_bounce.simulation")
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument(
+        "--left", choices=sorted(DIFFICULTY_PRESETS), default="normal"
+    )
+    parser.add_argument(
+        "--right", choices=sorted(DIFFICULTY_PRESETS), default="normal"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dt", type=float, default=DEFAULT_DT)
+    collisions = parser.add_mutually_exclusive_group()
+    collisions.add_argument(
+        "--swept",
+        action="store_const",
+        const=True,
+        help="use continuous collisions (the game's default)",
+    )
+    collisions.add_argument(
+        "--discrete",
+        action="store_const",
+        const=False,
+        dest="swept",
+        help="use per-step overlap checks instead",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="step all matches in lockstep with NumPy",
+    )
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        _run_batch(args)
+        return
+
+    report = run_benchmark(
+        args.matches,
+        left=DIFFICULTY_PRESETS[args.left],
+        right=DIFFICULTY_PRESETS[args.right],
+        seed=args.seed,
+        dt=args.dt,
+        swept=args.swept,
+    )
+    print(
+        f"{report.matches} matches, {report.steps} steps in "
+        f"{report.wall_seconds:.2f}s: "
+        f"{report.steps_per_second:,.0f} steps/s, "
+        f"{report.matches_per_minute:,.0f} matches/min"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+NumPy batched simulator: many independent matches stepped in lockstep.
+
+State is held as structure-of-arrays (one array per field, one slot per
+match) and the rules of SweptBallCollisionSystem (or BallWallBounceSystem
+and BallPaddleCollisionSystem), CpuPaddleController, ResetRallySystem,
+BallOutSystem and WinConditionSystem are expressed as vectorized
+operations, the ball rules through the kernels in deja_bounce.kernels.
+Given the same aim offsets and collision mode, every match follows the
+same trajectory as HeadlessMatch.
+
+Requires NumPy (``pip install deja-bounce[sim]``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Sequence, Union
+
+import numpy as np
+
+from deja_bounce.constants import (
+    BALL_SIZE,
+    BALL_VELOCITY,
+    PADDLE_MARGIN,
+    PADDLE_SIZE,
+    WINDOW_SIZE,
+)
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.kernels import (
+    InterceptCache,
+    PaddleBox,
+    Scratch,
+    bounce_walls,
+    collide_paddle,
+    score_points,
+    serve_balls,
+    sweep_balls,
+    take_out,
+)
+from deja_bounce.scenes.models import PongModel
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import (
+    BallPaddleCollisionSystem,
+    ResetRallySystem,
+    SweptBallCollisionSystem,
+)
+from deja_bounce.simulation.headless import DEFAULT_DT, DEFAULT_MAX_STEPS
+
+ConfigLike = Union[CpuConfig, Sequence[CpuConfig]]
+
+LEFT = 0
+RIGHT = 1
+
+# winner codes
+NO_WINNER = 0
+P1 = 1
+P2 = 2
+
+
+def _config_arrays(config: ConfigLike, n: int) -> tuple[np.ndarray, ...]:
+    """
+    Expand one CpuConfig (or one per match) into per-match arrays.
+
+    :return: (max_speed, dead_zone, reaction_distance, error_margin,
+        predict_intercept).
+    :rtype: tuple[np.ndarray, ...]
+
+    :raises ValueError: If a sequence of configs does not have n items.
+    """
+    configs = [config] * n if isinstance(config, CpuConfig) else config
+    if len(configs) != n:
+        raise ValueError(f"Expected {n} CpuConfig values, got {len(configs)}")
+    return tuple(
+        np.array([getattr(c, name) for c in configs], dtype=np.float64)
+        for name in (
+            "max_speed",
+            "dead_zone",
+            "reaction_distance",
+            "error_margin",
+            "predict_intercept",
+        )
+    )
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of a batch of matches, one slot per match.
+
+    :ivar winner (np.ndarray): 0 = unfinished, 1 = P1 (left), 2 = P2 (right).
+    :ivar score_left (np.ndarray): Final left score.
+    :ivar score_right (np.ndarray): Final right score.
+    :ivar steps (np.ndarray): Steps until the match was decided.
+    :ivar hits (np.ndarray): Paddle hits over the whole match.
+    :ivar dt (float): Fixed step size in seconds.
+    :ivar wall_seconds (float): Real time spent simulating.
+    """
+
+    winner: np.ndarray
+    score_left: np.ndarray
+    score_right: np.ndarray
+    steps: np.ndarray
+    hits: np.ndarray
+    dt: float
+    wall_seconds: float
+
+    @property
+    def matches(self) -> int:
+        """Number of matches in the batch."""
+        return len(self.winner)
+
+    @property
+    def match_steps(self) -> int:
+        """Total steps simulated across all matches."""
+        return int(self.steps.sum())
+
+    @property
+    def steps_per_second(self) -> float:
+        """Match-steps simulated per real second."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.match_steps / self.wall_seconds
+
+    @property
+    def matches_per_minute(self) -> float:
+        """Matches completed per real minute."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.matches * 60.0 / self.wall_seconds
+
+    @property
+    def mean_rally(self) -> np.ndarray:
+        """Mean paddle hits per point, per match."""
+        points = self.score_left + self.score_right
+        return self.hits / np.maximum(points, 1)
+
+
+# Justification: Structure-of-arrays state is one attribute per field,
+# and reset() (called from __init__) owns all of it.
+# pylint: disable=too-many-instance-attributes,attribute-defined-outside-init
+class BatchSimulator:
+    """
+    Steps N CPU-vs-CPU matches at once.
+
+    Paddle arrays have shape (2, N): row 0 is the left paddle, row 1 the
+    right. Finished matches are compacted away while the rest keep going.
+    """
+
+    # per-match state arrays, compacted together as matches finish
+    _STATE = (
+        "index",
+        "ball_x",
+        "ball_y",
+        "ball_vx",
+        "ball_vy",
+        "score_left",
+        "score_right",
+        "serve_direction",
+        "reset_rally",
+        "hits",
+    )
+    _PADDLE_STATE = (
+        "paddle_y",
+        "paddle_vy",
+        "paddle_dir",
+        "max_speed",
+        "dead_zone",
+        "reaction_distance",
+        "aim_offset",
+        "predict",
+    )
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        n: int,
+        left: ConfigLike | None = None,
+        right: ConfigLike | None = None,
+        dt: float = DEFAULT_DT,
+        winning_score: int | None = None,
+        size: tuple[int, int] = WINDOW_SIZE,
+        seed: int | None = None,
+        swept: bool | None = None,
+    ):
+        """
+        :param n: Number of matches in the batch.
+        :type n: int
+
+        :param left: Left CPU settings, shared or one per match.
+        :type left: CpuConfig | Sequence[CpuConfig], optional
+
+        :param right: Right CPU settings, shared or one per match.
+        :type right: CpuConfig | Sequence[CpuConfig], optional
+
+        :param dt: Fixed simulation step in seconds.
+        :type dt: float
+
+        :param winning_score: Points needed to win (PongModel default).
+        :type winning_score: int, optional
+
+        :param size: Playfield size (width, height).
+        :type size: tuple[int, int]
+
+        :param seed: Seed for the aim-offset generator.
+        :type seed: int, optional
+
+        :param swept: Use continuous ball collisions (defaults to
+            PongScene.swept_collisions, as in the game).
+        :type swept: bool, optional
+        """
+        self.n = n
+        self.dt = dt
+        self.swept = PongScene.swept_collisions if swept is None else swept
+        self.winning_score = (
+            PongModel.winning_score if winning_score is None else winning_score
+        )
+        self.width, self.height = size
+        self.rng = np.random.default_rng(seed)
+
+        self.paddle_w, self.paddle_h = PADDLE_SIZE
+        self.ball_size = BALL_SIZE
+        self.paddle_x = np.array(
+            [
+                float(PADDLE_MARGIN),
+                float(self.width - PADDLE_MARGIN - self.paddle_w),
+            ]
+        )[:, None]
+        self.wall_bottom = float(self.height - 2 * PongModel.wall_height)
+
+        normal = DIFFICULTY_PRESETS["normal"]
+        self._configs = [
+            _config_arrays(left or normal, n),
+            _config_arrays(right or normal, n),
+        ]
+        self.reset()
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def reset(self, aim_offsets: np.ndarray | None = None):
+        """
+        Put every match back to kickoff.
+
+        :param aim_offsets: (2, N) CPU aim errors; drawn uniformly from
+            [-error_margin, error_margin] when omitted.
+        :type aim_offsets: np.ndarray, optional
+        """
+        n = self.n
+        vx, vy = BALL_VELOCITY
+        self.index = np.arange(n)
+        self.ball_x = np.full(n, self.width / 2 - self.ball_size / 2)
+        self.ball_y = np.full(n, self.height / 2 - self.ball_size / 2)
+        self.ball_vx = np.full(n, vx)
+        self.ball_vy = np.full(n, vy)
+        self.score_left = np.zeros(n, dtype=np.int64)
+        self.score_right = np.zeros(n, dtype=np.int64)
+        self.serve_direction = np.zeros(n)
+        self.reset_rally = np.zeros(n, dtype=bool)
+        self.hits = np.zeros(n, dtype=np.int64)
+
+        self.paddle_y = np.full((2, n), self.height / 2 - self.paddle_h / 2)
+        self.paddle_vy = np.zeros((2, n))
+        self.paddle_dir = np.zeros((2, n))
+        speed, dead, reaction, margin, predict = (
+            np.stack(arrays) for arrays in zip(*self._configs)
+        )
+        self.max_speed = speed
+        self.dead_zone = dead
+        self.reaction_distance = reaction
+        self.predict = predict.astype(bool)
+        bottom = self.wall_bottom - self.ball_size
+        self.intercepts = [
+            InterceptCache(
+                n, self.paddle_x[LEFT, 0] + self.paddle_w, 0.0, bottom
+            ),
+            InterceptCache(
+                n, self.paddle_x[RIGHT, 0] - self.ball_size, 0.0, bottom
+            ),
+        ]
+        self._scratch = Scratch(n)
+        if aim_offsets is None:
+            aim_offsets = self.rng.uniform(-1.0, 1.0, size=(2, n)) * margin
+        self.aim_offset = np.array(aim_offsets, dtype=np.float64)
+
+        self.steps = 0
+        self.result_winner = np.zeros(n, dtype=np.int64)
+        self.result_left = np.zeros(n, dtype=np.int64)
+        self.result_right = np.zeros(n, dtype=np.int64)
+        self.result_steps = np.zeros(n, dtype=np.int64)
+        self.result_hits = np.zeros(n, dtype=np.int64)
+
+    @property
+    def active(self) -> int:
+        """Number of matches still being played."""
+        return len(self.index)
+
+    def _cpu(self, scratch: Scratch):
+        """Vectorized CpuPaddleController.update for both sides."""
+        size = self.ball_size
+        ball = (self.ball_x, self.ball_y, self.ball_vx, self.ball_vy)
+        distance = (
+            self.ball_x - (self.paddle_x[LEFT] + self.paddle_w),
+            self.paddle_x[RIGHT] - (self.ball_x + size),
+        )
+        approaching = (self.ball_vx < 0, self.ball_vx > 0)
+        for side in (LEFT, RIGHT):
+            tracking = approaching[side] & (
+                distance[side] <= self.reaction_distance[side]
+            )
+            target_y = self.ball_y
+            predict = self.predict[side]
+            if predict.any():
+                target_y = np.where(
+                    predict,
+                    self.intercepts[side].predict(
+                        ball, tracking & predict, scratch
+                    ),
+                    target_y,
+                )
+            ball_center = target_y + size / 2 + self.aim_offset[side]
+            diff = ball_center - (self.paddle_y[side] + self.paddle_h / 2)
+            act = tracking & (np.abs(diff) >= self.dead_zone[side])
+            self.paddle_dir[side] = np.where(
+                act, np.where(diff < 0, -1.0, 1.0), 0.0
+            )
+
+    def step(self):
+        """Advance every active match by one fixed step."""
+        dt = self.dt
+
+        # Paddle.update: move from last step's input, then clamp
+        self.paddle_vy = self.paddle_dir * self.max_speed
+        paddle_y = self.paddle_y + self.paddle_vy * dt
+        paddle_y = np.where(paddle_y < 0, 0.0, paddle_y)
+        self.paddle_y = np.where(
+            paddle_y + self.paddle_h > self.height,
+            float(self.height - self.paddle_h),
+            paddle_y,
+        )
+
+        size = self.ball_size
+        ball = (self.ball_x, self.ball_y, self.ball_vx, self.ball_vy)
+        scratch = self._scratch.head(self.active)
+        paddles = [
+            PaddleBox(
+                self.paddle_x[side],
+                self.paddle_y[side],
+                self.paddle_w,
+                self.paddle_h,
+                self.paddle_vy[side],
+                side == LEFT,
+            )
+            for side in (LEFT, RIGHT)
+        ]
+
+        if self.swept:
+            # Ball (KinematicEntity.update) and SweptBallCollisionSystem
+            self.hits += sweep_balls(
+                ball,
+                size,
+                paddles,
+                (0.0, self.wall_bottom),
+                dt,
+                SweptBallCollisionSystem,
+                scratch,
+            )
+        else:
+            # Ball (KinematicEntity.update)
+            self.ball_x += self.ball_vx * dt
+            self.ball_y += self.ball_vy * dt
+
+            # BallWallBounceSystem
+            bounce_walls(ball, size, 0.0, self.wall_bottom, scratch)
+
+            # BallPaddleCollisionSystem
+            for paddle in paddles:
+                hit = collide_paddle(
+                    ball, size, paddle, BallPaddleCollisionSystem, scratch
+                )
+                if hit is not None:
+                    self.hits += hit
+
+        # CpuPaddleControlSystem (left, right)
+        self._cpu(scratch)
+
+        # ResetRallySystem
+        rally = self.reset_rally
+        if rally.any():
+            serve_balls(
+                rally,
+                ball,
+                (self.width / 2 - size / 2, self.height / 2 - size / 2),
+                (
+                    ResetRallySystem.serve_vx * self.serve_direction[rally],
+                    ResetRallySystem.serve_vy,
+                ),
+            )
+
+        # BallOutSystem
+        score_points(
+            take_out(self.ball_x, 0, self.width, scratch),
+            (self.score_left, self.score_right),
+            self.serve_direction,
+            self.reset_rally,
+        )
+
+        self.steps += 1
+
+        # WinConditionSystem
+        p1 = self.score_left >= self.winning_score
+        p2 = ~p1 & (self.score_right >= self.winning_score)
+        done = p1 | p2
+        if done.any():
+            self._retire(done, np.where(p1, P1, P2))
+
+    def _retire(self, done: np.ndarray, winner: np.ndarray):
+        """Record results for finished matches and drop them from state."""
+        idx = self.index[done]
+        self.result_winner[idx] = winner[done]
+        self._record(done)
+        keep = ~done
+        for name in self._STATE:
+            setattr(self, name, getattr(self, name)[keep])
+        for name in self._PADDLE_STATE:
+            setattr(self, name, getattr(self, name)[:, keep])
+        for cache in self.intercepts:
+            cache.compact(keep)
+
+    def _record(self, mask: np.ndarray):
+        idx = self.index[mask]
+        self.result_left[idx] = self.score_left[mask]
+        self.result_right[idx] = self.score_right[mask]
+        self.result_steps[idx] = self.steps
+        self.result_hits[idx] = self.hits[mask]
+
+    def run(self, max_steps: int = DEFAULT_MAX_STEPS) -> BatchResult:
+        """
+        Step until every match is decided or max_steps is reached.
+
+        :param max_steps: Upper bound on simulated steps.
+        :type max_steps: int
+
+        :return: Per-match outcomes.
+        :rtype: BatchResult
+        """
+        start = perf_counter()
+        while self.active and self.steps < max_steps:
+            self.step()
+        if self.active:
+            self._record(np.ones(self.active, dtype=bool))
+        wall_seconds = perf_counter() - start
+
+        return BatchResult(
+            winner=self.result_winner.copy(),
+            score_left=self.result_left.copy(),
+            score_right=self.result_right.copy(),
+            steps=self.result_steps.copy(),
+            hits=self.result_hits.copy(),
+            dt=self.dt,
+            wall_seconds=wall_seconds,
+        )
+
+
+# pylint: enable=too-many-instance-attributes,attribute-defined-outside-init
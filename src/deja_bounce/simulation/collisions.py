@@ -0,0 +1,261 @@
+"""
+Broadphase benchmark: collision time per frame as the body count grows.
+
+Moves `n` ball-sized bodies plus the two paddles around the field and
+finds every touching pair each frame, either through the UniformGrid
+broadphase or by testing all pairs. In the window-sized field real
+contacts grow with the square of the body count; --spread grows the field
+with the body count instead, so density (and contacts per body) stay put
+and only the cost of finding them is compared.
+
+Usage:
+    python -m deja_bounce.simulation.collisions
+    python -m deja_bounce.simulation.collisions --bodies 64 256 1024 4096
+    python -m deja_bounce.simulation.collisions --spread
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from dataclasses import dataclass
+from time import perf_counter
+from typing import List
+
+from deja_bounce.broadphase import UniformGrid
+from deja_bounce.constants import (
+    BALL_SIZE,
+    PADDLE_MARGIN,
+    PADDLE_SIZE,
+    WINDOW_SIZE,
+)
+from deja_bounce.physics import Rect, overlaps
+
+DEFAULT_BODIES = (16, 64, 256, 1024, 4096)
+DEFAULT_FRAMES = 60
+BRUTE_FORCE_LIMIT = 1024  # all-pairs gets too slow to wait for past this
+SPREAD_BODIES = 256  # --spread keeps the density of this many in the window
+
+
+@dataclass
+class CollisionTiming:
+    """
+    Collision cost for one body count.
+
+    :ivar bodies (int): Moving bodies (the paddles not included).
+    :ivar frames (int): Frames timed.
+    :ivar pairs (float): Touching pairs found per frame, on average.
+    :ivar grid_ms (float): Milliseconds per frame with the grid.
+    :ivar brute_ms (float | None): Milliseconds per frame testing all pairs,
+        or None if skipped.
+    """
+
+    bodies: int
+    frames: int
+    pairs: float
+    grid_ms: float
+    brute_ms: float | None = None
+
+    @property
+    def grid_us_per_body(self) -> float:
+        """Microseconds of grid collision work per body per frame."""
+        return self.grid_ms * 1000.0 / (self.bodies + 2)
+
+
+class _Field:
+    """Bodies bouncing around the window, moved one fixed step at a time."""
+
+    def __init__(self, bodies: int, seed: int, spread: bool = False):
+        rng = random.Random(seed)
+        width, height = WINDOW_SIZE
+        if spread:
+            scale = max(1.0, (bodies / SPREAD_BODIES) ** 0.5)
+            width, height = int(width * scale), int(height * scale)
+        pad_w, pad_h = PADDLE_SIZE
+        top = (height - pad_h) / 2
+        self.width = width
+        self.height = height
+        # Paddles first, as in scene.bodies; they stay put
+        self.rects: List[Rect] = [
+            (PADDLE_MARGIN, top, pad_w, pad_h),
+            (width - PADDLE_MARGIN - pad_w, top, pad_w, pad_h),
+        ]
+        self.velocity = [(0.0, 0.0), (0.0, 0.0)]
+        for _ in range(bodies):
+            self.rects.append(
+                (
+                    rng.uniform(0, width - BALL_SIZE),
+                    rng.uniform(0, height - BALL_SIZE),
+                    BALL_SIZE,
+                    BALL_SIZE,
+                )
+            )
+            self.velocity.append(
+                (rng.uniform(-300.0, 300.0), rng.uniform(-300.0, 300.0))
+            )
+
+    def step(self, dt: float):
+        """Advance every ball, bouncing off the window edges."""
+        max_x = self.width - BALL_SIZE
+        max_y = self.height - BALL_SIZE
+        rects = self.rects
+        velocity = self.velocity
+        for i in range(2, len(rects)):
+            x, y, w, h = rects[i]
+            vx, vy = velocity[i]
+            x += vx * dt
+            y += vy * dt
+            if not 0 <= x <= max_x:
+                vx = -vx
+                x = min(max(x, 0.0), max_x)
+            if not 0 <= y <= max_y:
+                vy = -vy
+                y = min(max(y, 0.0), max_y)
+            rects[i] = (x, y, w, h)
+            velocity[i] = (vx, vy)
+
+
+def _grid_frames(field: _Field, frames: int, cell_size: float):
+    grid: UniformGrid[int] = UniformGrid(cell_size)
+    for i, rect in enumerate(field.rects):
+        grid.insert(i, rect)
+    elapsed = 0.0
+    pairs = 0
+    for _ in range(frames):
+        field.step(1.0 / 60)
+        start = perf_counter()
+        for i, rect in enumerate(field.rects):
+            grid.move(i, rect)
+        pairs += sum(1 for _ in grid.overlapping_pairs())
+        elapsed += perf_counter() - start
+    return elapsed, pairs
+
+
+def _brute_frames(field: _Field, frames: int):
+    elapsed = 0.0
+    pairs = 0
+    for _ in range(frames):
+        field.step(1.0 / 60)
+        start = perf_counter()
+        rects = field.rects
+        n = len(rects)
+        for i in range(n - 1):
+            a = rects[i]
+            for j in range(i + 1, n):
+                if overlaps(a, rects[j]):
+                    pairs += 1
+        elapsed += perf_counter() - start
+    return elapsed, pairs
+
+
+# Justification: Each benchmark knob is independent
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def measure(
+    bodies: int,
+    frames: int = DEFAULT_FRAMES,
+    cell_size: float = 2 * BALL_SIZE,
+    brute: bool = True,
+    seed: int = 0,
+    spread: bool = False,
+) -> CollisionTiming:
+    """
+    Time the collision pass for `bodies` moving balls plus two paddles.
+
+    Both modes replay the same seeded motion, so they report the same pairs.
+
+    :param bodies: Number of moving balls.
+    :type bodies: int
+
+    :param frames: Frames to time.
+    :type frames: int
+
+    :param cell_size: Grid cell size.
+    :type cell_size: float
+
+    :param brute: Also time testing all pairs.
+    :type brute: bool
+
+    :param seed: Seed for the starting positions and velocities.
+    :type seed: int
+
+    :param spread: Grow the field with the body count (constant density).
+    :type spread: bool
+
+    :return: Per-frame timings.
+    :rtype: CollisionTiming
+    """
+    grid_s, pairs = _grid_frames(
+        _Field(bodies, seed, spread), frames, cell_size
+    )
+    timing = CollisionTiming(
+        bodies=bodies,
+        frames=frames,
+        pairs=pairs / frames,
+        grid_ms=grid_s * 1000.0 / frames,
+    )
+    if brute:
+        brute_s, brute_pairs = _brute_frames(
+            _Field(bodies, seed, spread), frames
+        )
+        if brute_pairs != pairs:
+            raise RuntimeError("grid and all-pairs found different pairs")
+        timing.brute_ms = brute_s * 1000.0 / frames
+    return timing
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def main(argv: list[str] | None = None):
+    """Print collision time per frame for a range of body counts."""
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.simulation.collisions"
+    )
+    parser.add_argument(
+        "--bodies", type=int, nargs="+", default=list(DEFAULT_BODIES)
+    )
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--cell", type=float, default=2 * BALL_SIZE)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--spread",
+        action="store_true",
+        help="grow the field with the body count (constant density)",
+    )
+    parser.add_argument(
+        "--brute-limit",
+        type=int,
+        default=BRUTE_FORCE_LIMIT,
+        help="largest body count to also time with all-pairs checks",
+    )
+    args = parser.parse_args(argv)
+
+    field = (
+        f"field at the density of {SPREAD_BODIES} bodies in the window"
+        if args.spread
+        else f"{WINDOW_SIZE[0]}x{WINDOW_SIZE[1]} field"
+    )
+    print(f"{field}, {args.cell:g}px cells, {args.frames} frames")
+    print(
+        f"{'bodies':>7} {'pairs':>8} {'grid ms':>9} {'us/body':>8} "
+        f"{'all-pairs ms':>13}"
+    )
+    for bodies in args.bodies:
+        timing = measure(
+            bodies,
+            args.frames,
+            args.cell,
+            brute=bodies <= args.brute_limit,
+            seed=args.seed,
+            spread=args.spread,
+        )
+        brute = "-" if timing.brute_ms is None else f"{timing.brute_ms:.3f}"
+        print(
+            f"{timing.bodies:>7} {timing.pairs:>8.1f} "
+            f"{timing.grid_ms:>9.3f} {timing.grid_us_per_body:>8.2f} "
+            f"{brute:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,464 @@
+"""
+Vectorized Pong environment for training paddle agents.
+
+Runs N independent matches in lockstep, Gym style: reset() and step()
+take and return whole batches. The agent plays the left paddle against a
+CPU opponent, or both paddles when there is no opponent. An action sets
+the paddle's moving_up/moving_down flags: 0 stops, 1 moves up, 2 moves
+down.
+
+The rules follow the systems PongScene runs, in the same order:
+Paddle.update, SweptBallCollisionSystem (or BallWallBounceSystem and
+BallPaddleCollisionSystem when the game's swept collisions are off), with
+_apply_paddle_influence and its tuning constants, CpuPaddleControlSystem,
+ResetRallySystem, BallOutSystem and WinConditionSystem, the ball rules
+through the kernels in deja_bounce.kernels. The arithmetic is done in the
+same order and precision, so a policy sees the same trajectories it will
+meet in the game.
+
+All state lives in preallocated arrays updated in place, and the
+observation is a view of that state: step() returns the same array every
+time, so copy it to keep an old observation.
+
+Requires NumPy (``pip install deja-bounce[sim]``).
+
+Usage:
+    python -m deja_bounce.simulation.env --envs 4096 --steps 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+from time import perf_counter
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from deja_bounce.constants import (
+    BALL_SIZE,
+    BALL_VELOCITY,
+    PADDLE_MARGIN,
+    PADDLE_SIZE,
+    WINDOW_SIZE,
+)
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.entities.paddle import PaddleConfig
+from deja_bounce.kernels import (
+    InterceptCache,
+    PaddleBox,
+    Scratch,
+    bounce_walls,
+    collide_paddle,
+    score_points,
+    serve_balls,
+    sweep_balls,
+    take_out,
+)
+from deja_bounce.scenes.models import PongModel
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import (
+    BallPaddleCollisionSystem,
+    ResetRallySystem,
+    SweptBallCollisionSystem,
+)
+from deja_bounce.simulation.headless import DEFAULT_DT, DEFAULT_MAX_STEPS
+
+# Observation columns
+OBS_FIELDS = (
+    "ball_x",
+    "ball_y",
+    "ball_vx",
+    "ball_vy",
+    "left_y",
+    "left_vy",
+    "right_y",
+    "right_vy",
+    "score_left",
+    "score_right",
+)
+STOP = 0
+UP = 1
+DOWN = 2
+
+StepResult = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]
+
+
+# Justification: Preallocated state and scratch arrays, one per field, so
+# step() never allocates.
+# pylint: disable=too-many-instance-attributes
+class VecPongEnv:
+    """
+    N Pong matches stepped together.
+
+    Observations have shape (N, len(OBS_FIELDS)), in game units (pixels,
+    pixels per second, points). Rewards are from the left paddle's side:
+    +1 when it scores, -1 when it concedes. A match that is won is
+    terminated, one that reaches max_steps is truncated, and either is
+    reset in the same step() call: the returned observation is then the
+    new match, with the last one in info["final_observation"].
+
+    :ivar num_envs (int): Matches in the batch.
+    :ivar opponent (CpuConfig | None): CPU settings for the right paddle,
+        or None if the agent plays both paddles.
+    :ivar dt (float): Fixed step in seconds.
+    :ivar max_steps (int): Steps before a match is truncated.
+    :ivar swept (bool): Whether ball collisions are continuous.
+    :ivar observations (np.ndarray): The (N, fields) observation array,
+        updated in place by every step.
+    """
+
+    # Justification: Each environment setting is independent
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        num_envs: int,
+        opponent: CpuConfig | None = DIFFICULTY_PRESETS["normal"],
+        dt: float = DEFAULT_DT,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        winning_score: int | None = None,
+        seed: int | None = None,
+        swept: bool | None = None,
+    ):
+        """
+        :param num_envs: Matches in the batch.
+        :type num_envs: int
+
+        :param opponent: CPU settings for the right paddle; None lets the
+            agent play both paddles (actions of shape (N, 2)).
+        :type opponent: CpuConfig, optional
+
+        :param dt: Fixed step in seconds.
+        :type dt: float
+
+        :param max_steps: Steps before a match is truncated.
+        :type max_steps: int
+
+        :param winning_score: Points needed to win (PongModel default).
+        :type winning_score: int, optional
+
+        :param seed: Seed for the CPU opponent's aim errors.
+        :type seed: int, optional
+
+        :param swept: Use continuous ball collisions (defaults to
+            PongScene.swept_collisions, so agents train on the game's
+            physics).
+        :type swept: bool, optional
+        """
+        n = num_envs
+        self.num_envs = n
+        self.opponent = opponent
+        self.dt = dt
+        self.max_steps = max_steps
+        self.swept = PongScene.swept_collisions if swept is None else swept
+        self.winning_score = (
+            PongModel.winning_score if winning_score is None else winning_score
+        )
+        self.rng = np.random.default_rng(seed)
+
+        width, height = WINDOW_SIZE
+        self.width = float(width)
+        self.height = float(height)
+        self.paddle_w, self.paddle_h = PADDLE_SIZE
+        self.ball_size = BALL_SIZE
+        self.left_x = float(PADDLE_MARGIN)
+        self.right_x = float(width - PADDLE_MARGIN - self.paddle_w)
+        self.wall_bottom = float(height - 2 * PongModel.wall_height)
+
+        # Rows are fields, so each field is contiguous; the observation is
+        # the transposed (N, fields) view of the same memory
+        self._state = np.zeros((len(OBS_FIELDS), n))
+        self.observations = self._state.T
+        rows = self._state
+        self.ball_x, self.ball_y, self.ball_vx, self.ball_vy = rows[:4]
+        self.paddle_y = rows[4:8:2]  # (2, N): left, right
+        self.paddle_vy = rows[5:8:2]
+        self.score_left, self.score_right = rows[8:10]
+
+        self.paddle_dir = np.zeros((2, n))
+        self.paddle_speed = np.full((2, n), PaddleConfig.speed)
+        if opponent is not None:
+            self.paddle_speed[1] = opponent.max_speed
+        self.aim_offset = np.zeros(n)
+        self.serve_direction = np.zeros(n)
+        self.reset_rally = np.zeros(n, dtype=bool)
+        self.steps = np.zeros(n, dtype=np.int64)
+
+        self.rewards = np.zeros(n)
+        self.terminated = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+        self._action_dir = np.array([0.0, -1.0, 1.0])
+        # Kernel views of the state rows
+        self._ball = (self.ball_x, self.ball_y, self.ball_vx, self.ball_vy)
+        self._paddles = [
+            PaddleBox(
+                x,
+                self.paddle_y[side],
+                self.paddle_w,
+                self.paddle_h,
+                self.paddle_vy[side],
+                side == 0,
+            )
+            for side, x in enumerate((self.left_x, self.right_x))
+        ]
+        self._scratch = Scratch(n)
+        self._intercept = InterceptCache(
+            n,
+            self.right_x - self.ball_size,
+            0.0,
+            self.wall_bottom - self.ball_size,
+        )
+        self._tmp = np.zeros(n)
+        self._tmp2 = np.zeros(n)
+        self._act = np.zeros(n, dtype=bool)
+        self._mask = np.zeros(n, dtype=bool)
+        self._all = np.ones(n, dtype=bool)
+        self._target = np.zeros(n)
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        """
+        Put every match back to kickoff.
+
+        :param seed: Reseed the opponent's aim errors.
+        :type seed: int, optional
+
+        :return: The observation array.
+        :rtype: np.ndarray
+        """
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._reset(self._all)
+        return self.observations
+
+    def _reset(self, mask: np.ndarray):
+        """Kickoff state for the matches in `mask` (CpuPaddleController.reset
+        and HeadlessPongScene.reset_match)."""
+        vx, vy = BALL_VELOCITY
+        self.ball_x[mask] = self.width / 2 - self.ball_size / 2
+        self.ball_y[mask] = self.height / 2 - self.ball_size / 2
+        self.ball_vx[mask] = vx
+        self.ball_vy[mask] = vy
+        self.paddle_y[:, mask] = self.height / 2 - self.paddle_h / 2
+        self.paddle_vy[:, mask] = 0.0
+        self.paddle_dir[:, mask] = 0.0
+        self.score_left[mask] = 0.0
+        self.score_right[mask] = 0.0
+        self.serve_direction[mask] = 0.0
+        self.reset_rally[mask] = False
+        self.steps[mask] = 0
+        self._intercept.invalidate(mask)
+        if self.opponent is not None:
+            margin = self.opponent.error_margin
+            count = int(np.count_nonzero(mask))
+            self.aim_offset[mask] = (
+                self.rng.uniform(-margin, margin, count) if margin > 0 else 0.0
+            )
+
+    def _move_paddles(self):
+        """Paddle.update: velocity from the input flags, move, clamp."""
+        vy = self.paddle_vy
+        np.multiply(self.paddle_dir, self.paddle_speed, out=vy)
+        y = self.paddle_y
+        y += vy * self.dt
+        # Paddle.vy keeps the unclamped velocity, as in the game
+        np.clip(y, 0.0, self.height - self.paddle_h, out=y)
+
+    def _move_ball(self):
+        """KinematicEntity.update for the ball and the collision systems."""
+        dt = self.dt
+        size = self.ball_size
+        scratch = self._scratch
+        if self.swept:
+            sweep_balls(
+                self._ball,
+                size,
+                self._paddles,
+                (0.0, self.wall_bottom),
+                dt,
+                SweptBallCollisionSystem,
+                scratch,
+            )
+            return
+        self.ball_x += np.multiply(self.ball_vx, dt, out=self._tmp)
+        self.ball_y += np.multiply(self.ball_vy, dt, out=self._tmp)
+        bounce_walls(self._ball, size, 0.0, self.wall_bottom, scratch)
+        for paddle in self._paddles:
+            collide_paddle(
+                self._ball, size, paddle, BallPaddleCollisionSystem, scratch
+            )
+
+    def _cpu(self, config: CpuConfig):
+        """CpuPaddleController.update for the right paddle."""
+        size = self.ball_size
+        act = self._act
+        mask = self._mask
+        tmp = self._tmp
+        np.greater(self.ball_vx, 0.0, out=act)
+        # distance_x = px - (ball_x + size) <= reaction_distance
+        np.add(self.ball_x, size, out=tmp)
+        np.subtract(self.right_x, tmp, out=tmp)
+        np.less_equal(tmp, config.reaction_distance, out=mask)
+        act &= mask
+
+        target = self._target
+        np.copyto(
+            target,
+            (
+                self._intercept.predict(self._ball, act, self._scratch)
+                if config.predict_intercept
+                else self.ball_y
+            ),
+        )
+        # diff = (target + size / 2 + aim) - (paddle_y + paddle_h / 2)
+        target += size / 2
+        target += self.aim_offset
+        diff = np.subtract(
+            target,
+            np.add(self.paddle_y[1], self.paddle_h / 2, out=tmp),
+            out=tmp,
+        )
+        np.greater_equal(
+            np.abs(diff, out=self._tmp2), config.dead_zone, out=mask
+        )
+        act &= mask
+        direction = self.paddle_dir[1]
+        np.sign(diff, out=direction)
+        np.copyto(direction, 0.0, where=np.logical_not(act, out=mask))
+
+    def _serve(self):
+        """ResetRallySystem for matches that had a point scored last step."""
+        rally = self.reset_rally
+        if not rally.any():
+            return
+        size = self.ball_size
+        serve_balls(
+            rally,
+            self._ball,
+            (self.width / 2 - size / 2, self.height / 2 - size / 2),
+            (
+                ResetRallySystem.serve_vx * self.serve_direction[rally],
+                ResetRallySystem.serve_vy,
+            ),
+        )
+
+    def _score(self):
+        """BallOutSystem, then WinConditionSystem."""
+        out = take_out(self.ball_x, 0.0, self.width, self._scratch)
+        score_points(
+            out,
+            (self.score_left, self.score_right),
+            self.serve_direction,
+            self.reset_rally,
+        )
+        out_left, out_right = out
+        np.subtract(out_right, out_left, out=self.rewards, dtype=np.float64)
+
+        np.greater_equal(self.score_left, self.winning_score, out=self._mask)
+        np.greater_equal(
+            self.score_right, self.winning_score, out=self.terminated
+        )
+        self.terminated |= self._mask
+
+    def step(self, actions: Any) -> StepResult:
+        """
+        Apply one action per paddle the agent controls and advance every
+        match by one fixed step.
+
+        :param actions: (N,) action codes for the left paddle, or (N, 2)
+            for both paddles when there is no opponent.
+        :type actions: np.ndarray
+
+        :return: (observations, rewards, terminated, truncated, info). The
+            arrays are reused by the next step.
+        :rtype: StepResult
+        """
+        actions = np.asarray(actions)
+        if self.opponent is None:
+            np.take(self._action_dir, actions.T, out=self.paddle_dir)
+        else:
+            np.take(self._action_dir, actions, out=self.paddle_dir[0])
+
+        # Entities: paddles from last step's input, then the ball
+        self._move_paddles()
+        self._move_ball()
+        if self.opponent is not None:
+            self._cpu(self.opponent)
+        self._serve()
+        self._score()
+
+        self.steps += 1
+        np.greater_equal(self.steps, self.max_steps, out=self.truncated)
+        self.truncated &= ~self.terminated
+        done = np.logical_or(self.terminated, self.truncated, out=self._mask)
+        info: Dict[str, Any] = {}
+        if done.any():
+            info["final_observation"] = self.observations[done].copy()
+            info["done"] = done.copy()
+            self._reset(done)
+        return (
+            self.observations,
+            self.rewards,
+            self.terminated,
+            self.truncated,
+            info,
+        )
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+def benchmark(
+    num_envs: int, steps: int, seed: int | None = 0
+) -> Tuple[float, float]:
+    """
+    Step `num_envs` matches with random actions against a "normal" CPU.
+
+    :param num_envs: Matches in the batch.
+    :type num_envs: int
+
+    :param steps: Steps to time.
+    :type steps: int
+
+    :param seed: Seed for the actions and the opponent.
+    :type seed: int, optional
+
+    :return: (env-steps per second, mean reward per match).
+    :rtype: Tuple[float, float]
+    """
+    env = VecPongEnv(num_envs, seed=seed)
+    env.reset()
+    # A fixed table of random actions, so drawing them is not timed
+    table = np.random.default_rng(seed).integers(0, 3, (64, num_envs))
+    total = 0.0
+    start = perf_counter()
+    for i in range(steps):
+        _, rewards, _, _, _ = env.step(table[i % 64])
+        total += rewards.sum()
+    elapsed = perf_counter() - start
+    return num_envs * steps / elapsed, total / num_envs
+
+
+def main(argv: list[str] | None = None):
+    """Print env-steps per second for a range of batch sizes."""
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.simulation.env"
+    )
+    parser.add_argument(
+        "--envs", type=int, nargs="+", default=[256, 1024, 4096, 16384]
+    )
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    print(f"{'envs':>7} {'env-steps/s':>13} {'us/batch':>9}")
+    for num_envs in args.envs:
+        rate, _ = benchmark(num_envs, args.steps, args.seed)
+        print(
+            f"{num_envs:>7} {rate:>13,.0f} " f"{num_envs / rate * 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
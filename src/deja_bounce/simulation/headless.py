@@ -0,0 +1,401 @@
+"""
+Headless fixed-timestep simulation of Pong matches.
+
+Drives the same gameplay systems PongScene wires up, without a window,
+backend or frame limiter, so matches run as fast as the CPU allows.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import List, Optional
+
+from mini_arcade_core import Game, GameConfig
+from mini_arcade_core.backend import Backend
+
+from deja_bounce.backends import HeadlessBackend
+from deja_bounce.constants import FPS, WINDOW_SIZE
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.replay import new_seed
+from deja_bounce.scenes.models import Player, ScoreState
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import CpuPaddleControlSystem
+
+DEFAULT_DT = 1.0 / FPS
+DEFAULT_MAX_STEPS = FPS * 60 * 10  # ten simulated minutes
+
+
+def make_headless_game(
+    size: tuple[int, int] = WINDOW_SIZE,
+    fps: int = FPS,
+    backend: Backend | None = None,
+) -> Game:
+    """
+    Build a Game backed by HeadlessBackend (or another windowless backend).
+
+    :param size: Window size (width, height) the scenes will see.
+    :type size: tuple[int, int]
+
+    :param fps: Nominal frames per second.
+    :type fps: int
+
+    :param backend: Backend to use instead of HeadlessBackend, e.g. a
+        RasterBackend to draw frames.
+    :type backend: Backend, optional
+
+    :return: A Game that can host scenes without opening a window.
+    :rtype: Game
+    """
+    width, height = size
+    config = GameConfig(
+        width=width,
+        height=height,
+        title="DejaBounce (headless)",
+        fps=fps,
+        backend=backend if backend is not None else HeadlessBackend(),
+    )
+    return Game(config)
+
+
+# pylint: disable=too-many-instance-attributes
+class HeadlessPongScene(PongScene):
+    """
+    PongScene variant with two CPU paddles and no input, overlays or cheats.
+
+    Only the rule systems are registered, and the sorted system list is
+    cached so each step is a straight loop over entities and systems.
+    """
+
+    record_replays = False
+    rewind_seconds = 0.0
+
+    def __init__(
+        self,
+        game: Game,
+        left_config: CpuConfig,
+        right_config: CpuConfig,
+        swept: bool | None = None,
+    ):
+        """
+        :param game: The game instance.
+        :type game: Game
+
+        :param left_config: CPU settings for the left paddle.
+        :type left_config: CpuConfig
+
+        :param right_config: CPU settings for the right paddle.
+        :type right_config: CpuConfig
+
+        :param swept: Use continuous ball collisions (safe for large dt);
+            defaults to PongScene.swept_collisions, as in the game.
+        :type swept: bool, optional
+        """
+        self.left_config = left_config
+        self.right_config = right_config
+        if swept is not None:
+            self.swept_collisions = swept
+        super().__init__(game)
+        self._initial_state = [
+            (
+                ent,
+                ent.position.x,
+                ent.position.y,
+                ent.velocity.vx,
+                ent.velocity.vy,
+            )
+            for ent in (self.left_paddle, self.right_paddle, self.ball)
+        ]
+        self._entities = []
+        self._systems = []
+        self._controllers = []
+
+    def on_enter(self):
+        self.services.entities.add(
+            self.left_paddle, self.right_paddle, self.ball
+        )
+        left_cpu = CpuPaddleControlSystem(
+            self, side="LEFT", config=self.left_config, rng=self.rng
+        )
+        right_cpu = CpuPaddleControlSystem(
+            self, side="RIGHT", config=self.right_config, rng=self.rng
+        )
+        self.services.systems.add(left_cpu)
+        self.services.systems.add(right_cpu)
+        self._add_rule_systems()
+        self._systems_on_enter()
+
+        self._entities = list(self.services.entities)
+        self._systems = [
+            system
+            for system in self.services.systems.sorted()
+            if getattr(system, "enabled", True)
+        ]
+        self._controllers = [
+            left_cpu.sync_controller(),
+            right_cpu.sync_controller(),
+        ]
+
+    def on_exit(self):
+        return
+
+    def reset_match(self, seed: int):
+        """
+        Put paddles, ball and score back to kickoff and reseed the CPUs.
+
+        :param seed: Seed for the CPU aim errors of this match.
+        :type seed: int
+        """
+        for ent, x, y, vx, vy in self._initial_state:
+            ent.position.x = x
+            ent.position.y = y
+            ent.velocity.vx = vx
+            ent.velocity.vy = vy
+        self.model.score = ScoreState()
+        self.model.reset_rally = False
+        self.model.reset_rally_direction = None
+        self.model.winner = None
+        self.rng.seed(seed)
+        for controller in self._controllers:
+            controller.reset()
+
+    def update(self, dt: float):
+        for ent in self._entities:
+            ent.update(dt)
+        for system in self._systems:
+            system.update(dt)
+
+
+@dataclass
+class MatchResult:
+    """
+    Outcome of one headless match.
+
+    :ivar seed (int): Seed the match was played with.
+    :ivar winner (Optional[Player]): Winner, or None if max_steps ran out.
+    :ivar score (ScoreState): Final score.
+    :ivar steps (int): Number of fixed steps simulated.
+    :ivar dt (float): Fixed step size in seconds.
+    :ivar rallies (List[int]): Paddle hits in each completed point.
+    :ivar wall_seconds (float): Real time spent simulating.
+    """
+
+    seed: int
+    winner: Optional[Player]
+    score: ScoreState
+    steps: int
+    dt: float
+    rallies: List[int] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def sim_seconds(self) -> float:
+        """Simulated game time in seconds."""
+        return self.steps * self.dt
+
+    @property
+    def steps_per_second(self) -> float:
+        """Simulation throughput in steps per real second."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.steps / self.wall_seconds
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+class HeadlessMatch:
+    """
+    Plays CPU-vs-CPU matches on a reusable headless scene.
+
+    The scene is built once; every run() resets it, so playing thousands
+    of matches costs no per-match setup beyond a reseed.
+    """
+
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    def __init__(
+        self,
+        left: CpuConfig | None = None,
+        right: CpuConfig | None = None,
+        dt: float = DEFAULT_DT,
+        winning_score: int | None = None,
+        size: tuple[int, int] = WINDOW_SIZE,
+        swept: bool | None = None,
+    ):
+        """
+        :param left: CPU settings for the left paddle (default "normal").
+        :type left: CpuConfig, optional
+
+        :param right: CPU settings for the right paddle (default "normal").
+        :type right: CpuConfig, optional
+
+        :param dt: Fixed simulation step in seconds.
+        :type dt: float
+
+        :param winning_score: Points needed to win (model default if None).
+        :type winning_score: int, optional
+
+        :param size: Playfield size (width, height).
+        :type size: tuple[int, int]
+
+        :param swept: Use continuous ball collisions (safe for large dt);
+            defaults to the game's setting.
+        :type swept: bool, optional
+        """
+        self.dt = dt
+        self.scene = HeadlessPongScene(
+            make_headless_game(size),
+            left_config=left or DIFFICULTY_PRESETS["normal"],
+            right_config=right or DIFFICULTY_PRESETS["normal"],
+            swept=swept,
+        )
+        if winning_score is not None:
+            self.scene.model.winning_score = winning_score
+        self.scene.on_enter()
+
+    # pylint: enable=too-many-arguments,too-many-positional-arguments
+
+    # Justification: Hot loop keeps its state in locals on purpose
+    # pylint: disable=too-many-locals
+    def run(
+        self,
+        seed: int | None = None,
+        max_steps: int = DEFAULT_MAX_STEPS,
+    ) -> MatchResult:
+        """
+        Play one match to completion (or until max_steps).
+
+        :param seed: Seed for the match; a fresh one is drawn if None.
+        :type seed: int, optional
+
+        :param max_steps: Upper bound on simulated steps.
+        :type max_steps: int
+
+        :return: The match outcome.
+        :rtype: MatchResult
+        """
+        if seed is None:
+            seed = new_seed()
+        scene = self.scene
+        scene.reset_match(seed)
+
+        model = scene.model
+        score = model.score
+        velocity = scene.ball.velocity
+        update = scene.update
+        dt = self.dt
+
+        rallies: List[int] = []
+        hits = 0
+        points = 0
+        steps = 0
+        moving_right = velocity.vx > 0
+
+        start = perf_counter()
+        while model.winner is None and steps < max_steps:
+            serving = model.reset_rally
+            update(dt)
+            steps += 1
+
+            now_right = velocity.vx > 0
+            total = score.left + score.right
+            if total != points:
+                rallies.append(hits)
+                hits = 0
+                points = total
+            elif now_right != moving_right and not serving:
+                hits += 1
+            moving_right = now_right
+        wall_seconds = perf_counter() - start
+
+        return MatchResult(
+            seed=seed,
+            winner=model.winner,
+            score=ScoreState(score.left, score.right),
+            steps=steps,
+            dt=dt,
+            rallies=rallies,
+            wall_seconds=wall_seconds,
+        )
+
+    # pylint: enable=too-many-locals
+
+
+@dataclass
+class BenchmarkReport:
+    """
+    Aggregate throughput of a batch of headless matches.
+
+    :ivar matches (int): Matches played.
+    :ivar steps (int): Total fixed steps simulated.
+    :ivar wall_seconds (float): Real time spent simulating.
+    """
+
+    matches: int
+    steps: int
+    wall_seconds: float
+
+    @property
+    def steps_per_second(self) -> float:
+        """Simulation throughput in steps per real second."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.steps / self.wall_seconds
+
+    @property
+    def matches_per_minute(self) -> float:
+        """Matches completed per real minute."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.matches * 60.0 / self.wall_seconds
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def run_benchmark(
+    matches: int,
+    left: CpuConfig | None = None,
+    right: CpuConfig | None = None,
+    seed: int | None = None,
+    dt: float = DEFAULT_DT,
+    swept: bool | None = None,
+) -> BenchmarkReport:
+    """
+    Play a number of matches back to back and report throughput.
+
+    :param matches: How many matches to play.
+    :type matches: int
+
+    :param left: CPU settings for the left paddle.
+    :type left: CpuConfig, optional
+
+    :param right: CPU settings for the right paddle.
+    :type right: CpuConfig, optional
+
+    :param seed: Base seed; match i uses seed + i.
+    :type seed: int, optional
+
+    :param dt: Fixed simulation step in seconds.
+    :type dt: float
+
+    :param swept: Use continuous ball collisions (safe for large dt);
+        defaults to the game's setting.
+    :type swept: bool, optional
+
+    :return: Aggregate throughput figures.
+    :rtype: BenchmarkReport
+    """
+    runner = HeadlessMatch(left, right, dt=dt, swept=swept)
+    base = new_seed() if seed is None else seed
+    steps = 0
+    wall_seconds = 0.0
+    for i in range(matches):
+        result = runner.run(seed=base + i)
+        steps += result.steps
+        wall_seconds += result.wall_seconds
+    return BenchmarkReport(
+        matches=matches, steps=steps, wall_seconds=wall_seconds
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
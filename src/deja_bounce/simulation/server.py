@@ -0,0 +1,564 @@
+"""
+Multi-match server: many concurrent matches per process, one process per
+core.
+
+Each worker process (a shard) owns one headless Game and steps every
+match it hosts once per tick in a single fixed-rate loop. Finished
+matches hand their scene back to a pool and the next match with the
+same CPU settings reuses it, so starting a match costs a reset, not a
+Game, backend and scene. The MatchServer keeps a queue of matches
+waiting to start. It places each one on the shard with the most
+headroom, judged from the tick time each shard reports. Shards near
+their tick budget get no new matches until some of theirs finish.
+
+Usage:
+    python -m deja_bounce.simulation.server --matches 2000 --seconds 10
+    python -m deja_bounce.simulation.server --matches 500 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import multiprocessing
+import os
+import queue
+from collections import deque
+from dataclasses import astuple, dataclass, replace
+from time import perf_counter, sleep
+from typing import Deque, Dict, List, Optional, Tuple
+
+from mini_arcade_core import Game
+
+from deja_bounce.constants import FPS
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.replay import new_seed
+from deja_bounce.simulation.headless import (
+    DEFAULT_MAX_STEPS,
+    HeadlessPongScene,
+    make_headless_game,
+)
+
+REPORT_TICKS = 6  # shards report load and results ten times a second
+TARGET_LOAD = 0.7  # share of the tick budget a shard may fill
+COST_DECAY = 0.98  # per report, how fast a past cost peak is forgotten
+RAMP_MATCHES = 32  # matches a shard may take before its cost is measured
+START_MARGIN = 0.2  # share of the tick left unused when starting matches
+
+
+@dataclass
+class MatchSpec:
+    """
+    A match to host.
+
+    :ivar match_id (int): Caller's id for the match.
+    :ivar left (CpuConfig): CPU settings for the left paddle.
+    :ivar right (CpuConfig): CPU settings for the right paddle.
+    :ivar seed (int): Seed for the CPU aim errors.
+    :ivar max_steps (int): Ticks before the match is called undecided.
+    """
+
+    match_id: int
+    left: CpuConfig
+    right: CpuConfig
+    seed: int
+    max_steps: int = DEFAULT_MAX_STEPS
+
+
+@dataclass
+class MatchOutcome:
+    """
+    A finished match.
+
+    :ivar match_id (int): Id from its MatchSpec.
+    :ivar shard (int): Shard that hosted it.
+    :ivar winner (Optional[str]): "P1", "P2", or None if undecided.
+    :ivar score_left (int): Final left score.
+    :ivar score_right (int): Final right score.
+    :ivar steps (int): Ticks played.
+    """
+
+    match_id: int
+    shard: int
+    winner: Optional[str]
+    score_left: int
+    score_right: int
+    steps: int
+
+
+# Justification: One counter per figure the load test reports
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class ShardStats:
+    """
+    Running counters of one shard.
+
+    :ivar shard (int): Shard number.
+    :ivar ticks (int): Ticks run.
+    :ivar late_ticks (int): Ticks whose work ended after their deadline.
+    :ivar match_ticks (int): Match steps, summed over ticks.
+    :ivar busy_seconds (float): Time spent stepping matches.
+    :ivar wall_seconds (float): Time the loop has been running.
+    :ivar started (int): Matches started.
+    :ivar finished (int): Matches finished.
+    :ivar active (int): Matches hosted right now.
+    :ivar peak (int): Most matches hosted at once.
+    :ivar scenes (int): Scenes built (the rest were reused).
+    """
+
+    shard: int
+    ticks: int = 0
+    late_ticks: int = 0
+    match_ticks: int = 0
+    busy_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    started: int = 0
+    finished: int = 0
+    active: int = 0
+    peak: int = 0
+    scenes: int = 0
+
+    @property
+    def mean_matches(self) -> float:
+        """Matches hosted per tick, on average."""
+        return self.match_ticks / self.ticks if self.ticks else 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Share of the tick budget spent stepping matches."""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.busy_seconds / self.wall_seconds
+
+    @property
+    def miss_rate(self) -> float:
+        """Share of ticks that missed their deadline."""
+        return self.late_ticks / self.ticks if self.ticks else 0.0
+
+    @property
+    def match_us(self) -> float:
+        """Microseconds to step one match one tick."""
+        if not self.match_ticks:
+            return 0.0
+        return self.busy_seconds * 1e6 / self.match_ticks
+
+    @property
+    def matches_per_core(self) -> float:
+        """Matches one core could tick at FPS, from the measured cost."""
+        if not self.match_us:
+            return 0.0
+        return 1e6 / FPS / self.match_us
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+def _config_key(spec: MatchSpec) -> Tuple:
+    return astuple(spec.left) + astuple(spec.right)
+
+
+class ShardScheduler:
+    """
+    Hosts matches on one shared headless Game and ticks them together.
+
+    :ivar stats (ShardStats): Running counters.
+    """
+
+    def __init__(self, shard: int = 0, game: Game | None = None):
+        """
+        :param shard: Shard number, copied into outcomes.
+        :type shard: int
+
+        :param game: Game every scene is built on (a headless one if
+            omitted).
+        :type game: Game, optional
+        """
+        self.game = game if game is not None else make_headless_game()
+        self.dt = 1.0 / FPS
+        self.stats = ShardStats(shard)
+        self._matches: List[Tuple[MatchSpec, HeadlessPongScene, int]] = []
+        self._pool: Dict[Tuple, List[HeadlessPongScene]] = {}
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def add(self, spec: MatchSpec):
+        """
+        Start hosting a match, reusing a pooled scene when one fits.
+
+        :param spec: The match.
+        :type spec: MatchSpec
+        """
+        free = self._pool.get(_config_key(spec))
+        if free:
+            scene = free.pop()
+        else:
+            scene = HeadlessPongScene(self.game, spec.left, spec.right)
+            scene.on_enter()
+            self.stats.scenes += 1
+        scene.reset_match(spec.seed)
+        self._matches.append((spec, scene, 0))
+        stats = self.stats
+        stats.started += 1
+        stats.active = len(self._matches)
+        stats.peak = max(stats.peak, stats.active)
+
+    def tick(self) -> List[MatchOutcome]:
+        """
+        Step every hosted match once.
+
+        :return: Matches that finished on this tick.
+        :rtype: List[MatchOutcome]
+        """
+        dt = self.dt
+        done: List[MatchOutcome] = []
+        running = []
+        for spec, scene, steps in self._matches:
+            scene.update(dt)
+            steps += 1
+            model = scene.model
+            if model.winner is None and steps < spec.max_steps:
+                running.append((spec, scene, steps))
+                continue
+            done.append(
+                MatchOutcome(
+                    spec.match_id,
+                    self.stats.shard,
+                    model.winner,
+                    model.score.left,
+                    model.score.right,
+                    steps,
+                )
+            )
+            self._pool.setdefault(_config_key(spec), []).append(scene)
+        stats = self.stats
+        stats.match_ticks += len(self._matches)
+        stats.finished += len(done)
+        self._matches = running
+        stats.active = len(running)
+        return done
+
+
+def _shard_main(shard: int, inbox, outbox):
+    """
+    Worker process entry point: tick at FPS, taking matches from `inbox`
+    and sending (stats, outcomes, final) to `outbox`, until `inbox`
+    yields None.
+
+    New matches are started in the slack after each tick, only while the
+    next deadline is not at risk, since building a scene costs far more
+    than stepping one.
+    """
+    scheduler = ShardScheduler(shard)
+    stats = scheduler.stats
+    interval = 1.0 / FPS
+    waiting: Deque[MatchSpec] = deque()
+    outcomes: List[MatchOutcome] = []
+    frozen = 0
+    start = perf_counter()
+    due = start
+    while True:
+        begin = perf_counter()
+        outcomes.extend(scheduler.tick())
+        end = perf_counter()
+        stats.ticks += 1
+        stats.busy_seconds += end - begin
+        due += interval
+        if end > due:
+            stats.late_ticks += 1
+            due = end  # start over from now rather than catch up a backlog
+
+        try:
+            while True:
+                specs = inbox.get_nowait()
+                if specs is None:
+                    stats.wall_seconds = perf_counter() - start
+                    outbox.put((replace(stats), outcomes, True))
+                    return
+                waiting.extend(specs)
+        except queue.Empty:
+            pass
+        if waiting:
+            slack = due - START_MARGIN * interval
+            while waiting and perf_counter() < slack:
+                scheduler.add(waiting.popleft())
+            if stats.scenes > frozen:
+                # New scenes live until the process exits; keep the
+                # collector from rescanning them all in a full collection
+                # in the middle of a tick. Collect first so no garbage is
+                # frozen with them.
+                gc.collect()
+                gc.freeze()
+                frozen = stats.scenes
+
+        if stats.ticks % REPORT_TICKS == 0:
+            stats.wall_seconds = end - start
+            outbox.put((replace(stats), outcomes, False))
+            outcomes = []
+        sleep(max(0.0, due - perf_counter()))
+
+
+# Justification: Per-shard bookkeeping next to the queues and processes
+# pylint: disable=too-many-instance-attributes
+class MatchServer:
+    """
+    Shards matches over worker processes, placing each new one on the
+    shard with the most headroom. A match stays on its shard until it
+    finishes; running matches are not migrated.
+
+    :ivar workers (int): Number of shards.
+    :ivar target_load (float): Share of the tick budget a shard may fill
+        before it gets no more matches.
+    :ivar stats (List[ShardStats]): Latest counters from each shard.
+    """
+
+    def __init__(
+        self, workers: int | None = None, target_load: float = TARGET_LOAD
+    ):
+        """
+        :param workers: Worker processes (defaults to the CPU count).
+        :type workers: int, optional
+
+        :param target_load: Share of the tick budget a shard may fill.
+        :type target_load: float
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.target_load = target_load
+        self.stats = [ShardStats(i) for i in range(self.workers)]
+        self._pending: Deque[MatchSpec] = deque()
+        self._sent = [0] * self.workers
+        # Seconds per match step, per shard; 0 until measured
+        self._cost = [0.0] * self.workers
+        self._inboxes = [multiprocessing.Queue() for _ in range(self.workers)]
+        self._outbox: multiprocessing.Queue = multiprocessing.Queue()
+        self._processes = [
+            multiprocessing.Process(
+                target=_shard_main,
+                args=(i, self._inboxes[i], self._outbox),
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    @property
+    def pending(self) -> int:
+        """Matches waiting for a shard."""
+        return len(self._pending)
+
+    def submit(self, spec: MatchSpec):
+        """
+        Queue a match; it starts on the next poll() with room for it.
+
+        :param spec: The match.
+        :type spec: MatchSpec
+        """
+        self._pending.append(spec)
+
+    def _headroom(self, shard: int) -> int:
+        stats = self.stats[shard]
+        # Matches sent but not yet picked up count against the shard too
+        hosted = stats.active + self._sent[shard] - stats.started
+        # Grow by half at a time: the cost per match rises with the number
+        # hosted (caches), so a shard is filled no faster than it is measured
+        step = max(RAMP_MATCHES, hosted // 2)
+        cost = self._cost[shard]
+        if cost <= 0:
+            return step - hosted if not hosted else 0
+        return min(step, int(self.target_load / FPS / cost) - hosted)
+
+    def _dispatch(self):
+        batches: List[List[MatchSpec]] = [[] for _ in range(self.workers)]
+        room = [self._headroom(i) for i in range(self.workers)]
+        while self._pending:
+            shard = max(range(self.workers), key=room.__getitem__)
+            if room[shard] <= 0:
+                break
+            batches[shard].append(self._pending.popleft())
+            room[shard] -= 1
+        for shard, batch in enumerate(batches):
+            if batch:
+                self._inboxes[shard].put(batch)
+                self._sent[shard] += len(batch)
+
+    def _receive(self, item) -> List[MatchOutcome]:
+        stats, outcomes, _ = item
+        shard = stats.shard
+        last = self.stats[shard]
+        steps = stats.match_ticks - last.match_ticks
+        if steps:
+            # A slowly decaying maximum, so one quick window does not let
+            # a shard take more than it can hold
+            cost = (stats.busy_seconds - last.busy_seconds) / steps
+            self._cost[shard] = max(cost, COST_DECAY * self._cost[shard])
+        self.stats[shard] = stats
+        return outcomes
+
+    def poll(self, timeout: float = 0.0) -> List[MatchOutcome]:
+        """
+        Collect shard reports, start queued matches where there is room.
+
+        :param timeout: Seconds to wait for the first report.
+        :type timeout: float
+
+        :return: Matches finished since the last poll.
+        :rtype: List[MatchOutcome]
+        """
+        outcomes: List[MatchOutcome] = []
+        try:
+            item = self._outbox.get(timeout=timeout) if timeout else None
+            while True:
+                if item is not None:
+                    outcomes.extend(self._receive(item))
+                item = self._outbox.get_nowait()
+        except queue.Empty:
+            pass
+        self._dispatch()
+        return outcomes
+
+    def close(self) -> List[MatchOutcome]:
+        """
+        Stop every shard; matches still running are dropped.
+
+        :return: Matches that finished since the last poll.
+        :rtype: List[MatchOutcome]
+        """
+        for inbox in self._inboxes:
+            inbox.put(None)
+        outcomes: List[MatchOutcome] = []
+        remaining = self.workers
+        while remaining:
+            item = self._outbox.get()
+            outcomes.extend(self._receive(item))
+            remaining -= item[2]
+        for process in self._processes:
+            process.join()
+        return outcomes
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+@dataclass
+class LoadReport:
+    """
+    Outcome of a load test.
+
+    :ivar target (int): Concurrent matches asked for.
+    :ivar seconds (float): How long the test ran.
+    :ivar shards (List[ShardStats]): Final counters of every shard.
+    :ivar finished (int): Matches finished.
+    :ivar decided (int): Finished matches that had a winner.
+    :ivar pending (int): Matches still waiting for a shard at the end.
+    """
+
+    target: int
+    seconds: float
+    shards: List[ShardStats]
+    finished: int
+    decided: int
+    pending: int
+
+
+def run_load_test(
+    matches: int = 1000,
+    seconds: float = 10.0,
+    workers: int | None = None,
+    seed: int | None = None,
+) -> LoadReport:
+    """
+    Keep `matches` CPU-vs-CPU matches running, starting a new one
+    whenever one finishes, and report how the shards held the tick rate.
+
+    :param matches: Concurrent matches to keep running.
+    :type matches: int
+
+    :param seconds: How long to run.
+    :type seconds: float
+
+    :param workers: Worker processes (defaults to the CPU count).
+    :type workers: int, optional
+
+    :param seed: Base seed; match i uses seed + i.
+    :type seed: int, optional
+
+    :return: Shard counters and match totals.
+    :rtype: LoadReport
+    """
+    base = new_seed() if seed is None else seed
+    presets = sorted(DIFFICULTY_PRESETS)
+    server = MatchServer(workers)
+    submitted = 0
+    finished = 0
+    decided = 0
+
+    def top_up():
+        nonlocal submitted
+        while submitted - finished < matches:
+            server.submit(
+                MatchSpec(
+                    submitted,
+                    DIFFICULTY_PRESETS[presets[submitted % len(presets)]],
+                    DIFFICULTY_PRESETS[
+                        presets[(submitted // len(presets)) % len(presets)]
+                    ],
+                    base + submitted,
+                )
+            )
+            submitted += 1
+
+    start = perf_counter()
+    top_up()
+    while perf_counter() - start < seconds:
+        for outcome in server.poll(timeout=0.05):
+            finished += 1
+            decided += outcome.winner is not None
+        top_up()
+    pending = server.pending
+    outcomes = server.close()
+    return LoadReport(
+        target=matches,
+        seconds=perf_counter() - start,
+        shards=server.stats,
+        finished=finished + len(outcomes),
+        decided=decided + sum(o.winner is not None for o in outcomes),
+        pending=pending,
+    )
+
+
+def main(argv: list[str] | None = None):
+    """Run a multi-match load test and print per-shard figures."""
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.simulation.server"
+    )
+    parser.add_argument("--matches", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = run_load_test(
+        args.matches, args.seconds, workers=args.workers, seed=args.seed
+    )
+    print(
+        f"{report.target} concurrent matches asked for, "
+        f"{len(report.shards)} shards, {report.seconds:.1f}s at {FPS} Hz: "
+        f"{report.finished} finished, {report.pending} still queued"
+    )
+    print(
+        f"{'shard':>5} {'ticks':>6} {'late':>5} {'matches':>8} {'peak':>5} "
+        f"{'busy':>5} {'us/match':>9} {'per core':>9} {'scenes':>7}"
+    )
+    for stats in report.shards:
+        print(
+            f"{stats.shard:>5} {stats.ticks:>6} {stats.late_ticks:>5} "
+            f"{stats.mean_matches:>8.0f} {stats.peak:>5} "
+            f"{stats.utilization:>5.0%} {stats.match_us:>9.2f} "
+            f"{stats.matches_per_core:>9.0f} {stats.scenes:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""
+Parameter sweeps that tune CpuConfig values to a target difficulty.
+
+Candidates are sampled from ranges of CpuConfig fields and play headless
+matches against a reference opponent across a process pool. Each round
+gives every open candidate one more chunk of matches; a candidate stops
+as soon as the confidence interval of its point share is narrow enough,
+or clearly cannot reach the target. A second stage re-samples around the
+best candidate with narrower ranges.
+
+Usage (easy should win 20% of points against hard):
+    python -m deja_bounce.simulation.sweep --base easy --reference hard \\
+        --target 0.2 --vary max_speed=120:260 --vary dead_zone=6:30
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Tuple, get_type_hints
+
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.replay import new_seed
+from deja_bounce.simulation.headless import DEFAULT_DT, DEFAULT_MAX_STEPS
+from deja_bounce.simulation.tournament import MatchRecord, MatchTask, play_task
+
+ParamSpace = Dict[str, Tuple[float, float]]
+
+CANDIDATE = "candidate"
+REFERENCE = "reference"
+
+
+def wilson_interval(
+    successes: int, trials: int, z: float = 1.96
+) -> Tuple[float, float]:
+    """
+    Wilson score interval for a binomial proportion.
+
+    :param successes: Number of successes.
+    :type successes: int
+
+    :param trials: Number of trials.
+    :type trials: int
+
+    :param z: Normal quantile (1.96 for ~95%).
+    :type z: float
+
+    :return: (low, high) bounds of the proportion.
+    :rtype: Tuple[float, float]
+    """
+    if trials <= 0:
+        return 0.0, 1.0
+    p = successes / trials
+    denom = 1 + z * z / trials
+    center = (p + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials**2))
+    half /= denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@dataclass
+class Candidate:
+    """
+    A CpuConfig under evaluation and its running point tally.
+
+    Points are treated as independent trials, which slightly understates
+    the interval width when rallies within a match are correlated.
+
+    :ivar config (CpuConfig): Settings being evaluated.
+    :ivar points_won (int): Points won against the reference.
+    :ivar points (int): Points played.
+    :ivar matches (int): Matches played.
+    :ivar status (str): "open", "settled" or "rejected".
+    """
+
+    config: CpuConfig
+    points_won: int = 0
+    points: int = 0
+    matches: int = 0
+    status: str = "open"
+
+    @property
+    def point_rate(self) -> float:
+        """Share of points won against the reference."""
+        return self.points_won / self.points if self.points else 0.0
+
+    def interval(self, z: float = 1.96) -> Tuple[float, float]:
+        """
+        Confidence interval of the point share.
+
+        :param z: Normal quantile.
+        :type z: float
+
+        :return: (low, high) bounds.
+        :rtype: Tuple[float, float]
+        """
+        return wilson_interval(self.points_won, self.points, z)
+
+    def add(self, record: MatchRecord):
+        """
+        Fold in one match played against the reference.
+
+        :param record: The match, with the candidate on either side.
+        :type record: MatchRecord
+        """
+        self.matches += 1
+        self.points += record.points
+        self.points_won += (
+            record.score_left
+            if record.left == CANDIDATE
+            else record.score_right
+        )
+
+
+@dataclass
+class SweepReport:
+    """
+    Outcome of a sweep.
+
+    :ivar target (float): Point share the sweep aimed for.
+    :ivar candidates (List[Candidate]): Everything evaluated.
+    :ivar matches (int): Matches played in total.
+    :ivar wall_seconds (float): Real time the sweep took.
+    """
+
+    target: float
+    candidates: List[Candidate]
+    matches: int
+    wall_seconds: float
+
+    def ranked(self) -> List[Candidate]:
+        """
+        Non-rejected candidates, closest to the target first.
+
+        :return: Ranked candidates.
+        :rtype: List[Candidate]
+        """
+
+        def key(c: Candidate) -> Tuple[float, float]:
+            lo, hi = c.interval()
+            return abs(c.point_rate - self.target), hi - lo
+
+        return sorted(
+            (c for c in self.candidates if c.status != "rejected"), key=key
+        )
+
+    @property
+    def best(self) -> Optional[Candidate]:
+        """Closest candidate to the target, if any survived."""
+        ranked = self.ranked()
+        return ranked[0] if ranked else None
+
+
+# Justification: Sweep settings are plain knobs, kept together here.
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class SweepSettings:
+    """
+    Knobs controlling the search and its early stopping.
+
+    :ivar candidates (int): Candidates sampled per stage.
+    :ivar stages (int): Search stages; each later stage halves the ranges
+        around the best candidate so far.
+    :ivar matches_per_round (int): Matches a candidate plays per round.
+    :ivar max_matches (int): Hard cap on matches per candidate.
+    :ivar precision (float): Interval half-width at which a candidate
+        counts as settled.
+    :ivar z (float): Normal quantile for the interval.
+    :ivar dt (float): Fixed simulation step in seconds.
+    :ivar max_steps (int): Step cap per match.
+    """
+
+    candidates: int = 24
+    stages: int = 2
+    matches_per_round: int = 10
+    max_matches: int = 400
+    precision: float = 0.03
+    z: float = 1.96
+    dt: float = DEFAULT_DT
+    max_steps: int = DEFAULT_MAX_STEPS
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+def _sample_value(rng: random.Random, kind: type, lo: float, hi: float):
+    """
+    Draw one value of a `kind` field from [lo, hi]: a bool for flags, and
+    otherwise a float rounded to about a hundredth of the range, so narrow
+    ranges still give distinct candidates.
+    """
+    if kind is bool:
+        return bool(rng.randint(round(lo), round(hi)))
+    width = hi - lo
+    if width <= 0:
+        return lo
+    digits = max(1, 2 - math.floor(math.log10(width)))
+    return round(rng.uniform(lo, hi), digits)
+
+
+def _sample(
+    rng: random.Random, base: CpuConfig, space: ParamSpace, count: int
+) -> List[Candidate]:
+    kinds = get_type_hints(CpuConfig)
+    out = []
+    for _ in range(count):
+        values = {
+            name: _sample_value(rng, kinds[name], lo, hi)
+            for name, (lo, hi) in space.items()
+        }
+        out.append(Candidate(replace(base, **values)))
+    return out
+
+
+def _narrow(space: ParamSpace, around: CpuConfig) -> ParamSpace:
+    """Halve every range and centre it on `around` (within the old one)."""
+    out = {}
+    for name, (lo, hi) in space.items():
+        quarter = (hi - lo) / 4
+        center = getattr(around, name)
+        out[name] = (max(lo, center - quarter), min(hi, center + quarter))
+    return out
+
+
+def _judge(candidate: Candidate, target: float, settings: SweepSettings):
+    """Close a candidate once its interval settles or misses the target."""
+    lo, hi = candidate.interval(settings.z)
+    if hi < target - settings.precision or lo > target + settings.precision:
+        candidate.status = "rejected"
+    elif (hi - lo) / 2 <= settings.precision:
+        candidate.status = "settled"
+    elif candidate.matches >= settings.max_matches:
+        candidate.status = "settled"
+
+
+def _round_tasks(
+    open_: List[Candidate],
+    reference: CpuConfig,
+    settings: SweepSettings,
+    next_seed: int,
+) -> Tuple[List[MatchTask], int]:
+    """One chunk per open candidate, alternating sides between rounds."""
+    tasks = []
+    for candidate in open_:
+        seeds = list(range(next_seed, next_seed + settings.matches_per_round))
+        next_seed += settings.matches_per_round
+        if (candidate.matches // settings.matches_per_round) % 2 == 0:
+            left, left_cfg = CANDIDATE, candidate.config
+            right, right_cfg = REFERENCE, reference
+        else:
+            left, left_cfg = REFERENCE, reference
+            right, right_cfg = CANDIDATE, candidate.config
+        tasks.append(
+            MatchTask(
+                left=left,
+                left_config=left_cfg,
+                right=right,
+                right_config=right_cfg,
+                seeds=seeds,
+                dt=settings.dt,
+                max_steps=settings.max_steps,
+            )
+        )
+    return tasks, next_seed
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+# pylint: disable=too-many-locals
+def run_sweep(
+    target: float,
+    reference: CpuConfig,
+    space: ParamSpace,
+    base: CpuConfig | None = None,
+    settings: SweepSettings | None = None,
+    workers: int | None = None,
+    seed: int | None = None,
+) -> SweepReport:
+    """
+    Search `space` for CpuConfig values that win `target` of the points
+    against `reference`.
+
+    :param target: Wanted share of points won by the candidate (0..1).
+    :type target: float
+
+    :param reference: Opponent every candidate plays.
+    :type reference: CpuConfig
+
+    :param space: CpuConfig field name -> (low, high) range to sample.
+    :type space: ParamSpace
+
+    :param base: Values for fields not in `space` (default CpuConfig()).
+    :type base: CpuConfig, optional
+
+    :param settings: Search and stopping knobs.
+    :type settings: SweepSettings, optional
+
+    :param workers: Worker processes (defaults to the CPU count); 1 runs
+        in-process.
+    :type workers: int, optional
+
+    :param seed: Seed for candidate sampling and match seeds.
+    :type seed: int, optional
+
+    :return: Every candidate evaluated, ready to rank.
+    :rtype: SweepReport
+
+    :raises ValueError: If `space` names a field CpuConfig does not have.
+    """
+    known = {f.name for f in fields(CpuConfig)}
+    unknown = set(space) - known
+    if unknown:
+        raise ValueError(f"Unknown CpuConfig fields: {sorted(unknown)}")
+
+    base = base or CpuConfig()
+    settings = settings or SweepSettings()
+    workers = workers or os.cpu_count() or 1
+    seed = new_seed() if seed is None else seed
+    rng = random.Random(seed)
+    next_seed = seed
+
+    everything: List[Candidate] = []
+    matches = 0
+    start = perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for _ in range(settings.stages):
+            stage = _sample(rng, base, space, settings.candidates)
+            everything.extend(stage)
+            open_ = list(stage)
+            while open_:
+                tasks, next_seed = _round_tasks(
+                    open_, reference, settings, next_seed
+                )
+                results = (
+                    pool.map(play_task, tasks)
+                    if pool is not None
+                    else map(play_task, tasks)
+                )
+                for candidate, records in zip(open_, results):
+                    for record in records:
+                        candidate.add(record)
+                    matches += len(records)
+                    _judge(candidate, target, settings)
+                open_ = [c for c in open_ if c.status == "open"]
+
+            best = SweepReport(target, everything, matches, 0.0).best
+            if best is not None:
+                space = _narrow(space, best.config)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return SweepReport(
+        target=target,
+        candidates=everything,
+        matches=matches,
+        wall_seconds=perf_counter() - start,
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+# pylint: enable=too-many-locals
+
+
+def format_report(report: SweepReport, top: int = 5) -> Iterable[str]:
+    """
+    Render the best candidates as text lines.
+
+    :param report: The sweep to describe.
+    :type report: SweepReport
+
+    :param top: How many candidates to list.
+    :type top: int
+
+    :return: Lines of text.
+    :rtype: Iterable[str]
+    """
+    yield (
+        f"{len(report.candidates)} candidates, {report.matches} matches "
+        f"in {report.wall_seconds:.2f}s (target {report.target:.1%})"
+    )
+    for candidate in report.ranked()[:top]:
+        lo, hi = candidate.interval()
+        yield (
+            f"  {candidate.point_rate:.1%} [{lo:.1%}, {hi:.1%}] "
+            f"over {candidate.matches} matches: {candidate.config}"
+        )
+
+
+def _parse_range(text: str) -> Tuple[str, Tuple[float, float]]:
+    name, _, bounds = text.partition("=")
+    if name not in {f.name for f in fields(CpuConfig)}:
+        raise argparse.ArgumentTypeError(f"unknown CpuConfig field {name!r}")
+    lo, _, hi = bounds.partition(":")
+    try:
+        low, high = float(lo), float(hi)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(
+            f"expected {name}=low:high, got {text!r}"
+        ) from exc
+    if low > high:
+        raise argparse.ArgumentTypeError(f"empty range for {name}: {text!r}")
+    return name, (low, high)
+
+
+def main(argv: list[str] | None = None):
+    """Run a sweep from the command line and print the best candidates."""
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.simulation.sweep"
+    )
+    presets = sorted(DIFFICULTY_PRESETS)
+    parser.add_argument("--target", type=float, required=True)
+    parser.add_argument("--reference", choices=presets, default="hard")
+    parser.add_argument("--base", choices=presets, default="normal")
+    parser.add_argument(
+        "--vary",
+        action="append",
+        type=_parse_range,
+        required=True,
+        help="field=low:high, e.g. max_speed=120:260 (repeatable)",
+    )
+    parser.add_argument("--candidates", type=int, default=24)
+    parser.add_argument("--precision", type=float, default=0.03)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = run_sweep(
+        args.target,
+        DIFFICULTY_PRESETS[args.reference],
+        dict(args.vary),
+        base=DIFFICULTY_PRESETS[args.base],
+        settings=SweepSettings(
+            candidates=args.candidates, precision=args.precision
+        ),
+        workers=args.workers,
+        seed=args.seed,
+    )
+    for line in format_report(report):
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
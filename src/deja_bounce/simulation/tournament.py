@@ -0,0 +1,463 @@
+"""
+Round-robin CPU-vs-CPU tournaments over CpuConfig presets.
+
+Every pair of entrants plays a number of headless matches, split evenly
+between both sides of the table, fanned out over a process pool. Each
+match records its seed, so any result can be replayed with
+``HeadlessMatch(left, right).run(seed=...)``.
+
+Usage:
+    python -m deja_bounce.simulation.tournament --matches 200 --workers 8
+    python -m deja_bounce.simulation.tournament --entrants extra.json \\
+        --csv matches.csv
+
+``extra.json`` maps entrant names to CpuConfig fields, e.g.
+``{"tuned": {"max_speed": 260, "dead_zone": 8}}``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from deja_bounce.controllers import CpuConfig
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.replay import new_seed
+from deja_bounce.simulation.headless import (
+    DEFAULT_DT,
+    DEFAULT_MAX_STEPS,
+    HeadlessMatch,
+)
+
+Entrants = Dict[str, CpuConfig]
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class MatchRecord:
+    """
+    One tournament match.
+
+    :ivar left (str): Entrant on the left paddle.
+    :ivar right (str): Entrant on the right paddle.
+    :ivar seed (int): Seed to replay the match with.
+    :ivar winner (Optional[str]): Winning entrant, None if undecided.
+    :ivar score_left (int): Final left score.
+    :ivar score_right (int): Final right score.
+    :ivar hits (int): Paddle hits over the match.
+    :ivar sim_seconds (float): Simulated match length.
+    """
+
+    left: str
+    right: str
+    seed: int
+    winner: Optional[str]
+    score_left: int
+    score_right: int
+    hits: int
+    sim_seconds: float
+
+    @property
+    def points(self) -> int:
+        """Points played in the match."""
+        return self.score_left + self.score_right
+
+
+# pylint: enable=too-many-instance-attributes
+
+
+@dataclass
+class MatchTask:
+    """
+    A chunk of seeded matches between two entrants, run by one worker.
+
+    :ivar left (str): Entrant on the left paddle.
+    :ivar left_config (CpuConfig): Its CPU settings.
+    :ivar right (str): Entrant on the right paddle.
+    :ivar right_config (CpuConfig): Its CPU settings.
+    :ivar seeds (List[int]): One match per seed.
+    :ivar dt (float): Fixed simulation step in seconds.
+    :ivar max_steps (int): Step cap per match.
+    """
+
+    left: str
+    left_config: CpuConfig
+    right: str
+    right_config: CpuConfig
+    seeds: List[int]
+    dt: float
+    max_steps: int
+
+
+def play_task(task: MatchTask) -> List[MatchRecord]:
+    """
+    Worker entry point: play one chunk of matches for a pairing.
+
+    :param task: The matches to play.
+    :type task: MatchTask
+
+    :return: One record per seed.
+    :rtype: List[MatchRecord]
+    """
+    runner = HeadlessMatch(task.left_config, task.right_config, dt=task.dt)
+    records = []
+    for seed in task.seeds:
+        result = runner.run(seed=seed, max_steps=task.max_steps)
+        if result.winner == "P1":
+            winner: Optional[str] = task.left
+        elif result.winner == "P2":
+            winner = task.right
+        else:
+            winner = None
+        records.append(
+            MatchRecord(
+                left=task.left,
+                right=task.right,
+                seed=seed,
+                winner=winner,
+                score_left=result.score.left,
+                score_right=result.score.right,
+                hits=sum(result.rallies),
+                sim_seconds=result.sim_seconds,
+            )
+        )
+    return records
+
+
+@dataclass
+class Standing:
+    """
+    Aggregate results for an entrant, or for one pairing.
+
+    :ivar matches (int): Matches played.
+    :ivar wins (int): Matches won.
+    :ivar points_won (int): Points scored.
+    :ivar points (int): Points played.
+    :ivar hits (int): Paddle hits over all matches.
+    :ivar sim_seconds (float): Simulated time played.
+    """
+
+    matches: int = 0
+    wins: int = 0
+    points_won: int = 0
+    points: int = 0
+    hits: int = 0
+    sim_seconds: float = 0.0
+
+    def add(self, record: MatchRecord, side: str):
+        """
+        Fold one match into the standing, seen from `side`.
+
+        :param record: The match to add.
+        :type record: MatchRecord
+
+        :param side: "LEFT" or "RIGHT", the side this standing played.
+        :type side: str
+        """
+        name = record.left if side == "LEFT" else record.right
+        self.matches += 1
+        self.wins += record.winner == name
+        self.points_won += (
+            record.score_left if side == "LEFT" else record.score_right
+        )
+        self.points += record.points
+        self.hits += record.hits
+        self.sim_seconds += record.sim_seconds
+
+    @property
+    def win_rate(self) -> float:
+        """Share of matches won."""
+        return self.wins / self.matches if self.matches else 0.0
+
+    @property
+    def point_rate(self) -> float:
+        """Share of points won."""
+        return self.points_won / self.points if self.points else 0.0
+
+    @property
+    def mean_rally(self) -> float:
+        """Mean paddle hits per point."""
+        return self.hits / self.points if self.points else 0.0
+
+    @property
+    def points_per_minute(self) -> float:
+        """Points played per simulated minute."""
+        if self.sim_seconds <= 0:
+            return 0.0
+        return self.points * 60.0 / self.sim_seconds
+
+
+@dataclass
+class TournamentReport:
+    """
+    Outcome of a tournament.
+
+    :ivar records (List[MatchRecord]): Every match, with its seed.
+    :ivar wall_seconds (float): Real time the tournament took.
+    :ivar workers (int): Worker processes used.
+    """
+
+    records: List[MatchRecord] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    workers: int = 1
+
+    def standings(self) -> Dict[str, Standing]:
+        """
+        Per-entrant aggregates over all of its matches.
+
+        :return: Standing per entrant name.
+        :rtype: Dict[str, Standing]
+        """
+        out: Dict[str, Standing] = {}
+        for record in self.records:
+            out.setdefault(record.left, Standing()).add(record, "LEFT")
+            out.setdefault(record.right, Standing()).add(record, "RIGHT")
+        return out
+
+    def pairings(self) -> Dict[Tuple[str, str], Standing]:
+        """
+        Head-to-head aggregates, seen from the first name of each pair.
+
+        :return: Standing per (entrant, opponent), both orders present.
+        :rtype: Dict[Tuple[str, str], Standing]
+        """
+        out: Dict[Tuple[str, str], Standing] = {}
+        for record in self.records:
+            out.setdefault((record.left, record.right), Standing()).add(
+                record, "LEFT"
+            )
+            out.setdefault((record.right, record.left), Standing()).add(
+                record, "RIGHT"
+            )
+        return out
+
+    def upsets(self) -> List[MatchRecord]:
+        """
+        Matches won by the entrant with the lower overall win rate.
+
+        :return: Surprising matches, most lopsided standings first.
+        :rtype: List[MatchRecord]
+        """
+        rates = {
+            name: standing.win_rate
+            for name, standing in self.standings().items()
+        }
+
+        def gap(record: MatchRecord) -> float:
+            loser = (
+                record.right if record.winner == record.left else record.left
+            )
+            return rates[loser] - rates[record.winner]
+
+        return sorted(
+            (r for r in self.records if r.winner and gap(r) > 0),
+            key=gap,
+            reverse=True,
+        )
+
+    def write_csv(self, path: Path):
+        """
+        Dump every match record (including seeds) to CSV.
+
+        :param path: Destination file.
+        :type path: Path
+        """
+        names = [f.name for f in fields(MatchRecord)]
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=names)
+            writer.writeheader()
+            for record in self.records:
+                writer.writerow(asdict(record))
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def _tasks(
+    entrants: Entrants,
+    matches: int,
+    seed: int,
+    chunk: int,
+    dt: float,
+    max_steps: int,
+) -> Iterator[MatchTask]:
+    """
+    Split every pairing into chunks, alternating sides half the time.
+
+    Seeds are assigned here, before dispatch, so results do not depend on
+    the number of workers.
+    """
+    next_seed = seed
+    for a, b in itertools.combinations(sorted(entrants), 2):
+        for left, right, count in (
+            (a, b, (matches + 1) // 2),
+            (b, a, matches // 2),
+        ):
+            for start in range(0, count, chunk):
+                size = min(chunk, count - start)
+                yield MatchTask(
+                    left=left,
+                    left_config=entrants[left],
+                    right=right,
+                    right_config=entrants[right],
+                    seeds=list(range(next_seed, next_seed + size)),
+                    dt=dt,
+                    max_steps=max_steps,
+                )
+                next_seed += size
+
+
+def run_tournament(
+    entrants: Entrants | None = None,
+    matches: int = 100,
+    workers: int | None = None,
+    seed: int | None = None,
+    chunk: int = 25,
+    dt: float = DEFAULT_DT,
+    max_steps: int = DEFAULT_MAX_STEPS,
+) -> TournamentReport:
+    """
+    Play a round-robin tournament across worker processes.
+
+    :param entrants: Name -> CpuConfig (defaults to DIFFICULTY_PRESETS).
+    :type entrants: Entrants, optional
+
+    :param matches: Matches per pairing, split across both sides.
+    :type matches: int
+
+    :param workers: Worker processes (defaults to the CPU count); 1 runs
+        in-process.
+    :type workers: int, optional
+
+    :param seed: Base seed; a fresh one is drawn if None.
+    :type seed: int, optional
+
+    :param chunk: Matches per task sent to a worker.
+    :type chunk: int
+
+    :param dt: Fixed simulation step in seconds.
+    :type dt: float
+
+    :param max_steps: Step cap per match.
+    :type max_steps: int
+
+    :return: Every match played, ready to aggregate.
+    :rtype: TournamentReport
+    """
+    entrants = dict(entrants or DIFFICULTY_PRESETS)
+    workers = workers or os.cpu_count() or 1
+    base = new_seed() if seed is None else seed
+    tasks = list(_tasks(entrants, matches, base, chunk, dt, max_steps))
+
+    start = perf_counter()
+    records: List[MatchRecord] = []
+    if workers == 1:
+        for task in tasks:
+            records.extend(play_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk_records in pool.map(play_task, tasks):
+                records.extend(chunk_records)
+
+    return TournamentReport(
+        records=records,
+        wall_seconds=perf_counter() - start,
+        workers=workers,
+    )
+
+
+# pylint: enable=too-many-arguments,too-many-positional-arguments
+
+
+def load_entrants(path: Path) -> Entrants:
+    """
+    Read extra entrants from a JSON file of name -> CpuConfig fields.
+
+    :param path: JSON file to read.
+    :type path: Path
+
+    :return: Parsed entrants.
+    :rtype: Entrants
+    """
+    with open(path, encoding="utf-8") as fh:
+        raw = json.load(fh)
+    return {name: CpuConfig(**fields) for name, fields in raw.items()}
+
+
+def format_report(report: TournamentReport, upsets: int = 5) -> Iterable[str]:
+    """
+    Render standings, head-to-heads and notable upsets as text lines.
+
+    :param report: The tournament to describe.
+    :type report: TournamentReport
+
+    :param upsets: How many upset matches (with seeds) to list.
+    :type upsets: int
+
+    :return: Lines of text.
+    :rtype: Iterable[str]
+    """
+    standings = report.standings()
+    yield (
+        f"{len(report.records)} matches on {report.workers} workers "
+        f"in {report.wall_seconds:.2f}s"
+    )
+    yield ""
+    yield f"{'entrant':<12} {'win%':>6} {'pts%':>6} {'rally':>6} {'pts/min':>8}"
+    ranked = sorted(standings.items(), key=lambda kv: -kv[1].win_rate)
+    for name, st in ranked:
+        yield (
+            f"{name:<12} {st.win_rate:>6.1%} {st.point_rate:>6.1%} "
+            f"{st.mean_rally:>6.2f} {st.points_per_minute:>8.1f}"
+        )
+    yield ""
+    yield f"{'matchup':<25} {'win%':>6} {'pts%':>6} {'rally':>6}"
+    for (a, b), st in sorted(report.pairings().items()):
+        yield (
+            f"{a + ' vs ' + b:<25} {st.win_rate:>6.1%} "
+            f"{st.point_rate:>6.1%} {st.mean_rally:>6.2f}"
+        )
+    notable = report.upsets()[:upsets]
+    if notable:
+        yield ""
+        yield "upsets (replay with HeadlessMatch(left, right).run(seed)):"
+        for r in notable:
+            yield (
+                f"  {r.left} {r.score_left}-{r.score_right} {r.right} "
+                f"seed={r.seed}"
+            )
+
+
+def main(argv: list[str] | None = None):
+    """Run a tournament from the command line and print the report."""
+    parser = argparse.ArgumentParser(
+        prog="python -m deja_bounce.simulation.tournament"
+    )
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--entrants", type=Path, default=None)
+    parser.add_argument("--csv", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    entrants = dict(DIFFICULTY_PRESETS)
+    if args.entrants is not None:
+        entrants.update(load_entrants(args.entrants))
+
+    report = run_tournament(
+        entrants, matches=args.matches, workers=args.workers, seed=args.seed
+    )
+    for line in format_report(report):
+        print(line)
+    if args.csv is not None:
+        report.write_csv(args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Cold-start benchmark: time until the menu's first frame is presented.
+
+Every run is a fresh interpreter, so module imports are paid in full. The
+child builds the game the way app.run does, with HeadlessBackend standing
+in for the native window, and stops after the first end_frame.
+
+Usage:
+    python -m deja_bounce.startup --runs 10
+    python -m deja_bounce.startup --runs 10 --eager
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+from typing import Dict, List
+
+
+def _child(eager: bool):
+    start = perf_counter()
+
+    # Everything below is what the benchmark measures
+    # pylint: disable=import-outside-toplevel
+    from mini_arcade_core import Game, GameConfig, SceneRegistry
+
+    from deja_bounce.backends.headless import HeadlessBackend
+    from deja_bounce.constants import FPS, WINDOW_SIZE
+    from deja_bounce.scenes.registry import LazySceneRegistry
+
+    # pylint: enable=import-outside-toplevel
+
+    imported = perf_counter()
+    registry = (
+        SceneRegistry(_factories={}) if eager else LazySceneRegistry()
+    ).discover("deja_bounce.scenes")
+    marks: Dict[str, float] = {}
+
+    class FirstFrameBackend(HeadlessBackend):
+        """Stops the game once the first frame is presented."""
+
+        def end_frame(self):
+            marks["first_frame"] = perf_counter()
+            game.quit()
+
+    game = Game(
+        GameConfig(
+            width=WINDOW_SIZE[0],
+            height=WINDOW_SIZE[1],
+            title="DejaBounce (startup benchmark)",
+            fps=FPS,
+            backend=FirstFrameBackend(),
+        ),
+        registry=registry,
+    )
+    game.run("menu")
+    print(
+        json.dumps(
+            {
+                "import_ms": (imported - start) * 1000.0,
+                "first_frame_ms": (marks["first_frame"] - start) * 1000.0,
+                "modules": len(sys.modules),
+            }
+        )
+    )
+
+
+def measure(runs: int = 10, eager: bool = False) -> List[Dict[str, float]]:
+    """
+    Start `runs` fresh interpreters and time each one to its first frame.
+
+    :param runs: Number of cold starts.
+    :type runs: int
+
+    :param eager: Discover scenes with the stock SceneRegistry instead,
+        importing every scene module up front.
+    :type eager: bool
+
+    :return: One row per run with import_ms, first_frame_ms (both from the
+        start of the child's imports), process_ms (from spawning the
+        interpreter until it reported) and modules loaded.
+    :rtype: List[Dict[str, float]]
+    """
+    cmd = [sys.executable, "-m", "deja_bounce.startup", "--child"]
+    if eager:
+        cmd.append("--eager")
+    rows = []
+    for _ in range(runs):
+        spawned = perf_counter()
+        line = ""
+        with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+            # Log output shares stdout; the result is the JSON line
+            for line in proc.stdout:
+                if line.startswith("{"):
+                    break
+            reported = perf_counter()
+            proc.communicate()
+        if proc.returncode or not line.startswith("{"):
+            raise RuntimeError(f"startup child failed ({proc.returncode})")
+        row = json.loads(line)
+        row["process_ms"] = (reported - spawned) * 1000.0
+        rows.append(row)
+    return rows
+
+
+def main(argv: list[str] | None = None):
+    """Print cold-start timings to the menu's first frame."""
+    parser = argparse.ArgumentParser(prog="python -m deja_bounce.startup")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--eager",
+        action="store_true",
+        help="import every scene module up front, for comparison",
+    )
+    parser.add_argument("--json", action="store_true", help="print raw rows")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.eager)
+        return
+
+    rows = measure(args.runs, args.eager)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    print(
+        f"{args.runs} cold starts "
+        f"({'eager' if args.eager else 'lazy'} scenes, "
+        f"{rows[0]['modules']} modules loaded)"
+    )
+    for key, label in (
+        ("import_ms", "imports"),
+        ("first_frame_ms", "first frame"),
+        ("process_ms", "process to first frame"),
+    ):
+        values = [row[key] for row in rows]
+        print(
+            f"  {label:<24} median {statistics.median(values):7.1f} ms"
+            f"  min {min(values):7.1f} ms  max {max(values):7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
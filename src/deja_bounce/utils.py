@@ -4,11 +4,14 @@ DejaBounce utils
 
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 # --------------------------------------------------------------------------------------
 # Assets
@@ -23,6 +26,9 @@ def find_assets_root() -> Path:
     - pip install: site-packages/assets
     - PyInstaller onefile: _MEIPASS/assets (if bundled with --add-data)
 
+    The lookup walks the filesystem; use constants.ASSETS_ROOT, which
+    holds the result, rather than calling this again.
+
     :raises FileNotFoundError: If the assets directory cannot be found.
     """
     # 1) PyInstaller onefile support
@@ -64,32 +70,74 @@ class EnsureClassName(logging.Filter):
     Populate record.classname by finding the *emitting* frame:
     match by (pathname, funcName) and read self/cls from its locals.
     Falls back to "-" when not in a class context.
+
+    Where the emitting frame sits on the stack is cached per call site
+    (file, function, line), so the stack is only walked the first time a
+    given logging call runs; self/cls is still read on every call, since
+    an inherited method logs for whichever subclass called it. Call sites
+    in functions without a self/cls local are answered from the cache.
     """
 
+    def __init__(self, name: str = ""):
+        super().__init__(name)
+        # Call site -> frames between filter() and the emitting frame, or
+        # None when that frame cannot name a class
+        self._depths: Dict[Tuple[str, str, int], Optional[int]] = {}
+
     def filter(self, record: logging.LogRecord) -> bool:
         # record_factory ensures classname exists, but allow explicit override
         if getattr(record, "classname", None) not in (None, "-"):
             return True
 
-        target_path = record.pathname
-        target_func = record.funcName
+        f = self._emitting_frame(record)
+        name = _classname_from_locals(f.f_locals) if f is not None else None
+        record.classname = name or "-"
+        return True
+
+    def _emitting_frame(self, record: logging.LogRecord):
+        """The frame that made the logging call, or None if it is not found
+        or has no self/cls local to name a class from."""
+        key = (record.pathname, record.funcName, record.lineno)
+        depth = self._depths.get(key, -1)
+        if depth is None:
+            return None
 
         # Justification: Seems pretty obvious here.
         # pylint: disable=protected-access
-        f = sys._getframe()
+        f = sys._getframe(1)
         # pylint: enable=protected-access
 
-        for _ in range(200):
+        if depth >= 0:
+            cached = f
+            for _ in range(depth):
+                if cached is None:
+                    break
+                cached = cached.f_back
+            if (
+                cached is not None
+                and cached.f_code.co_filename == record.pathname
+                and cached.f_code.co_name == record.funcName
+            ):
+                return cached
+            # Reached through another path; fall back to a full walk
+
+        for depth in range(200):
             if f is None:
                 break
             code = f.f_code
-            if code.co_filename == target_path and code.co_name == target_func:
-                record.classname = _classname_from_locals(f.f_locals) or "-"
-                return True
+            if (
+                code.co_filename == record.pathname
+                and code.co_name == record.funcName
+            ):
+                names = code.co_varnames + code.co_cellvars
+                if "self" in names or "cls" in names:
+                    self._depths[key] = depth
+                    return f
+                break
             f = f.f_back
 
-        record.classname = "-"
-        return True
+        self._depths[key] = None
+        return None
 
 
 class ConsoleColorFormatter(logging.Formatter):
@@ -158,6 +206,8 @@ def _install_record_factory_defaults():
     Safe to call multiple times; we keep the current factory chain.
     """
     old_factory = logging.getLogRecordFactory()
+    if getattr(old_factory, "_deja_bounce_defaults", False):
+        return
 
     def record_factory(*args, **kwargs):
         record = old_factory(*args, **kwargs)
@@ -165,14 +215,91 @@ def _install_record_factory_defaults():
             record.classname = "-"
         return record
 
+    setattr(record_factory, "_deja_bounce_defaults", True)
     logging.setLogRecordFactory(record_factory)
 
 
-def configure_logging(level: int = logging.DEBUG):
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that leaves flushing to its owner instead of flushing
+    after every record.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        # Justification: Same contract as logging.StreamHandler.emit.
+        # pylint: disable=broad-exception-caught
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+        # pylint: enable=broad-exception-caught
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that hands the record over untouched. The stock prepare()
+    formats and copies every record on the calling thread; here message
+    formatting happens on the listener thread instead (so arguments should
+    not be mutated after the logging call).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class _BatchingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue runs dry,
+    so bursts of records are written with a single flush.
+    """
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return self.queue.get(block)
+
+
+_LISTENER: Optional[QueueListener] = None
+
+LOG_MODE_ENV = "DEJA_BOUNCE_LOG"
+
+
+def _stop_listener():
+    # Justification: module-level singleton for the background writer.
+    # pylint: disable=global-statement
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.stop()
+        _LISTENER = None
+    # pylint: enable=global-statement
+
+
+def configure_logging(
+    level: int = logging.DEBUG, background: bool = False
+) -> None:
     """
     Configure logging once for the whole app (root logger).
-    Call this early (app entrypoint). Safe to call multiple times.
+    Call this early (app entrypoint). Safe to call multiple times; a call
+    with a different level or mode replaces the previous setup.
+
+    With `background=True` (production mode) the game thread only resolves
+    the class name (cached) and enqueues the record; a QueueListener thread
+    formats and writes records, flushing once per burst.
+
+    :param level: Root log level; calls below it return immediately.
+    :type level: int
+
+    :param background: Write records from a background thread.
+    :type background: bool
     """
+    # Justification: module-level singleton for the background writer.
+    # pylint: disable=global-statement
+    global _LISTENER
+    # pylint: enable=global-statement
+
     _enable_windows_ansi()
     _install_record_factory_defaults()
 
@@ -185,14 +312,27 @@ def configure_logging(level: int = logging.DEBUG):
 
     for h in list(root.handlers):
         if getattr(h, handler_tag, False):
-            # Already configured
-            return
-
-    console = logging.StreamHandler(stream=sys.stdout)
-    setattr(console, handler_tag, True)
-
-    console.setFormatter(ConsoleColorFormatter(LOGGER_FORMAT))
-    console.addFilter(EnsureClassName())
+            if getattr(h, handler_tag) == ("queue" if background else "sync"):
+                # Already configured
+                return
+            root.removeHandler(h)
+    _stop_listener()
+
+    if background:
+        console = _BufferedStreamHandler(stream=sys.stdout)
+        console.setFormatter(ConsoleColorFormatter(LOGGER_FORMAT))
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        handler = _DeferredQueueHandler(records)
+        handler.addFilter(EnsureClassName())
+        setattr(handler, handler_tag, "queue")
+        _LISTENER = _BatchingQueueListener(records, console)
+        _LISTENER.start()
+        atexit.register(_stop_listener)
+    else:
+        handler = logging.StreamHandler(stream=sys.stdout)
+        handler.setFormatter(ConsoleColorFormatter(LOGGER_FORMAT))
+        handler.addFilter(EnsureClassName())
+        setattr(handler, handler_tag, "sync")
 
     # Important: don’t leave any basicConfig handlers around if someone called it earlier
     # We remove only the plain StreamHandlers that don't have our tag.
@@ -202,12 +342,15 @@ def configure_logging(level: int = logging.DEBUG):
         ):
             root.removeHandler(h)
 
-    root.addHandler(console)
+    root.addHandler(handler)
 
 
 # --------------------------------------------------------------------------------------
 # Public logger for DejaBounce
 # --------------------------------------------------------------------------------------
 
-configure_logging()
+if os.environ.get(LOG_MODE_ENV) == "production":
+    configure_logging(logging.WARNING, background=True)
+else:
+    configure_logging()
 logger = logging.getLogger("deja-bounce")
@@ -0,0 +1,136 @@
+import threading
+from concurrent import futures
+
+import pytest
+
+from deja_bounce.assets import AssetCache, AssetManager
+
+
+def test_get_and_stats():
+    cache = AssetCache(max_bytes=100)
+    assert cache.get("a") is None
+    cache.put("a", b"x" * 10)
+    assert cache.get("a") == b"x" * 10
+    assert "a" in cache
+    assert len(cache) == 1
+    assert cache.size == 10
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = AssetCache(max_bytes=30)
+    cache.put("a", b"a" * 10)
+    cache.put("b", b"b" * 10)
+    cache.put("c", b"c" * 10)
+    cache.get("a")  # "b" is now the oldest
+
+    cache.put("d", b"d" * 10)
+    assert "b" not in cache
+    assert all(key in cache for key in "acd")
+    assert cache.size == 30
+    assert cache.evictions == 1
+
+    cache.put("e", b"e" * 25)
+    assert [key for key in "acde" if key in cache] == ["e"]
+    assert cache.size == 25
+    assert cache.evictions == 4
+
+
+def test_replacing_an_entry_updates_the_size():
+    cache = AssetCache(max_bytes=30)
+    cache.put("a", b"a" * 10)
+    cache.put("b", b"b" * 10)
+    cache.put("a", b"a" * 20)
+    assert cache.size == 30
+    assert cache.evictions == 0
+    cache.put("c", b"c")
+    assert "b" not in cache  # "a" was refreshed by the replace
+    assert cache.size == 21
+
+
+def test_entry_larger_than_budget_is_not_kept():
+    cache = AssetCache(max_bytes=10)
+    cache.put("small", b"s" * 5)
+    cache.put("big", b"b" * 11)
+    assert "big" not in cache
+    assert "small" in cache
+    assert cache.evictions == 0
+
+
+def test_clear():
+    cache = AssetCache(max_bytes=10)
+    cache.put("a", b"a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+@pytest.fixture
+def manager(tmp_path):
+    (tmp_path / "fonts").mkdir()
+    (tmp_path / "fonts" / "a.ttf").write_bytes(b"a" * 10)
+    (tmp_path / "sounds").mkdir()
+    (tmp_path / "sounds" / "b.wav").write_bytes(b"b" * 20)
+    (tmp_path / "c.png").write_bytes(b"c" * 30)
+    manager = AssetManager(tmp_path, max_bytes=1000)
+    yield manager
+    manager.shutdown()
+
+
+def test_index_and_kinds(manager, tmp_path):
+    assert manager.keys() == ["c.png", "fonts/a.ttf", "sounds/b.wav"]
+    assert manager.keys("font") == ["fonts/a.ttf"]
+    assert manager.keys("sound") == ["sounds/b.wav"]
+    assert manager.path("fonts/a.ttf") == tmp_path / "fonts" / "a.ttf"
+    with pytest.raises(KeyError):
+        manager.path("missing.ttf")
+
+
+def test_preload_everything_in_the_background(manager):
+    manager.preload()
+    manager.wait(timeout=5)
+    assert len(manager.cache) == 3
+    assert all(timing.background for timing in manager.timings)
+
+    assert manager.load("sounds/b.wav") == b"b" * 20
+    report = manager.report()
+    assert report["assets"] == 3
+    assert report["bytes"] == 60
+    assert report["blocking_loads"] == 0
+    assert report["cache_hits"] == 1
+
+
+def test_preload_selected_keys(manager):
+    manager.preload(["fonts/a.ttf", "fonts/a.ttf"])
+    manager.wait(timeout=5)
+    assert [timing.key for timing in manager.timings] == ["fonts/a.ttf"]
+    assert "c.png" not in manager.cache
+
+
+def test_load_without_preload_blocks(manager):
+    assert manager.load("c.png") == b"c" * 30
+    assert manager.load("c.png") == b"c" * 30
+    report = manager.report()
+    assert report["assets"] == 1  # the second load came from the cache
+    assert report["blocking_loads"] == 1
+    assert report["cache_hits"] == 1
+    with pytest.raises(KeyError):
+        manager.load("missing.ttf")
+
+
+def test_load_waits_for_a_preload_in_flight(manager, monkeypatch):
+    release = threading.Event()
+    read = AssetManager._read
+
+    def slow_read(self, key, background):
+        release.wait(5)
+        return read(self, key, background)
+
+    monkeypatch.setattr(AssetManager, "_read", slow_read)
+    manager.preload(["fonts/a.ttf"])
+    with pytest.raises(futures.TimeoutError):
+        manager.wait(timeout=0.05)
+
+    threading.Timer(0.05, release.set).start()
+    assert manager.load("fonts/a.ttf") == b"a" * 10
+    assert [timing.background for timing in manager.timings] == [True]
@@ -0,0 +1,67 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.simulation import HeadlessMatch
+from deja_bounce.simulation.batch import P1, P2, BatchSimulator
+
+SEEDS = range(10)
+
+
+@pytest.mark.parametrize("swept", [True, False])
+@pytest.mark.parametrize(
+    "left, right",
+    [("normal", "normal"), ("easy", "hard"), ("hard", "insane")],
+)
+def test_batch_matches_headless(left, right, swept):
+    left = DIFFICULTY_PRESETS[left]
+    right = DIFFICULTY_PRESETS[right]
+    runner = HeadlessMatch(left, right, swept=swept)
+    expected = [runner.run(seed=seed) for seed in SEEDS]
+    # The batch draws no aim errors of its own: give it the headless ones
+    offsets = []
+    for seed in SEEDS:
+        runner.scene.reset_match(seed)
+        offsets.append(
+            [c._aim_offset_y for c in runner.scene._controllers]
+        )
+
+    batch = BatchSimulator(len(SEEDS), left, right, swept=swept)
+    batch.reset(np.array(offsets).T)
+    result = batch.run()
+
+    for i, match in enumerate(expected):
+        assert result.steps[i] == match.steps
+        assert result.score_left[i] == match.score.left
+        assert result.score_right[i] == match.score.right
+        assert result.winner[i] == {"P1": P1, "P2": P2}[match.winner]
+        if swept:
+            # A fast enough ball hits both paddles within one step, which
+            # the rally counter (a change of direction) does not see
+            assert result.hits[i] >= sum(match.rallies)
+        else:
+            assert result.hits[i] == sum(match.rallies)
+
+
+def test_batch_per_match_configs():
+    configs = [DIFFICULTY_PRESETS[name] for name in ("easy", "insane")]
+    batch = BatchSimulator(2, configs, DIFFICULTY_PRESETS["normal"], seed=3)
+    result = batch.run()
+    assert result.matches == 2
+    assert (result.winner != 0).all()
+    assert result.match_steps == result.steps.sum()
+
+
+def test_batch_max_steps_records_unfinished():
+    batch = BatchSimulator(4, seed=1)
+    result = batch.run(max_steps=10)
+    assert (result.winner == 0).all()
+    assert (result.steps == 10).all()
+
+
+def test_matches_per_minute_without_wall_time():
+    result = BatchSimulator(1, seed=0).run(max_steps=1)
+    result.wall_seconds = 0.0
+    assert result.matches_per_minute == 0.0
+    assert result.steps_per_second == 0.0
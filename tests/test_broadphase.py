@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from deja_bounce.broadphase import UniformGrid
+from deja_bounce.physics import overlaps
+
+
+def _box(rng):
+    return (
+        rng.uniform(-100, 700),
+        rng.uniform(-100, 500),
+        rng.uniform(1, 120),
+        rng.uniform(1, 120),
+    )
+
+
+def _overlapping_pairs(rects):
+    return {
+        (i, j)
+        for i in range(len(rects))
+        for j in range(i + 1, len(rects))
+        if overlaps(rects[i], rects[j])
+    }
+
+
+@pytest.fixture
+def grid_and_rects():
+    rng = random.Random(3)
+    rects = [_box(rng) for _ in range(80)]
+    grid = UniformGrid(cell_size=50.0)
+    for i, rect in enumerate(rects):
+        assert grid.insert(i, rect) == i
+    return grid, rects, rng
+
+
+def _check(grid, rects, rng):
+    for _ in range(200):
+        probe = _box(rng)
+        found = grid.query(probe)
+        assert found == sorted(found)  # insertion order
+        hits = {i for i, rect in enumerate(rects) if overlaps(rect, probe)}
+        assert hits <= set(found)
+
+    pairs = _overlapping_pairs(rects)
+    assert pairs <= set(grid.pairs())
+    assert set(grid.overlapping_pairs()) == pairs
+    assert len(list(grid.pairs())) == len(set(grid.pairs()))
+
+
+def test_query_and_pairs_match_brute_force(grid_and_rects):
+    _check(*grid_and_rects)
+
+
+def test_move_matches_brute_force(grid_and_rects):
+    grid, rects, rng = grid_and_rects
+    for _ in range(3):
+        for i in range(len(rects)):
+            x, y, w, h = rects[i]
+            # Mostly small moves within a cell, some jumps across the field
+            if rng.random() < 0.2:
+                rects[i] = _box(rng)
+            else:
+                rects[i] = (x + rng.uniform(-8, 8), y + rng.uniform(-8, 8), w, h)
+            grid.move(i, rects[i])
+            assert grid.rect(i) == rects[i]
+        _check(grid, rects, rng)
+
+
+def test_touching_boxes_overlap():
+    grid = UniformGrid(cell_size=50.0)
+    grid.insert("a", (0, 0, 50, 10))
+    grid.insert("b", (50, 0, 10, 10))
+    grid.insert("c", (61, 0, 10, 10))
+    assert list(grid.overlapping_pairs()) == [("a", "b")]
+
+
+def test_clear():
+    grid = UniformGrid()
+    grid.insert("a", (0, 0, 10, 10))
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query((0, 0, 10, 10)) == []
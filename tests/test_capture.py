@@ -0,0 +1,136 @@
+import io
+import threading
+
+import pytest
+from PIL import Image
+
+from deja_bounce import capture
+from deja_bounce.capture import CaptureWriter, FrameSequence
+
+
+def _bmp(color=(255, 0, 0), size=(4, 3)):
+    data = io.BytesIO()
+    Image.new("RGB", size, color).save(data, format="BMP")
+    return data.getvalue()
+
+
+class _Backend:
+    def __init__(self, frame=b"frame"):
+        self.frame = frame
+        self.captures = 0
+
+    def capture_frame(self):
+        self.captures += 1
+        return self.frame
+
+
+@pytest.fixture
+def writer(tmp_path):
+    writer = CaptureWriter(tmp_path, max_pending=1)
+    yield writer
+    writer.close()
+
+
+def test_flush_and_close_write_pngs(writer, tmp_path):
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    for i, color in enumerate(colors):
+        assert writer.submit(_bmp(color), tmp_path / "seq" / f"{i}.png")
+        writer.flush()
+    writer.submit(_bmp(), tmp_path / "last.png")
+    writer.close()
+
+    assert writer.written == 4
+    assert (writer.dropped, writer.failed) == (0, 0)
+    for i, color in enumerate(colors):
+        with Image.open(tmp_path / "seq" / f"{i}.png") as image:
+            assert image.format == "PNG"
+            assert image.getpixel((0, 0)) == color
+    assert (tmp_path / "last.png").exists()
+
+
+def test_capture_names_the_file(writer, tmp_path):
+    path = writer.capture(_Backend(_bmp()), "shot")
+    writer.flush()
+    assert path.parent == tmp_path
+    assert path.name.endswith("_shot.png")
+    assert path.exists()
+    assert writer.capture(_Backend(None)) is None
+
+
+def test_full_queue_drops_frames(writer, tmp_path, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    encode = CaptureWriter._encode
+
+    def slow_encode(self, frame, path):
+        started.set()
+        release.wait(5)
+        encode(self, frame, path)
+
+    monkeypatch.setattr(CaptureWriter, "_encode", slow_encode)
+    assert writer.submit(_bmp(), tmp_path / "0.png")
+    assert started.wait(5)  # the encoder holds frame 0
+    assert writer.submit(_bmp(), tmp_path / "1.png")  # fills the queue
+    assert not writer.submit(_bmp(), tmp_path / "2.png")
+    assert writer.dropped == 1
+
+    release.set()
+    writer.flush()
+    assert writer.written == 2
+    assert not (tmp_path / "2.png").exists()
+
+
+def test_empty_and_bad_frames(writer, tmp_path):
+    assert not writer.submit(None, tmp_path / "none.png")
+    assert not writer.submit(b"", tmp_path / "empty.png")
+    assert writer.submit(b"not an image", tmp_path / "bad.png")
+    writer.flush()
+    assert (writer.written, writer.dropped, writer.failed) == (0, 0, 1)
+
+
+def test_sequence_skips_missed_slots(writer, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(capture, "perf_counter", lambda: clock[0])
+    submitted = []
+    monkeypatch.setattr(
+        writer, "submit", lambda frame, path: submitted.append(path) or True
+    )
+    backend = _Backend()
+    sequence = FrameSequence(writer, fps=4)
+
+    # Slots every 0.25 s: 0.125 is early, and after the hitch from 0.25 to
+    # 1.125 the missed slots (0.5, 0.75, 1.0) are not made up for; the
+    # next capture is the 1.25 slot, and 1.375 is early again
+    for now in (0.0, 0.125, 0.25, 1.125, 1.2, 1.25, 1.375):
+        clock[0] = now
+        sequence(backend)
+
+    assert backend.captures == 4
+    assert sequence.frames == 4
+    assert [path.name for path in submitted] == [
+        "00000.png",
+        "00001.png",
+        "00002.png",
+        "00003.png",
+    ]
+    assert all(path.parent == sequence.directory for path in submitted)
+
+
+def test_sequence_counts_dropped_frames(writer, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(capture, "perf_counter", lambda: clock[0])
+    accept = iter([True, False, True])
+    submitted = []
+    monkeypatch.setattr(
+        writer,
+        "submit",
+        lambda frame, path: submitted.append(path.name) or next(accept),
+    )
+    sequence = FrameSequence(writer, fps=4)
+    for now in (0.0, 0.25, 0.5):
+        clock[0] = now
+        sequence(_Backend())
+
+    assert (sequence.frames, sequence.dropped) == (2, 1)
+    # A dropped frame keeps its number, so gaps show in the file names
+    assert submitted == ["00000.png", "00001.png", "00002.png"]
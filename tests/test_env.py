@@ -0,0 +1,131 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.entities.paddle import PaddleConfig
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import CpuPaddleControlSystem
+from deja_bounce.simulation.env import DOWN, UP, VecPongEnv
+from deja_bounce.simulation.headless import (
+    HeadlessPongScene,
+    make_headless_game,
+)
+
+
+def _scene(opponent, aim_offset, swept):
+    """A headless scene whose left paddle is driven by hand, like the
+    agent's, against the same CPU the env plays."""
+    scene = HeadlessPongScene(
+        make_headless_game(), DIFFICULTY_PRESETS["normal"], opponent, swept
+    )
+    scene.on_enter()
+    scene._systems = [
+        system
+        for system in scene._systems
+        if not (
+            isinstance(system, CpuPaddleControlSystem) and system.side == "LEFT"
+        )
+    ]
+    scene.reset_match(0)
+    scene.left_paddle.speed = PaddleConfig.speed
+    scene._controllers[1]._aim_offset_y = aim_offset
+    return scene
+
+
+def _observe(scene):
+    ball = scene.ball
+    left = scene.left_paddle
+    right = scene.right_paddle
+    score = scene.model.score
+    return np.array(
+        [
+            ball.position.x,
+            ball.position.y,
+            ball.velocity.vx,
+            ball.velocity.vy,
+            left.position.y,
+            left.vy,
+            right.position.y,
+            right.vy,
+            score.left,
+            score.right,
+        ]
+    )
+
+
+@pytest.mark.parametrize("swept", [True, False])
+@pytest.mark.parametrize("opponent", ["normal", "hard", "insane"])
+def test_env_matches_scene(opponent, swept):
+    config = DIFFICULTY_PRESETS[opponent]
+    n = 6
+    env = VecPongEnv(n, opponent=config, seed=5, max_steps=10**9, swept=swept)
+    observations = env.reset()
+    scenes = [_scene(config, env.aim_offset[i], swept) for i in range(n)]
+    for i, scene in enumerate(scenes):
+        assert np.array_equal(observations[i], _observe(scene))
+
+    rng = np.random.default_rng(1)
+    live = list(range(n))
+    steps = 0
+    while live:
+        actions = rng.integers(0, 3, n)
+        _, rewards, terminated, _, info = env.step(actions)
+        for i in live:
+            scene = scenes[i]
+            scene.left_paddle.moving_up = actions[i] == UP
+            scene.left_paddle.moving_down = actions[i] == DOWN
+            before = scene.model.score.left - scene.model.score.right
+            scene.update(env.dt)
+            after = scene.model.score.left - scene.model.score.right
+            assert rewards[i] == after - before
+
+        done = info.get("done", np.zeros(n, dtype=bool))
+        final = iter(info.get("final_observation", ()))
+        for i in range(n):
+            observed = next(final) if done[i] else env.observations[i]
+            if i not in live:
+                continue
+            assert np.array_equal(observed, _observe(scenes[i])), (i, steps)
+            if done[i]:
+                assert terminated[i]
+                assert scenes[i].model.winner is not None
+                live.remove(i)
+        steps += 1
+    assert steps > 500  # whole matches were compared
+
+
+def test_default_follows_the_game():
+    assert VecPongEnv(1).swept == PongScene.swept_collisions
+
+
+def test_observations_are_reused():
+    env = VecPongEnv(4, seed=0)
+    first = env.reset()
+    second, _, _, _, _ = env.step(np.zeros(4, dtype=int))
+    assert second is first
+    assert first.shape == (4, 10)
+
+
+def test_truncation_resets_the_match():
+    env = VecPongEnv(3, seed=0, max_steps=5)
+    env.reset()
+    for _ in range(4):
+        _, _, _, truncated, info = env.step(np.zeros(3, dtype=int))
+        assert not truncated.any()
+    _, _, _, truncated, info = env.step(np.zeros(3, dtype=int))
+    assert truncated.all()
+    assert info["done"].all()
+    assert info["final_observation"].shape == (3, 10)
+    assert (env.steps == 0).all()
+
+
+def test_two_agents_without_opponent():
+    env = VecPongEnv(2, opponent=None, seed=0)
+    env.reset()
+    start = env.paddle_y.copy()
+    env.step(np.array([[UP, DOWN], [DOWN, UP]]))
+    assert env.paddle_y[0, 0] < start[0, 0]
+    assert env.paddle_y[1, 0] > start[1, 0]
+    assert env.paddle_y[0, 1] > start[0, 1]
+    assert env.paddle_y[1, 1] < start[1, 1]
@@ -0,0 +1,149 @@
+from deja_bounce.net.loopback import run_loopback
+from deja_bounce.net.protocol import (
+    MAX_EDGES,
+    VERSION,
+    Hello,
+    InputPacket,
+    Welcome,
+    decode,
+    encode_hello,
+    encode_input,
+    encode_welcome,
+)
+from deja_bounce.net.scene import NetPongScene
+from deja_bounce.net.transport import LinkConditions
+from deja_bounce.replay.log import InputEdge, paddle_code
+from deja_bounce.scenes.commands import MovePaddleCommand, StopPaddleCommand
+from deja_bounce.simulation.headless import make_headless_game
+
+
+def test_hello_and_welcome_round_trip():
+    assert decode(encode_hello()) == Hello(VERSION)
+    assert decode(encode_welcome(0xDEADBEEF, 60)) == Welcome(
+        VERSION, 0xDEADBEEF, 60
+    )
+
+
+def test_input_round_trip():
+    edges = [
+        InputEdge(10, paddle_code("LEFT", "up", True)),
+        InputEdge(12, paddle_code("LEFT", "up", False)),
+        InputEdge(2**32 - 1, paddle_code("RIGHT", "down", True)),
+    ]
+    packet = decode(encode_input(99, 97, 95, 0x12345678, edges))
+    assert packet == InputPacket(99, 97, 95, 0x12345678, edges)
+    assert [edge.side for edge in packet.edges] == ["LEFT", "LEFT", "RIGHT"]
+    assert decode(encode_input(1, 0, 0, 0, [])) == InputPacket(1, 0, 0, 0, [])
+
+
+def test_input_keeps_the_first_max_edges():
+    edges = [InputEdge(i, 0) for i in range(MAX_EDGES + 10)]
+    packet = decode(encode_input(500, 0, 0, 0, edges))
+    assert packet.edges == edges[:MAX_EDGES]
+
+
+def test_decode_rejects_bad_packets():
+    welcome = encode_welcome(1, 60)
+    assert decode(b"") is None
+    assert decode(b"\x09\x01") is None  # unknown kind
+    assert decode(welcome[:-1]) is None  # truncated
+    assert decode(welcome[:1] + bytes((VERSION + 1,)) + welcome[2:]) is None
+    edges = [InputEdge(1, 0), InputEdge(2, 0)]
+    assert decode(encode_input(3, 0, 0, 0, edges)[:-1]) is None
+
+
+class _Peer:
+    """In-memory stand-in for UdpPeer, delivering after `delay` steps."""
+
+    def __init__(self, clock, delay):
+        self.clock = clock
+        self.delay = delay
+        self.remote = None
+        self.inbox = []
+        self.sent = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+
+    def send(self, data):
+        self.sent += 1
+        self.bytes_sent += len(data)
+        self.remote.inbox.append((self.clock[0] + self.delay, data))
+
+    def receive(self):
+        now = self.clock[0]
+        due = [data for at, data in self.inbox if at <= now]
+        self.inbox = [(at, data) for at, data in self.inbox if at > now]
+        return due
+
+    def close(self):
+        pass
+
+
+def _pair(delay, seed=5):
+    clock = [0]
+    host_peer = _Peer(clock, delay)
+    guest_peer = _Peer(clock, delay)
+    host_peer.remote = guest_peer
+    guest_peer.remote = host_peer
+    scenes = (
+        NetPongScene(make_headless_game(), host_peer, "LEFT", seed),
+        NetPongScene(make_headless_game(), guest_peer, "RIGHT", seed),
+    )
+    for scene in scenes:
+        scene.on_enter()
+    return scenes, clock
+
+
+def _run(scenes, clock, steps):
+    for _ in range(steps):
+        clock[0] += 1
+        for scene in scenes:
+            scene.session.step()
+
+
+def test_late_remote_input_is_rolled_back():
+    scenes, clock = _pair(delay=4)
+    host, guest = scenes
+    _run(scenes, clock, 30)
+    start_y = guest.right_paddle.position.y
+    paddle = guest.session.local_paddle
+    MovePaddleCommand(paddle, "up", guest.session).execute(None)
+    _run(scenes, clock, 20)
+    StopPaddleCommand(paddle, "up", guest.session).execute(None)
+    _run(scenes, clock, 40)
+
+    # The host predicted no input and learned of the press and the release
+    # ticks later; the guest had nothing to mispredict
+    assert guest.right_paddle.position.y != start_y
+    assert host.session.rollbacks >= 2
+    assert host.session.max_resimulated >= 3
+    assert guest.session.rollbacks == 0
+
+    # After re-simulating, the host's state is the guest's, tick for tick
+    tick = min(host.tick, guest.tick) - 1
+    assert host.rewind.checksum(tick) is not None
+    assert host.rewind.checksum(tick) == guest.rewind.checksum(tick)
+    for scene in scenes:
+        assert scene.session.checked > 0
+        assert scene.session.desyncs == 0
+
+
+def test_checksums_catch_a_desync():
+    scenes, clock = _pair(delay=1)
+    host, _ = scenes
+    _run(scenes, clock, 20)
+    host.ball.position.y += 3
+    _run(scenes, clock, 20)
+    assert all(scene.session.desyncs for scene in scenes)
+
+
+def test_loopback_stays_in_sync():
+    conditions = LinkConditions(latency=0.03, jitter=0.01, loss=0.1, seed=3)
+    report = run_loopback(seconds=5.0, conditions=conditions, seed=11)
+    for stats in report.peers:
+        assert stats["ticks"] >= 200
+        assert stats["checked"] >= 100
+        assert stats["desyncs"] == 0
+        assert stats["dropped"] > 0
+    assert sum(stats["rollbacks"] for stats in report.peers) > 0
+    assert report.in_sync
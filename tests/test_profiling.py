@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from deja_bounce.profiling import Histogram
+
+
+def test_empty_histogram():
+    hist = Histogram()
+    assert hist.percentile(50) == 0.0
+    assert hist.mean == 0.0
+
+
+def test_small_values_are_exact():
+    hist = Histogram()
+    for ns in (1, 2, 3, 4, 5, 6, 7):
+        hist.record(ns)
+    assert hist.percentile(0) == 1.0
+    assert hist.percentile(50) == 4.0
+    assert hist.percentile(100) == 7.0
+    assert hist.mean == 4.0
+
+
+@pytest.mark.parametrize("pct", [1, 10, 50, 90, 99, 99.9])
+def test_percentiles_within_bucket_error(pct):
+    rng = random.Random(0)
+    samples = sorted(rng.randrange(1_000, 5_000_000) for _ in range(10_000))
+    hist = Histogram()
+    for ns in samples:
+        hist.record(ns)
+
+    rank = max(1, round(len(samples) * pct / 100))
+    exact = samples[rank - 1]
+    assert hist.percentile(pct) == pytest.approx(exact, rel=0.0625)
+    assert hist.count == len(samples)
+    assert hist.total == sum(samples)
+    assert hist.max == samples[-1]
+
+
+def test_percentile_never_exceeds_max():
+    # 1024 starts a bucket whose midpoint is 1088
+    hist = Histogram()
+    hist.record(1_024)
+    assert hist.percentile(50) == 1_024.0
+
+
+def test_huge_values_land_in_last_bucket():
+    hist = Histogram()
+    hist.record(10**15)
+    hist.record(10**16)
+    assert hist.counts[Histogram.size - 1] == 2
+    assert hist.percentile(100) <= hist.max
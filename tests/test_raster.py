@@ -0,0 +1,211 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+from deja_bounce.assets import get_asset_manager
+from deja_bounce.backends.raster import RasterBackend
+from deja_bounce.constants import DEFAULT_FONT
+
+CLEAR = (10, 20, 30)
+
+
+def _backend(width=40, height=30, **kwargs):
+    backend = RasterBackend(**kwargs)
+    backend.init(width, height, "test")
+    backend.set_clear_color(*CLEAR)
+    backend.begin_frame()
+    return backend
+
+
+def _blend(dst, src, alpha):
+    """The backend's integer blend of one channel value."""
+    return (dst * (255 - alpha) + src * alpha + 127) // 255
+
+
+def test_golden_frame():
+    backend = _backend()
+    backend.draw_rect(2, 3, 10, 5, (255, 0, 0))
+    backend.draw_rect(35, 25, 10, 10, (0, 255, 0))  # clipped
+    backend.draw_rect(-5, -5, 8, 7, (0, 0, 255))  # clipped
+    backend.draw_rect(8, 5, 6, 4, (255, 255, 255, 0.5))  # over the red
+    backend.draw_rect(20, 20, 3, 3, (1, 2, 3, 0))  # fully transparent
+    backend.draw_rect(20, 20, 0, 3)  # empty
+    backend.end_frame()
+
+    golden = np.empty((30, 40, 3), np.uint8)
+    golden[...] = CLEAR
+    golden[3:8, 2:12] = (255, 0, 0)
+    golden[25:30, 35:40] = (0, 255, 0)
+    golden[0:2, 0:3] = (0, 0, 255)
+    half = round(0.5 * 255)
+    golden[5:9, 8:14] = [
+        [[_blend(int(c), 255, half) for c in pixel] for pixel in row]
+        for row in golden[5:9, 8:14]
+    ]
+    assert np.array_equal(backend.frame, golden)
+    assert backend.frames == 1
+
+
+def test_begin_frame_clears():
+    backend = _backend(8, 8)
+    backend.draw_rect(0, 0, 8, 8, (255, 255, 255))
+    backend.begin_frame()
+    assert (backend.frame == CLEAR).all()
+
+
+def test_scaled_rect_keeps_a_pixel():
+    backend = _backend(40, 40, scale=0.25)
+    assert backend.size == (10, 10)
+    backend.draw_rect(8, 8, 2, 2, (255, 255, 255))
+    assert (backend.frame[2, 2] == 255).all()
+    assert (backend.frame != 255).any(axis=2).sum() == 99
+
+
+def test_alpha_frame():
+    backend = _backend(4, 4, alpha=True)
+    assert backend.frame.shape == (4, 4, 4)
+    assert (backend.frame[..., 3] == 255).all()
+
+
+@pytest.mark.parametrize(
+    "x, y", [(710, 100), (900, 100), (100, 510), (-500, 100), (100, -200)]
+)
+def test_text_outside_the_frame_is_skipped(x, y):
+    backend = _backend(700, 500)
+    backend.draw_text(x, y, "Hello world")
+    assert (backend.frame == CLEAR).all()
+
+
+def test_text_is_clipped_at_the_edges():
+    backend = _backend(700, 500)
+    backend.draw_text(690, 495, "Hello world")
+    backend.draw_text(-20, -5, "Hello world")
+    drawn = (backend.frame != CLEAR).any(axis=2)
+    assert drawn.any()
+    assert not drawn[100:400, 100:600].any()
+
+
+def test_capture_frame(tmp_path):
+    from PIL import Image
+
+    backend = _backend(6, 4)
+    backend.draw_rect(1, 1, 2, 2, (255, 0, 0))
+    data = backend.capture_frame()
+    assert data[:2] == b"BM"
+    path = tmp_path / "frame.png"
+    backend.capture_frame(str(path))
+    assert np.array_equal(np.asarray(Image.open(path)), backend.frame)
+
+
+def test_init_preloads_the_game_font():
+    RasterBackend().init(8, 8, "test")
+    manager = get_asset_manager()
+    manager.wait(timeout=5)
+    assert DEFAULT_FONT in manager.cache
+
+
+class _Layer:
+    def __init__(self, color=(255, 0, 0)):
+        self.color = color
+        self.draws = 0
+
+    def draw(self, surface):
+        self.draws += 1
+        surface.draw_rect(0, 0, 4, 4, self.color)
+
+
+def test_retained_layer_is_drawn_once_per_key():
+    backend = _backend(8, 8)
+    layer = _Layer()
+    for _ in range(3):
+        backend.begin_frame()
+        assert backend.retain_layer(layer, 1, layer.draw)
+        backend.draw_rect(2, 2, 4, 4, (0, 255, 0))  # over the layer
+        backend.end_frame()
+        assert (backend.frame[0, 0] == (255, 0, 0)).all()
+        assert (backend.frame[3, 3] == (0, 255, 0)).all()
+    assert layer.draws == 1
+
+    # A new key redraws the layer before the frame is cleared to it
+    backend.begin_frame()
+    layer.color = (0, 0, 255)
+    backend.retain_layer(layer, 2, layer.draw)
+    assert (backend.frame[0, 0] == (0, 0, 255)).all()
+    assert layer.draws == 2
+
+    # A layer that is not retained is gone in the same frame
+    backend.begin_frame()
+    assert (backend.frame == CLEAR).all()
+
+
+def test_retain_layer_after_drawing_is_refused():
+    backend = _backend(8, 8)
+    backend.draw_rect(0, 0, 1, 1)
+    assert not backend.retain_layer(_Layer(), 1, _Layer().draw)
+    backend.end_frame()
+    assert not backend.retain_layer(_Layer(), 1, _Layer().draw)
+
+
+def test_retained_overlays_match_direct_drawing():
+    from deja_bounce.scenes.pong import PongScene
+    from deja_bounce.simulation.headless import make_headless_game
+
+    scene = PongScene(make_headless_game())
+    scene.recorder.directory = None
+    scene.on_enter()
+    scene.model.score.left = 3
+    walls, score = scene.retained
+
+    retained = _backend(700, 500)
+    direct = _backend(700, 500)
+    for model_change in (None, "score", "walls"):
+        if model_change == "score":
+            scene.model.score.right = 7
+        elif model_change == "walls":
+            scene.model.wall_left = not scene.model.wall_left
+        retained.begin_frame()
+        for overlay in (walls, score):
+            assert overlay.retain(retained)
+            overlay.draw(retained)  # skipped: the backend draws it
+        retained.end_frame()
+        direct.begin_frame()
+        for overlay in (walls, score):
+            overlay.draw_layer(direct)
+        direct.end_frame()
+        assert np.array_equal(retained.frame, direct.frame)
+
+
+@pytest.mark.parametrize("scale", [1.0, 0.25])
+@pytest.mark.parametrize("count", [5, 300])
+def test_draw_rects_matches_draw_rect(scale, count):
+    rng = np.random.default_rng(count)
+    xs = rng.integers(-20, 60, count).astype(np.int32)
+    ys = rng.integers(-20, 50, count).astype(np.int32)
+    # Runs of opaque, translucent and invisible squares, overlapping
+    ramp = [(200, 100, 50, 0.3), (255, 255, 255), (1, 2, 3, 0), (9, 9, 9, 0.8)]
+    colors = [ramp[i * len(ramp) // count] for i in range(count)]
+
+    batched = _backend(60, 50, scale=scale)
+    batched.draw_rects(xs, ys, 7, colors)
+    batched.draw_rects(xs[::-1], ys, 5, (90, 200, 120, 0.5))
+    looped = _backend(60, 50, scale=scale)
+    for x, y, color in zip(xs.tolist(), ys.tolist(), colors):
+        looped.draw_rect(x, y, 7, 7, color)
+    for x, y in zip(xs[::-1].tolist(), ys.tolist()):
+        looped.draw_rect(x, y, 5, 5, (90, 200, 120, 0.5))
+
+    assert (batched.frame != CLEAR).any()
+    assert np.array_equal(batched.frame, looped.frame)
+
+
+def test_draw_rects_stacked_squares():
+    # Far more blends per pixel than it takes the color to settle
+    xs = np.full(500, 10)
+    ys = np.arange(500) % 3
+    batched = _backend(30, 20)
+    batched.draw_rects(xs, ys, 6, (250, 40, 90, 0.05))
+    looped = _backend(30, 20)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        looped.draw_rect(x, y, 6, 6, (250, 40, 90, 0.05))
+    assert np.array_equal(batched.frame, looped.frame)
@@ -0,0 +1,97 @@
+from dataclasses import replace
+
+import pytest
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.replay import ReplayLog
+from deja_bounce.replay.__main__ import main, resimulate
+from deja_bounce.scenes.commands import MovePaddleCommand, StopPaddleCommand
+from deja_bounce.scenes.models import PongModel
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import CpuPaddleControlSystem
+from deja_bounce.simulation.headless import make_headless_game
+
+TICKS = 3000
+
+
+def _record(seed=1234):
+    """Play a live match with scripted left-paddle input; return its log."""
+    scene = PongScene(make_headless_game(), seed=seed)
+    recorder = scene.recorder
+    recorder.directory = None  # keep the log in memory
+    scene.on_enter()
+    paddle = scene.left_paddle
+    while scene.model.winner is None and scene.tick < TICKS:
+        phase = scene.tick % 90
+        if phase == 0:
+            MovePaddleCommand(paddle, "up", recorder).execute(scene.model)
+        elif phase == 30:
+            StopPaddleCommand(paddle, "up", recorder).execute(scene.model)
+            MovePaddleCommand(paddle, "down", recorder).execute(scene.model)
+        elif phase == 60:
+            StopPaddleCommand(paddle, "down", recorder).execute(scene.model)
+        scene.update(scene.tick_dt)
+    recorder.finish()
+    return recorder.log
+
+
+@pytest.fixture(scope="module")
+def log():
+    return _record()
+
+
+def test_log_records_inputs_and_score(log):
+    assert 0 < log.ticks <= TICKS
+    assert len(log.edges) > 0
+    assert max(log.score) == PongModel.winning_score
+    assert [edge.tick for edge in log.edges] == sorted(
+        edge.tick for edge in log.edges
+    )
+
+
+def test_log_round_trip(log, tmp_path):
+    assert ReplayLog.from_bytes(log.to_bytes()) == log
+    path = log.save(tmp_path / "nested" / "match.djr")
+    assert ReplayLog.load(path) == log
+
+
+def test_from_bytes_rejects_bad_data(log):
+    data = log.to_bytes()
+    with pytest.raises(ValueError):
+        ReplayLog.from_bytes(data[:5])
+    with pytest.raises(ValueError):
+        ReplayLog.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        ReplayLog.from_bytes(data[:4] + bytes((0,)) + data[5:])
+
+
+def test_resimulate_reproduces_score(log):
+    assert resimulate(log) == log.score
+
+
+def test_verify_cli(log, tmp_path, capsys):
+    good = log.save(tmp_path / "good.djr")
+    main(["--verify", str(good)])
+    assert "ok" in capsys.readouterr().out
+
+    tampered = replace(log, score=(log.score[0] + 1, log.score[1]))
+    bad = tampered.save(tmp_path / "bad.djr")
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--verify", str(good), str(bad)])
+    assert exit_info.value.code == 1
+    assert "!= recorded" in capsys.readouterr().out
+
+
+def test_playback_keeps_the_difficulty_setting(log):
+    game = make_headless_game()
+    game.settings.difficulty = "easy"
+    scene = PongScene(game, replay=replace(log, difficulty="hard"))
+    scene.on_enter()
+    scene.update(scene.tick_dt)
+    assert game.settings.difficulty == "easy"
+    cpu = next(
+        system
+        for system in scene.services.systems.sorted()
+        if type(system) is CpuPaddleControlSystem
+    )
+    assert cpu.controller.config == DIFFICULTY_PRESETS["hard"]
@@ -0,0 +1,128 @@
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.scenes.rewind import RewindBuffer
+from deja_bounce.simulation.headless import (
+    HeadlessPongScene,
+    make_headless_game,
+)
+
+
+def _scene(seed=7):
+    normal = DIFFICULTY_PRESETS["normal"]
+    scene = HeadlessPongScene(make_headless_game(), normal, normal)
+    scene.on_enter()
+    scene.reset_match(seed)
+    return scene
+
+
+def _state(scene):
+    ball = scene.ball
+    return (
+        scene.tick,
+        ball.position.x,
+        ball.position.y,
+        ball.velocity.vx,
+        ball.velocity.vy,
+        scene.left_paddle.position.y,
+        scene.right_paddle.position.y,
+        scene.model.score.left,
+        scene.model.score.right,
+    )
+
+
+def _run(scene, buffer, ticks):
+    """Capture then step, as PongScene does; return the captured states."""
+    states = []
+    for _ in range(ticks):
+        states.append(_state(scene))
+        buffer.capture()
+        scene.update(scene.tick_dt)
+        scene.tick += 1
+    return states
+
+
+def test_rewind_restores_newest_first():
+    scene = _scene()
+    buffer = RewindBuffer(scene, seconds=1.0)
+    states = _run(scene, buffer, 20)
+    assert buffer.count == 20
+
+    for expected in reversed(states):
+        assert buffer.rewind()
+        assert _state(scene) == expected
+    assert buffer.count == 0
+    assert not buffer.rewind()
+
+
+def test_ring_keeps_only_capacity():
+    scene = _scene()
+    buffer = RewindBuffer(scene, seconds=5 / scene.fps)
+    assert buffer.capacity == 5
+    states = _run(scene, buffer, 12)
+    assert buffer.count == 5
+
+    for expected in reversed(states[-5:]):
+        assert buffer.rewind()
+        assert _state(scene) == expected
+    assert not buffer.rewind()
+
+
+def test_rewind_then_resimulate_is_deterministic():
+    scene = _scene()
+    buffer = RewindBuffer(scene, seconds=2.0)
+    _run(scene, buffer, 60)
+    ahead = _run(scene, buffer, 30)
+
+    for _ in range(30):
+        buffer.rewind()
+    assert _run(scene, buffer, 30) == ahead
+
+
+def test_rewind_to():
+    scene = _scene()
+    buffer = RewindBuffer(scene, seconds=1.0)
+    states = _run(scene, buffer, 20)
+
+    assert not buffer.rewind_to(20)  # not captured yet
+    assert buffer.rewind_to(12)
+    assert _state(scene) == states[12]
+    assert buffer.count == 12
+    assert buffer.rewind_to(3)
+    assert _state(scene) == states[3]
+    assert not buffer.rewind_to(5)  # ahead of the restored tick
+
+    buffer.clear()
+    assert buffer.count == 0
+    assert not buffer.rewind_to(0)
+
+
+def test_checksum_matches_between_identical_simulations():
+    scenes = [_scene(seed=11), _scene(seed=11)]
+    buffers = [RewindBuffer(scene, seconds=1.0) for scene in scenes]
+    for scene, buffer in zip(scenes, buffers):
+        _run(scene, buffer, 30)
+
+    sums = [buffer.checksum(25) for buffer in buffers]
+    assert sums[0] is not None
+    assert sums[0] == sums[1]
+    assert buffers[0].checksum(24) != sums[0]
+
+
+def test_checksum_detects_divergence():
+    scenes = [_scene(seed=11), _scene(seed=11)]
+    buffers = [RewindBuffer(scene, seconds=1.0) for scene in scenes]
+    _run(scenes[0], buffers[0], 30)
+    _run(scenes[1], buffers[1], 10)
+    scenes[1].ball.position.y += 0.5
+    _run(scenes[1], buffers[1], 20)
+
+    assert buffers[0].checksum(9) == buffers[1].checksum(9)
+    assert buffers[0].checksum(10) != buffers[1].checksum(10)
+
+
+def test_checksum_of_missing_tick():
+    scene = _scene()
+    buffer = RewindBuffer(scene, seconds=5 / scene.fps)
+    _run(scene, buffer, 10)
+    assert buffer.checksum(10) is None  # not captured yet
+    assert buffer.checksum(4) is None  # overwritten
+    assert buffer.checksum(5) is not None
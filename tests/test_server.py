@@ -0,0 +1,175 @@
+import pytest
+
+from deja_bounce.constants import FPS
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.simulation import server as server_module
+from deja_bounce.simulation.server import (
+    RAMP_MATCHES,
+    MatchServer,
+    MatchSpec,
+    ShardScheduler,
+    ShardStats,
+)
+
+HARD = DIFFICULTY_PRESETS["hard"]
+EASY = DIFFICULTY_PRESETS["easy"]
+COST = 10e-6  # seconds per match step
+CAPACITY = int(0.6 / FPS / COST)  # matches in 0.6 of a tick, about 1000
+
+
+def _play(scheduler):
+    """Tick until every hosted match is done; outcomes by match id."""
+    outcomes = {}
+    while len(scheduler):
+        for outcome in scheduler.tick():
+            outcomes[outcome.match_id] = outcome
+    return outcomes
+
+
+def test_scenes_are_pooled_by_config():
+    scheduler = ShardScheduler(shard=3)
+    scheduler.add(MatchSpec(0, HARD, EASY, seed=1))
+    scheduler.add(MatchSpec(1, EASY, HARD, seed=2))
+    first = _play(scheduler)
+    assert scheduler.stats.scenes == 2
+
+    # Same configs reuse the pooled scenes and replay the same matches
+    scheduler.add(MatchSpec(2, HARD, EASY, seed=1))
+    scheduler.add(MatchSpec(3, EASY, HARD, seed=2))
+    assert scheduler.stats.scenes == 2
+    second = _play(scheduler)
+    for old, new in ((0, 2), (1, 3)):
+        assert (first[old].winner, first[old].steps) == (
+            second[new].winner,
+            second[new].steps,
+        )
+
+    # A config with no free scene builds one
+    scheduler.add(MatchSpec(4, HARD, HARD, seed=1))
+    assert scheduler.stats.scenes == 3
+
+
+def test_outcomes_and_counts():
+    scheduler = ShardScheduler(shard=3)
+    for i in range(4):
+        scheduler.add(MatchSpec(i, HARD, EASY, seed=i))
+    assert (len(scheduler), scheduler.stats.peak) == (4, 4)
+    outcomes = _play(scheduler)
+
+    assert sorted(outcomes) == [0, 1, 2, 3]
+    for outcome in outcomes.values():
+        assert outcome.shard == 3
+        assert outcome.winner is not None
+        assert outcome.steps > 0
+    stats = scheduler.stats
+    assert (stats.started, stats.finished, stats.active) == (4, 4, 0)
+    assert stats.match_ticks == sum(o.steps for o in outcomes.values())
+
+
+def test_max_steps_ends_a_match_undecided():
+    scheduler = ShardScheduler()
+    scheduler.add(MatchSpec(0, HARD, HARD, seed=1, max_steps=5))
+    for _ in range(4):
+        assert scheduler.tick() == []
+    (outcome,) = scheduler.tick()
+    assert outcome.winner is None
+    assert outcome.steps == 5
+    assert len(scheduler) == 0
+
+
+class _Process:
+    """Stand-in for a shard process that never runs."""
+
+    def __init__(self, target, args, daemon):
+        pass
+
+    def start(self):
+        pass
+
+
+@pytest.fixture
+def match_server(monkeypatch):
+    """A two-shard MatchServer without worker processes."""
+    monkeypatch.setattr(server_module.multiprocessing, "Process", _Process)
+    return MatchServer(workers=2, target_load=0.6)
+
+
+def _specs(count):
+    return [MatchSpec(i, HARD, EASY, seed=i) for i in range(count)]
+
+
+def test_unmeasured_shards_take_one_ramp(match_server):
+    assert match_server._headroom(0) == RAMP_MATCHES
+    # Matches sent but not yet started count as hosted
+    match_server._sent[0] = 5
+    assert match_server._headroom(0) == 0
+    match_server.stats[0] = ShardStats(0, started=5, active=5)
+    assert match_server._headroom(0) == 0  # until a report measures them
+
+
+def test_headroom_follows_the_measured_cost(match_server):
+    match_server._cost[0] = COST
+    match_server._sent[0] = 400
+    match_server.stats[0] = ShardStats(0, started=400, active=400)
+    assert match_server._headroom(0) == 200  # grows by half at a time
+    match_server.stats[0] = ShardStats(0, started=400, active=900)
+    assert match_server._headroom(0) == CAPACITY - 900
+    match_server.stats[0] = ShardStats(0, started=400, active=1100)
+    assert match_server._headroom(0) < 0
+
+
+def test_receive_keeps_a_decaying_cost_peak(match_server):
+    stats = ShardStats(1, match_ticks=100, busy_seconds=2e-3)
+    match_server._receive((stats, [], False))
+    assert match_server._cost[1] == pytest.approx(20e-6)
+    # A cheaper window only lowers the estimate by COST_DECAY
+    stats = ShardStats(1, match_ticks=200, busy_seconds=3e-3)
+    match_server._receive((stats, [], False))
+    assert match_server._cost[1] == pytest.approx(
+        server_module.COST_DECAY * 20e-6
+    )
+
+
+def test_dispatch_fills_the_shard_with_most_room(match_server):
+    match_server._cost = [COST, COST]
+    match_server._sent = [900, 100]
+    match_server.stats = [
+        ShardStats(0, started=900, active=900),
+        ShardStats(1, started=100, active=100),
+    ]
+    for spec in _specs(200):
+        match_server.submit(spec)
+    match_server._dispatch()
+
+    # Shard 0 fills up to its capacity, shard 1 grows by half
+    first = match_server._inboxes[0].get(timeout=5)
+    second = match_server._inboxes[1].get(timeout=5)
+    assert (len(first), len(second)) == (CAPACITY - 900, 50)
+    assert match_server._sent == [CAPACITY, 150]
+    pending = match_server.pending
+    assert pending == 200 - (CAPACITY - 900) - 50
+
+    # Before either reports, only shard 1 has room, for half of its 150
+    match_server._dispatch()
+    assert len(match_server._inboxes[1].get(timeout=5)) == min(pending, 75)
+    assert match_server._inboxes[0].empty()
+
+
+def test_full_shards_leave_matches_queued(match_server):
+    match_server._cost = [COST, COST]
+    match_server._sent = [CAPACITY, CAPACITY]
+    match_server.stats = [
+        ShardStats(0, started=CAPACITY, active=CAPACITY),
+        ShardStats(1, started=CAPACITY, active=CAPACITY),
+    ]
+    for spec in _specs(10):
+        match_server.submit(spec)
+    match_server._dispatch()
+    assert match_server.pending == 10
+
+    match_server.stats[1] = ShardStats(
+        1, started=CAPACITY, active=CAPACITY - 3
+    )
+    match_server._dispatch()
+    assert len(match_server._inboxes[1].get(timeout=5)) == 3
+    assert match_server.pending == 7
@@ -0,0 +1,131 @@
+import asyncio
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.net.spectate import (
+    DeltaDecoder,
+    DeltaEncoder,
+    SpectatorServer,
+    SpectatorState,
+    capture_state,
+    watch,
+)
+from deja_bounce.simulation import HeadlessMatch
+
+
+def _states(ticks=400):
+    scene = HeadlessMatch(
+        DIFFICULTY_PRESETS["hard"], DIFFICULTY_PRESETS["hard"]
+    ).scene
+    scene.reset_match(5)
+    states = []
+    for tick in range(ticks):
+        scene.update(1 / 60)
+        states.append(capture_state(scene, tick))
+    return states
+
+
+def test_round_trip_message_by_message():
+    states = _states()
+    encoder = DeltaEncoder(keyframe_interval=120)
+    decoder = DeltaDecoder()
+    sizes = []
+    for state in states:
+        message = encoder.encode(state)
+        sizes.append(len(message))
+        assert decoder.feed(message) == 1
+        assert decoder.state == state
+
+    assert decoder.keyframes == 4  # ticks 0, 120, 240, 360
+    assert decoder.deltas == len(states) - 4
+    assert max(sizes) == sizes[0]  # deltas are never bigger than keyframes
+
+
+def test_round_trip_in_odd_chunks():
+    states = _states()
+    encoder = DeltaEncoder()
+    stream = b"".join(encoder.encode(state) for state in states)
+
+    decoder = DeltaDecoder()
+    decoded = []
+    for start in range(0, len(stream), 7):
+        if decoder.feed(stream[start : start + 7]):
+            decoded.append(decoder.state)
+    assert decoded[-1] == states[-1]
+    assert decoder.keyframes + decoder.deltas == len(states)
+
+
+def test_gap_in_ticks_forces_keyframe():
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+    first = SpectatorState(0, 1, 2, 3, 4, 0, 0, 0)
+    later = first._replace(tick=1000, ball_x=-5)
+    decoder.feed(encoder.encode(first))
+    decoder.feed(encoder.encode(later))
+    assert decoder.keyframes == 2
+    assert decoder.state == later
+
+
+def test_delta_before_keyframe_is_ignored():
+    encoder = DeltaEncoder()
+    first = SpectatorState(0, 1, 2, 3, 4, 0, 0, 0)
+    encoder.encode(first)
+    delta = encoder.encode(first._replace(tick=1, ball_x=9))
+
+    decoder = DeltaDecoder()
+    assert decoder.feed(delta) == 0
+    assert decoder.state is None
+    assert decoder.feed(encoder.keyframe(first)) == 1
+    assert decoder.state == first
+
+
+def test_live_viewers_end_on_the_server_state():
+    """
+    A server on port 0 streams about a second of play to 30 viewers plus
+    one whose connection stalls for a while: its messages are skipped
+    once the backlog passes max_buffer, and a keyframe resyncs it.
+    """
+    server = SpectatorServer(keyframe_interval=10**6, max_buffer=1024)
+    slow = DeltaDecoder()
+    decoders = [DeltaDecoder() for _ in range(30)]
+
+    async def scenario():
+        await server.start()
+        tasks = [
+            asyncio.ensure_future(watch("127.0.0.1", server.port, slow))
+        ]
+        while server.stats.viewers < 1:
+            await asyncio.sleep(0.01)
+        # A stalled socket shows as a growing write buffer on the server
+        transport = server._viewers[0].writer.transport
+        stalled = False
+        buffered = transport.get_write_buffer_size
+        transport.get_write_buffer_size = lambda: (
+            server.max_buffer + 1 if stalled else buffered()
+        )
+
+        tasks += [
+            asyncio.ensure_future(watch("127.0.0.1", server.port, decoder))
+            for decoder in decoders
+        ]
+        while server.stats.viewers < len(decoders) + 1:
+            await asyncio.sleep(0.01)
+        run = asyncio.ensure_future(server.run(1.0))
+        await asyncio.sleep(0.3)
+        stalled = True
+        await asyncio.sleep(0.3)
+        stalled = False
+        await run
+        await server.close()
+        return await asyncio.gather(*tasks)
+
+    received = asyncio.run(scenario())
+
+    assert server.stats.ticks >= 50
+    assert all(received)
+    for decoder in decoders:
+        assert decoder.state == server.last_state
+        assert decoder.keyframes == 1  # only the one on joining
+    assert server.stats.skipped > 0
+    assert slow.keyframes == 2  # joining, then after the skipped ticks
+    assert slow.state == server.last_state
+    assert slow.deltas < decoders[0].deltas
@@ -0,0 +1,66 @@
+import pytest
+
+from deja_bounce.difficulty import DIFFICULTY_PRESETS
+from deja_bounce.physics import sweep_aabb
+from deja_bounce.scenes.pong import PongScene
+from deja_bounce.scenes.systems import SweptBallCollisionSystem
+from deja_bounce.simulation import HeadlessMatch
+
+
+def test_sweep_aabb_time_and_normal():
+    hit = sweep_aabb((0, 0, 10, 10), (100, 0), (50, 0, 10, 10), 1.0)
+    assert hit is not None
+    assert hit.time == pytest.approx(0.4)
+    assert (hit.normal_x, hit.normal_y) == (-1.0, 0.0)
+
+    hit = sweep_aabb((0, 100, 10, 10), (0, -200), (0, 0, 10, 10), 1.0)
+    assert hit is not None
+    assert hit.time == pytest.approx(0.45)
+    assert (hit.normal_x, hit.normal_y) == (0.0, 1.0)
+
+
+def test_sweep_aabb_misses():
+    # Too slow to get there, moving away, or passing beside the target
+    assert sweep_aabb((0, 0, 10, 10), (10, 0), (50, 0, 10, 10), 1.0) is None
+    assert sweep_aabb((0, 0, 10, 10), (-100, 0), (50, 0, 10, 10), 1.0) is None
+    assert sweep_aabb((0, 0, 10, 10), (100, 0), (50, 30, 10, 10), 1.0) is None
+
+
+def _shoot_at_left_paddle(swept):
+    """A ball fast enough to cross the paddle within one tick."""
+    scene = HeadlessMatch(
+        DIFFICULTY_PRESETS["insane"], DIFFICULTY_PRESETS["insane"], swept=swept
+    ).scene
+    scene.reset_match(1)
+    paddle = scene.left_paddle
+    ball = scene.ball
+    ball.position.x = paddle.position.x + paddle.size.width + 40
+    ball.position.y = paddle.position.y + paddle.size.height / 2
+    ball.velocity.vx = -6000.0
+    ball.velocity.vy = 0.0
+    for _ in range(3):
+        scene.update(1 / 30)
+    return scene
+
+
+def test_discrete_collisions_tunnel():
+    scene = _shoot_at_left_paddle(swept=False)
+    assert scene.model.score.right == 1
+
+
+def test_swept_collisions_stop_tunneling():
+    scene = _shoot_at_left_paddle(swept=True)
+    paddle = scene.left_paddle
+    assert scene.model.score.right == 0
+    assert scene.ball.velocity.vx > 0
+    assert scene.ball.position.x >= paddle.position.x + paddle.size.width
+
+
+def test_headless_follows_the_game(monkeypatch):
+    assert HeadlessMatch().scene.swept_collisions == PongScene.swept_collisions
+    monkeypatch.setattr(PongScene, "swept_collisions", False)
+    systems = HeadlessMatch().scene._systems
+    assert not any(isinstance(s, SweptBallCollisionSystem) for s in systems)
+    monkeypatch.setattr(PongScene, "swept_collisions", True)
+    systems = HeadlessMatch().scene._systems
+    assert any(isinstance(s, SweptBallCollisionSystem) for s in systems)
@@ -0,0 +1,90 @@
+from deja_bounce.scenes.trail import TrailBuffer
+
+
+class _Surface:
+    def __init__(self):
+        self.rects = []
+
+    def draw_rect(self, x, y, w, h, color=(255, 255, 255)):
+        self.rects.append((x, y, w, h, color))
+
+
+def test_partial_trail_in_order():
+    trail = TrailBuffer(capacity=4)
+    trail.append(1.7, 10.2)
+    trail.append(2.0, 20.0)
+    assert len(trail) == 2
+    assert list(trail) == [(1, 10), (2, 20)]
+
+
+def test_full_trail_drops_oldest():
+    trail = TrailBuffer(capacity=4)
+    for i in range(10):
+        trail.append(i, -i)
+    assert len(trail) == 4
+    assert list(trail) == [(6, -6), (7, -7), (8, -8), (9, -9)]
+
+
+def test_clear():
+    trail = TrailBuffer(capacity=3)
+    for i in range(5):
+        trail.append(i, i)
+    trail.clear()
+    assert list(trail) == []
+    trail.append(7, 7)
+    assert list(trail) == [(7, 7)]
+
+
+def test_draw_fades_towards_the_oldest():
+    trail = TrailBuffer(capacity=4, max_alpha=0.5)
+    for i in range(6):
+        trail.append(i * 10, 0)
+    surface = _Surface()
+    trail.draw(surface, 5)
+
+    assert [rect[:4] for rect in surface.rects] == [
+        (20, 0, 5, 5),
+        (30, 0, 5, 5),
+        (40, 0, 5, 5),
+        (50, 0, 5, 5),
+    ]
+    alphas = [rect[4][3] for rect in surface.rects]
+    assert alphas == sorted(alphas)
+    assert alphas[-1] == 0.5
+
+
+def test_partial_trail_uses_newest_alphas():
+    trail = TrailBuffer(capacity=4, max_alpha=0.5)
+    trail.append(0, 0)
+    trail.append(1, 1)
+    surface = _Surface()
+    trail.draw(surface, 5)
+    assert [rect[4][3] for rect in surface.rects] == [0.375, 0.5]
+
+
+class _BatchSurface(_Surface):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def draw_rects(self, xs, ys, size, colors):
+        self.batches.append((list(xs), list(ys), size, list(colors)))
+
+
+def test_draw_is_one_batch_in_ring_order():
+    trail = TrailBuffer(capacity=4, max_alpha=0.5)
+    for i in range(6):
+        trail.append(i * 10, i)
+    surface = _BatchSurface()
+    trail.draw(surface, 5)
+
+    assert surface.rects == []
+    [(xs, ys, size, colors)] = surface.batches
+    assert (xs, ys, size) == ([20, 30, 40, 50], [2, 3, 4, 5], 5)
+    assert colors == [color for _, color in trail.slots()]
+
+
+def test_empty_trail_draws_nothing():
+    surface = _BatchSurface()
+    TrailBuffer(capacity=4).draw(surface, 5)
+    assert surface.batches == []